@@ -0,0 +1,81 @@
+"""Benchmark the converter and the exporter.
+
+Run ``python -m benchmarks --help`` for the available options. For example, to
+record a baseline and to fail a later run that regresses by more than 10%::
+
+    python -m benchmarks --scenario default --save baseline.json
+    python -m benchmarks --scenario default --compare baseline.json --tolerance 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+from benchmarks.suite import (
+    find_regressions,
+    format_table,
+    make_baseline,
+    make_cases,
+    run,
+)
+from benchmarks.workload import SCENARIOS, make_metrics_data
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    _ = parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="default")
+    _ = parser.add_argument("--resources", type=int)
+    _ = parser.add_argument("--metrics", type=int)
+    _ = parser.add_argument("--attribute-sets", type=int)
+    _ = parser.add_argument("--points-per-stream", type=int)
+    _ = parser.add_argument("--attribute-width", type=int)
+    _ = parser.add_argument(
+        "--case", action="append", choices=sorted(make_cases()), dest="cases"
+    )
+    _ = parser.add_argument("--repeat", type=int, default=5)
+    _ = parser.add_argument("--save", type=Path, help="write the results as baseline")
+    _ = parser.add_argument("--compare", type=Path, help="fail on regressions")
+    _ = parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    overrides = {
+        name: value
+        for name in (
+            "resources",
+            "metrics",
+            "attribute_sets",
+            "points_per_stream",
+            "attribute_width",
+        )
+        if (value := getattr(args, name)) is not None
+    }
+    workload = replace(SCENARIOS[args.scenario], **overrides)
+    metrics_data = make_metrics_data(workload)
+
+    print(  # noqa: T201
+        f"{workload.streams:,} streams, {workload.data_points:,} data points"
+    )
+    measurements = run(metrics_data, workload, cases=args.cases, repeat=args.repeat)
+    print(format_table(measurements))  # noqa: T201
+
+    if args.save is not None:
+        _ = args.save.write_text(
+            json.dumps(make_baseline(workload, measurements), indent=2) + "\n"
+        )
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        regressions = find_regressions(measurements, baseline, workload, args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)  # noqa: T201
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Measure how long importing the exporter takes, using ``python -X importtime``.
+
+Importing the package must not import the modules in ``LAZY_MODULES``, they
+are imported on first use. To record a baseline and to fail a later run whose
+import time regresses by more than 20%::
+
+    python -m benchmarks.imports --save imports.json
+    python -m benchmarks.imports --compare imports.json --tolerance 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+PACKAGE = "opentelemetry_exporter_oci_monitoring"
+LAZY_MODULES = ("oci", "numpy", "aiohttp")
+
+
+@dataclass(frozen=True)
+class ImportMeasurement:
+    """The fastest of several imports of a module in a fresh interpreter.
+
+    ``modules`` holds every module the interpreter imported, including the
+    ones imported at startup.
+    """
+
+    module: str
+    microseconds: int
+    modules: frozenset[str]
+
+    @property
+    def lazy_modules(self) -> list[str]:
+        """The lazily imported packages that the import pulled in anyway."""
+        return [
+            module
+            for module in LAZY_MODULES
+            if any(
+                name == module or name.startswith(f"{module}.") for name in self.modules
+            )
+        ]
+
+
+def parse_importtime(output: str) -> dict[str, int]:
+    """Return the cumulative import time in microseconds of every module."""
+    cumulative: dict[str, int] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_micros, name = line[len("import time:") :].split("|")
+        if cumulative_micros.strip().isdigit():
+            cumulative[name.strip()] = int(cumulative_micros)
+    return cumulative
+
+
+def measure_import(module: str = PACKAGE, repeat: int = 5) -> ImportMeasurement:
+    fastest: dict[str, int] | None = None
+    for _ in range(repeat):
+        process = subprocess.run(  # noqa: S603
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        times = parse_importtime(process.stderr)
+        if fastest is None or times[module] < fastest[module]:
+            fastest = times
+    if fastest is None:
+        msg = "repeat must be at least 1"
+        raise ValueError(msg)
+    return ImportMeasurement(module, fastest[module], frozenset(fastest))
+
+
+def find_import_regressions(
+    measurement: ImportMeasurement, baseline: Mapping[str, Any] | None, tolerance: float
+) -> list[str]:
+    regressions = [
+        f"{measurement.module}: imports {module} eagerly"
+        for module in measurement.lazy_modules
+    ]
+    if baseline is not None:
+        expected = baseline[measurement.module]["microseconds"]
+        if measurement.microseconds > expected * (1 + tolerance):
+            regressions.append(
+                f"{measurement.module}: {measurement.microseconds:,} µs,"
+                f" baseline {expected:,} µs"
+            )
+    return regressions
+
+
+def format_measurements(measurements: Iterable[ImportMeasurement]) -> str:
+    lines = [f"{'module':<40} {'ms':>8} {'modules':>8}"]
+    lines.extend(
+        f"{m.module:<40} {m.microseconds / 1e3:>8.1f} {len(m.modules):>8}"
+        for m in measurements
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.imports")
+    _ = parser.add_argument("--module", default=PACKAGE)
+    _ = parser.add_argument("--repeat", type=int, default=5)
+    _ = parser.add_argument("--save", type=Path, help="write the result as baseline")
+    _ = parser.add_argument("--compare", type=Path, help="fail on regressions")
+    _ = parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    measurement = measure_import(args.module, args.repeat)
+    print(format_measurements([measurement]))  # noqa: T201
+
+    if args.save is not None:
+        _ = args.save.write_text(
+            json.dumps(
+                {measurement.module: {"microseconds": measurement.microseconds}},
+                indent=2,
+            )
+            + "\n"
+        )
+
+    baseline = None if args.compare is None else json.loads(args.compare.read_text())
+    regressions = find_import_regressions(measurement, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)  # noqa: T201
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
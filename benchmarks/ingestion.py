@@ -0,0 +1,439 @@
+"""A stand-in for the PostMetricData endpoint of the telemetry ingestion API.
+
+The server parses the request bodies and enforces the request limits of the
+API. It answers with the JSON of the service, including ``failedMetrics``
+records for metrics that fail validation. Latency, throttling and server
+errors can be injected. To run it on its own::
+
+    python -m benchmarks.ingestion --port 8080 --throttle 0.1 --latency 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import getLogger
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    cast,
+)
+
+from oci.auth.signers import SecurityTokenSigner
+from oci.circuit_breaker import NoCircuitBreakerStrategy
+from oci.monitoring import MonitoringClient
+from oci.retry import NoneRetryStrategy
+
+from opentelemetry_exporter_oci_monitoring.validation import (
+    INVALID_DIMENSION_KEY_CHARACTERS,
+    INVALID_NAME_CHARACTERS,
+    NAME_START,
+    ValidationRules,
+)
+
+if TYPE_CHECKING:
+    from typing import TypeVar
+
+    _R = TypeVar("_R")
+
+logger = getLogger(__name__)
+
+METRICS_PATH = "/metrics"
+JSONObject = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class IngestionLimits:
+    """The limits the stand-in enforces per request and per metric stream.
+
+    The name, dimension and time window limits are taken from ``validation``.
+    """
+
+    max_body_bytes: int = 1_000_000
+    max_streams: int = 50
+    max_datapoints_per_stream: int = 1_000
+    validation: ValidationRules = field(default_factory=ValidationRules)
+
+    def __post_init__(self) -> None:
+        for name in ("max_body_bytes", "max_streams", "max_datapoints_per_stream"):
+            if getattr(self, name) < 1:
+                msg = f"{name} must be at least 1"
+                raise ValueError(msg)
+
+
+@dataclass(frozen=True)
+class FaultInjection:
+    """Latency and errors added to the requests.
+
+    ``throttle_ratio`` of the requests are answered with 429 and
+    ``error_ratio`` with 500, the remaining requests are processed.
+    """
+
+    latency_seconds: float = 0.0
+    throttle_ratio: float = 0.0
+    error_ratio: float = 0.0
+    retry_after_seconds: int | None = None
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.latency_seconds < 0:
+            msg = "latency_seconds must not be negative"
+            raise ValueError(msg)
+        if (
+            min(self.throttle_ratio, self.error_ratio) < 0
+            or self.throttle_ratio + self.error_ratio > 1
+        ):
+            msg = "throttle_ratio and error_ratio must be between 0 and 1 in total"
+            raise ValueError(msg)
+
+
+@dataclass
+class IngestionStats:
+    requests: int = 0
+    rejected_requests: int = 0
+    throttled_requests: int = 0
+    failed_requests: int = 0
+    accepted_streams: int = 0
+    accepted_datapoints: int = 0
+    failed_metrics: int = 0
+
+
+class IngestionResponse(NamedTuple):
+    status: HTTPStatus
+    body: JSONObject
+    headers: dict[str, str] = {}  # noqa: RUF012
+
+
+class FakeIngestionService:
+    """Answers PostMetricData requests like the telemetry ingestion API."""
+
+    def __init__(
+        self,
+        limits: IngestionLimits | None = None,
+        faults: FaultInjection | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__()
+        self.limits = limits or IngestionLimits()
+        self.faults = faults or FaultInjection()
+        self._clock = clock
+        self._random = random.Random(self.faults.seed)  # noqa: S311
+        self._lock = threading.Lock()
+        self._stats = IngestionStats()
+
+    def stats(self) -> IngestionStats:
+        with self._lock:
+            return replace(self._stats)
+
+    def post_metric_data(self, body: bytes) -> IngestionResponse:
+        faults = self.faults
+        if faults.latency_seconds:
+            time.sleep(faults.latency_seconds)
+        with self._lock:
+            self._stats.requests += 1
+            draw = self._random.random()
+            if draw < faults.throttle_ratio:
+                self._stats.throttled_requests += 1
+                headers = (
+                    {}
+                    if faults.retry_after_seconds is None
+                    else {"Retry-After": str(faults.retry_after_seconds)}
+                )
+                return _error(
+                    HTTPStatus.TOO_MANY_REQUESTS, "TooManyRequests", headers=headers
+                )
+            if draw < faults.throttle_ratio + faults.error_ratio:
+                self._stats.failed_requests += 1
+                return _error(HTTPStatus.INTERNAL_SERVER_ERROR, "InternalServerError")
+
+        response = self._process(body)
+        if response.status != HTTPStatus.OK:
+            with self._lock:
+                self._stats.rejected_requests += 1
+        return response
+
+    def _process(self, body: bytes) -> IngestionResponse:
+        limits = self.limits
+        if len(body) > limits.max_body_bytes:
+            return _error(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                "PayloadTooLarge",
+                f"The request body exceeds {limits.max_body_bytes} bytes.",
+            )
+        try:
+            details = json.loads(body)
+            metric_data = cast("object", details["metricData"])
+            atomic = details.get("batchAtomicity", "NON_ATOMIC") == "ATOMIC"
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return _error(HTTPStatus.BAD_REQUEST, "InvalidParameter", "Malformed body.")
+        if not isinstance(metric_data, list) or not metric_data:
+            return _error(HTTPStatus.BAD_REQUEST, "InvalidParameter", "No metricData.")
+        metric_data = cast("List[JSONObject]", metric_data)
+        if len(metric_data) > limits.max_streams:
+            return _error(
+                HTTPStatus.BAD_REQUEST,
+                "InvalidParameter",
+                f"More than {limits.max_streams} metric streams.",
+            )
+
+        now = self._clock()
+        failed_metrics = [
+            {"message": message, "metricData": metric}
+            for metric in metric_data
+            for message in [validate_metric(metric, limits, now)]
+            if message is not None
+        ]
+        failed = {id(record["metricData"]) for record in failed_metrics}
+        accepted = (
+            []
+            if atomic and failed
+            else [metric for metric in metric_data if id(metric) not in failed]
+        )
+        with self._lock:
+            self._stats.failed_metrics += len(failed_metrics)
+            self._stats.accepted_streams += len(accepted)
+            self._stats.accepted_datapoints += sum(
+                len(metric["datapoints"]) for metric in accepted
+            )
+        return IngestionResponse(
+            HTTPStatus.OK,
+            {
+                "failedMetricsCount": len(failed_metrics),
+                "failedMetrics": failed_metrics,
+            },
+        )
+
+
+def validate_metric(
+    metric: JSONObject, limits: IngestionLimits, now: float
+) -> str | None:
+    """Return why the ingestion API would reject the metric, or None."""
+    for required in ("namespace", "compartmentId"):
+        if not metric.get(required):
+            return f"The {required} is missing."
+    return (
+        _validate_name(metric.get("name"), limits.validation)
+        or _validate_dimensions(metric.get("dimensions") or {}, limits.validation)
+        or _validate_metadata(metric.get("metadata") or {}, limits.validation)
+        or _validate_datapoints(metric.get("datapoints") or [], limits, now)
+    )
+
+
+def _validate_name(name: object, rules: ValidationRules) -> str | None:
+    if not isinstance(name, str) or not name:
+        return "The name is missing."
+    if (
+        len(name) > rules.max_name_length
+        or INVALID_NAME_CHARACTERS.search(name)
+        or not NAME_START.match(name)
+    ):
+        return f"The name {name!r} is invalid."
+    return None
+
+
+def _validate_dimensions(
+    dimensions: Mapping[str, str], rules: ValidationRules
+) -> str | None:
+    if len(dimensions) > rules.max_dimensions:
+        return f"More than {rules.max_dimensions} dimensions."
+    for key, value in dimensions.items():
+        if (
+            not key
+            or len(key) > rules.max_dimension_key_length
+            or INVALID_DIMENSION_KEY_CHARACTERS.search(key)
+        ):
+            return f"The dimension key {key!r} is invalid."
+        if not value or len(value) > rules.max_dimension_value_length:
+            return f"The value of the dimension {key!r} is invalid."
+    return None
+
+
+def _validate_metadata(
+    metadata: Mapping[str, str], rules: ValidationRules
+) -> str | None:
+    for key, value in metadata.items():
+        if len(value) > rules.max_metadata_value_length:
+            return f"The value of the metadata {key!r} is invalid."
+    return None
+
+
+def _validate_datapoints(
+    datapoints: Sequence[JSONObject], limits: IngestionLimits, now: float
+) -> str | None:
+    if not datapoints or len(datapoints) > limits.max_datapoints_per_stream:
+        return f"Between 1 and {limits.max_datapoints_per_stream} datapoints expected."
+    earliest = now - limits.validation.max_past.total_seconds()
+    latest = now + limits.validation.max_future.total_seconds()
+    for datapoint in datapoints:
+        try:
+            timestamp = _parse_timestamp(datapoint["timestamp"])
+            value = float(datapoint["value"])
+        except (KeyError, TypeError, ValueError):
+            return "A datapoint is malformed."
+        if not earliest <= timestamp <= latest:
+            return "A datapoint is outside of the accepted time window."
+        if not math.isfinite(value):
+            return "A datapoint value is not finite."
+    return None
+
+
+def _parse_timestamp(value: str) -> float:
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _error(
+    status: HTTPStatus,
+    code: str,
+    message: str = "",
+    headers: dict[str, str] | None = None,
+) -> IngestionResponse:
+    return IngestionResponse(
+        status, {"code": code, "message": message or status.phrase}, headers or {}
+    )
+
+
+class IngestionRequestHandler(BaseHTTPRequestHandler):
+    def __init__(
+        self,
+        *args: Any,  # noqa: ANN401
+        service: FakeIngestionService,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        self.service = service
+        super().__init__(*args, **kwargs)
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if not self.path.partition("?")[0].endswith(METRICS_PATH):
+            response = _error(HTTPStatus.NOT_FOUND, "NotAuthorizedOrNotFound")
+        elif self.headers.get("Content-Encoding", "").lower() == "gzip":
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError):
+                response = _error(HTTPStatus.BAD_REQUEST, "InvalidParameter")
+            else:
+                response = self.service.post_metric_data(body)
+        else:
+            response = self.service.post_metric_data(body)
+
+        payload = json.dumps(response.body).encode()
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        _ = self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        logger.debug(format, *args)
+
+
+class FakeIngestionServer(ThreadingHTTPServer):
+    """Serves a FakeIngestionService over HTTP on a background thread."""
+
+    def __init__(
+        self,
+        service: FakeIngestionService | None = None,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+    ) -> None:
+        self.service = service or FakeIngestionService()
+        super().__init__(
+            address, partial(IngestionRequestHandler, service=self.service)
+        )
+        self._thread = threading.Thread(
+            target=self.serve_forever, name=type(self).__name__, daemon=True
+        )
+
+    @property
+    def endpoint(self) -> str:
+        host, port = cast("tuple[str, int]", self.server_address)
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+
+class UnsignedSigner(SecurityTokenSigner):
+    def __init__(self) -> None:  # pyright: ignore[reportMissingSuperCall]
+        pass
+
+    def __call__(
+        self,
+        request: _R,
+        enforce_content_headers: bool = True,  # noqa: ARG002, FBT001, FBT002
+    ) -> _R:
+        return request
+
+
+def make_monitoring_client(endpoint: str) -> MonitoringClient:
+    """Create a MonitoringClient that posts to the endpoint without signing.
+
+    The SDK's own retries and circuit breaker are disabled, so every request
+    reaches the exporter's retry policy.
+    """
+    return MonitoringClient(
+        {},
+        service_endpoint=endpoint,
+        signer=UnsignedSigner(),
+        retry_strategy=NoneRetryStrategy(),
+        circuit_breaker_strategy=NoCircuitBreakerStrategy(),
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.ingestion")
+    _ = parser.add_argument("--host", default="127.0.0.1")
+    _ = parser.add_argument("--port", type=int, default=8080)
+    _ = parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    _ = parser.add_argument("--throttle", type=float, default=0.0, help="ratio")
+    _ = parser.add_argument("--errors", type=float, default=0.0, help="ratio")
+    _ = parser.add_argument("--max-streams", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    service = FakeIngestionService(
+        IngestionLimits(max_streams=args.max_streams),
+        FaultInjection(
+            latency_seconds=args.latency,
+            throttle_ratio=args.throttle,
+            error_ratio=args.errors,
+        ),
+    )
+    server = FakeIngestionServer(service, (args.host, args.port))
+    print(f"Serving PostMetricData on {server.endpoint}", flush=True)  # noqa: T201
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(service.stats())  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
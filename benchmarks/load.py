@@ -0,0 +1,323 @@
+"""Drive a MeterProvider through the exporter against the stand-in ingestion server.
+
+Threads record measurements for ``--duration`` seconds while a periodic reader
+exports them through an OCIMonitoringExporter and a real MonitoringClient to a
+FakeIngestionServer. The report shows the end-to-end throughput in accepted
+datapoints per second and the latency percentiles of the exports and of the
+PostMetricData requests::
+
+    python -m benchmarks.load --duration 10 --attribute-sets 1000 --throttle 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from itertools import count
+from typing import TYPE_CHECKING, Any, Callable, Literal, NamedTuple, Sequence, cast
+
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import (
+    MetricExportResult,
+    PeriodicExportingMetricReader,
+)
+
+from benchmarks.ingestion import (
+    FakeIngestionServer,
+    FakeIngestionService,
+    FaultInjection,
+    make_monitoring_client,
+)
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+from opentelemetry_exporter_oci_monitoring.encoding import encode_post_metric_data
+from opentelemetry_exporter_oci_monitoring.ratelimit import RateLimitSettings
+from opentelemetry_exporter_oci_monitoring.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from oci.monitoring import MonitoringClient
+    from opentelemetry.sdk.metrics.export import MetricsData
+
+    from benchmarks.ingestion import IngestionStats
+
+# the number of measurements recorded between checks of the stop event
+RECORD_CHUNK = 1_000
+
+
+@dataclass(frozen=True)
+class LoadSettings:
+    """The shape of the generated load and the exporter configuration.
+
+    Every thread cycles through ``attribute_sets`` attribute sets, recording
+    one measurement on each of ``metrics`` instruments, alternating counters
+    and histograms. ``rate_limit`` is the rate of a RateLimitSettings.
+    """
+
+    duration_seconds: float = 10.0
+    threads: int = 2
+    metrics: int = 4
+    attribute_sets: int = 100
+    export_interval_millis: float = 1_000
+    export_timeout_millis: float = 10_000
+    payload_encoder: Literal["sdk", "json"] = "json"
+    retry: bool = True
+    rate_limit: float | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("threads", "metrics", "attribute_sets"):
+            if getattr(self, name) < 1:
+                msg = f"{name} must be at least 1"
+                raise ValueError(msg)
+        if self.duration_seconds <= 0 or self.export_interval_millis <= 0:
+            msg = "duration_seconds and export_interval_millis must be positive"
+            raise ValueError(msg)
+
+
+class Percentiles(NamedTuple):
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+def percentiles(samples: Sequence[float]) -> Percentiles:
+    """Return the nearest-rank percentiles of the samples, 0 if there are none."""
+    ordered = sorted(samples)
+    if not ordered:
+        return Percentiles(0.0, 0.0, 0.0, 0.0)
+
+    def rank(percent: int) -> float:
+        return ordered[max(0, -(-percent * len(ordered) // 100) - 1)]
+
+    return Percentiles(rank(50), rank(90), rank(99), ordered[-1])
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    seconds: float
+    measurements: int
+    exports: int
+    failed_exports: int
+    requests: int
+    accepted_datapoints: int
+    failed_metrics: int
+    throttled_requests: int
+    failed_requests: int
+    export_latency: Percentiles
+    request_latency: Percentiles
+
+    @property
+    def datapoints_per_second(self) -> float:
+        return self.accepted_datapoints / self.seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "export_latency": self.export_latency._asdict(),
+            "request_latency": self.request_latency._asdict(),
+            "datapoints_per_second": self.datapoints_per_second,
+        }
+
+
+class TimingClient:
+    """Forwards PostMetricData requests to a client and records their latency."""
+
+    def __init__(self, client: MonitoringClient) -> None:
+        super().__init__()
+        self.client = client
+        self.latencies: list[float] = []
+
+    def post_metric_data(self, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        start = time.perf_counter()
+        try:
+            return self.client.post_metric_data(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+class TimedExporter(OCIMonitoringExporter):
+    """Records the latency and the result of every export."""
+
+    def __post_init__(self, *args: Any) -> None:  # noqa: ANN401
+        super().__post_init__(*args)
+        self.export_latencies: list[float] = []
+        self.failed_exports = 0
+
+    def export(
+        self,
+        metrics_data: MetricsData,
+        timeout_millis: float = 10_000,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> MetricExportResult:
+        start = time.perf_counter()
+        result = super().export(metrics_data, timeout_millis, **kwargs)
+        self.export_latencies.append(time.perf_counter() - start)
+        if result != MetricExportResult.SUCCESS:
+            self.failed_exports += 1
+        return result
+
+
+def make_exporter(settings: LoadSettings, client: TimingClient) -> TimedExporter:
+    return TimedExporter(
+        cast("MonitoringClient", client),
+        DefaultMetricsConverter("load_test", "load-test", "ocid1.compartment.load"),
+        payload_encoder=encode_post_metric_data
+        if settings.payload_encoder == "json"
+        else None,
+        retry_policy=RetryPolicy() if settings.retry else None,
+        rate_limit=None
+        if settings.rate_limit is None
+        else RateLimitSettings(
+            rate=settings.rate_limit, min_rate=min(1.0, settings.rate_limit)
+        ),
+    )
+
+
+def run_load(
+    settings: LoadSettings, service: FakeIngestionService | None = None
+) -> LoadReport:
+    service = service or FakeIngestionService()
+    server = FakeIngestionServer(service)
+    server.start()
+    client = TimingClient(make_monitoring_client(server.endpoint))
+    exporter = make_exporter(settings, client)
+    provider = MeterProvider(
+        metric_readers=[
+            PeriodicExportingMetricReader(
+                exporter,
+                export_interval_millis=settings.export_interval_millis,
+                export_timeout_millis=settings.export_timeout_millis,
+            )
+        ]
+    )
+    try:
+        start = time.perf_counter()
+        measurements = _record(provider, settings)
+        provider.shutdown()
+        seconds = time.perf_counter() - start
+    finally:
+        server.stop()
+
+    stats: IngestionStats = service.stats()
+    return LoadReport(
+        seconds=seconds,
+        measurements=measurements,
+        exports=len(exporter.export_latencies),
+        failed_exports=exporter.failed_exports,
+        requests=len(client.latencies),
+        accepted_datapoints=stats.accepted_datapoints,
+        failed_metrics=stats.failed_metrics,
+        throttled_requests=stats.throttled_requests,
+        failed_requests=stats.failed_requests,
+        export_latency=percentiles(exporter.export_latencies),
+        request_latency=percentiles(client.latencies),
+    )
+
+
+def _record(provider: MeterProvider, settings: LoadSettings) -> int:
+    meter = provider.get_meter("benchmarks.load")
+    instruments: list[Callable[[float, dict[str, str]], None]] = [
+        meter.create_histogram(f"load.histogram.{index}").record
+        if index % 2
+        else meter.create_counter(f"load.counter.{index}").add
+        for index in range(settings.metrics)
+    ]
+    attribute_sets = [
+        {"worker": str(index % settings.threads), "series": str(index)}
+        for index in range(settings.attribute_sets)
+    ]
+    stop = threading.Event()
+    counts = [0] * settings.threads
+
+    def record(thread: int) -> None:
+        values = count()
+        while not stop.is_set():
+            for _ in range(RECORD_CHUNK):
+                value = next(values)
+                attributes = attribute_sets[value % len(attribute_sets)]
+                for instrument in instruments:
+                    instrument(value % 1_000, attributes)
+            counts[thread] += RECORD_CHUNK * len(instruments)
+
+    threads = [
+        threading.Thread(target=record, args=(index,), daemon=True)
+        for index in range(settings.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    _ = stop.wait(settings.duration_seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(counts)
+
+
+def format_report(report: LoadReport) -> str:
+    def milliseconds(latency: Percentiles) -> str:
+        return " ".join(
+            f"{name}={value * 1e3:.1f}ms" for name, value in latency._asdict().items()
+        )
+
+    return "\n".join(
+        [
+            f"{report.measurements:,} measurements in {report.seconds:.1f}s",
+            f"{report.accepted_datapoints:,} datapoints accepted,"
+            f" {report.datapoints_per_second:,.0f}/s",
+            f"{report.exports} exports, {report.failed_exports} failed",
+            f"{report.requests} requests, {report.throttled_requests} throttled,"
+            f" {report.failed_requests} failed, {report.failed_metrics} failed metrics",
+            f"export latency  {milliseconds(report.export_latency)}",
+            f"request latency {milliseconds(report.request_latency)}",
+        ]
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    _ = parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    _ = parser.add_argument("--threads", type=int, default=2)
+    _ = parser.add_argument("--metrics", type=int, default=4)
+    _ = parser.add_argument("--attribute-sets", type=int, default=100)
+    _ = parser.add_argument(
+        "--export-interval", type=float, default=1.0, help="seconds"
+    )
+    _ = parser.add_argument(
+        "--payload-encoder", choices=("sdk", "json"), default="json"
+    )
+    _ = parser.add_argument("--no-retry", action="store_true")
+    _ = parser.add_argument("--rate-limit", type=float, help="requests per second")
+    _ = parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    _ = parser.add_argument("--throttle", type=float, default=0.0, help="ratio")
+    _ = parser.add_argument("--errors", type=float, default=0.0, help="ratio")
+    _ = parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args(argv)
+
+    settings = LoadSettings(
+        duration_seconds=args.duration,
+        threads=args.threads,
+        metrics=args.metrics,
+        attribute_sets=args.attribute_sets,
+        export_interval_millis=args.export_interval * 1e3,
+        payload_encoder=args.payload_encoder,
+        retry=not args.no_retry,
+        rate_limit=args.rate_limit,
+    )
+    service = FakeIngestionService(
+        faults=FaultInjection(
+            latency_seconds=args.latency,
+            throttle_ratio=args.throttle,
+            error_ratio=args.errors,
+        )
+    )
+    report = run_load(settings, service)
+    print(  # noqa: T201
+        json.dumps(report.to_dict(), indent=2) if args.json else format_report(report)
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Mapping, cast
+
+from oci.monitoring.models import PostMetricDataResponseDetails
+
+from opentelemetry_exporter_oci_monitoring import (
+    MetricsSerializer,
+    OCIMonitoringExporter,
+)
+from opentelemetry_exporter_oci_monitoring.converter import (
+    DefaultMetricsConverter,
+    PrefixedDimensionsExtractor,
+)
+from opentelemetry_exporter_oci_monitoring.encoding import encode_post_metric_data
+
+if TYPE_CHECKING:
+    from typing import IO
+
+    from oci.monitoring import MonitoringClient
+    from opentelemetry.sdk.metrics.export import MetricsData
+
+    from benchmarks.workload import Workload
+
+Case = Callable[["MetricsData"], object]
+Baseline = Dict[str, Dict[str, float]]
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """The result of running one benchmark case.
+
+    ``seconds`` is the fastest of the timed runs. ``peak_bytes`` is the peak of
+    the memory traced during a separate run and ``allocations`` the number of
+    memory blocks allocated during another one, including the ones freed again
+    before it ended, see count_allocations.
+    """
+
+    case: str
+    data_points: int
+    seconds: float
+    peak_bytes: int
+    allocations: int
+
+    @property
+    def points_per_second(self) -> float:
+        return self.data_points / self.seconds
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "points_per_second": self.points_per_second,
+            "peak_bytes": self.peak_bytes,
+            "allocations": self.allocations,
+        }
+
+
+class FakeMonitoringClient:
+    """Accepts every PostMetricData request without sending it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests_count = 0
+        self._response = _Response(
+            PostMetricDataResponseDetails(failed_metrics_count=0, failed_metrics=[])
+        )
+
+    def post_metric_data(self, *_: object, **__: object) -> object:
+        self.requests_count += 1
+        return self._response
+
+
+class NullWriter:
+    """A binary stream that discards what is written to it."""
+
+    def write(self, data: bytes) -> int:
+        return len(data)
+
+
+@dataclass(frozen=True)
+class _Response:
+    data: PostMetricDataResponseDetails
+    status: int = 200
+
+
+def make_cases() -> dict[str, Case]:
+    converter = DefaultMetricsConverter(
+        namespace="benchmarks",
+        resource_group="benchmarks",
+        compartment_id="ocid1.compartment.oc1..benchmarks",
+    )
+    columnar_converter = replace(converter, columnar=True)
+    client = cast("MonitoringClient", FakeMonitoringClient())
+    extractor = PrefixedDimensionsExtractor()
+    serializer = MetricsSerializer(converter)
+    null_writer = cast("IO[bytes]", NullWriter())
+
+    def extract(metrics_data: MetricsData) -> object:
+        return [
+            extractor.extract(resource_metrics.resource, scope_metrics.scope, point)
+            for resource_metrics in metrics_data.resource_metrics
+            for scope_metrics in resource_metrics.scope_metrics
+            for metric in scope_metrics.metrics
+            for point in metric.data.data_points
+        ]
+
+    return {
+        "extract": extract,
+        "convert": lambda metrics_data: list(converter.convert(metrics_data)),
+        "convert_streams": lambda metrics_data: list(
+            converter.convert_streams(metrics_data)
+        ),
+        "convert_columnar": lambda metrics_data: list(
+            columnar_converter.convert_streams(metrics_data)
+        ),
+        "serialize": serializer,
+        "serialize_streaming": lambda metrics_data: serializer.write(
+            metrics_data, null_writer
+        ),
+        "export": OCIMonitoringExporter(client, converter).export,
+        "export_encoded": OCIMonitoringExporter(
+            client, converter, payload_encoder=encode_post_metric_data
+        ).export,
+    }
+
+
+def measure(
+    name: str, case: Case, metrics_data: MetricsData, data_points: int, repeat: int
+) -> Measurement:
+    timings: list[float] = []
+    for _ in range(repeat):
+        _ = gc.collect()
+        start = time.perf_counter()
+        result = case(metrics_data)
+        timings.append(time.perf_counter() - start)
+        del result
+
+    _ = gc.collect()
+    tracemalloc.start()
+    try:
+        result = case(metrics_data)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return Measurement(
+        case=name,
+        data_points=data_points,
+        seconds=min(timings),
+        peak_bytes=peak_bytes,
+        allocations=count_allocations(case, metrics_data),
+    )
+
+
+def count_allocations(case: Case, metrics_data: MetricsData) -> int:
+    """Count the memory blocks allocated while running the case.
+
+    CPython only reports the number of blocks currently allocated, so it is
+    sampled on every function call and return and its increases are summed up.
+    Blocks that are allocated and freed between two samples are not counted,
+    but the temporary objects passed between functions are. The garbage
+    collector is disabled, so equal runs count equal allocations.
+    """
+    allocations = 0
+    last = sys.getallocatedblocks()
+
+    def sample(*_: object) -> None:
+        nonlocal allocations, last
+        blocks = sys.getallocatedblocks()
+        if blocks > last:
+            allocations += blocks - last
+        last = blocks
+
+    _ = gc.collect()
+    gc.disable()
+    sys.setprofile(sample)
+    try:
+        result = case(metrics_data)
+    finally:
+        sys.setprofile(None)
+        gc.enable()
+    del result
+    return allocations
+
+
+def run(
+    metrics_data: MetricsData,
+    workload: Workload,
+    *,
+    cases: Iterable[str] | None = None,
+    repeat: int = 5,
+) -> list[Measurement]:
+    available = make_cases()
+    names = list(available) if cases is None else list(cases)
+    return [
+        measure(name, available[name], metrics_data, workload.data_points, repeat)
+        for name in names
+    ]
+
+
+def make_baseline(
+    workload: Workload, measurements: Iterable[Measurement]
+) -> dict[str, Any]:
+    return {
+        "workload": asdict(workload),
+        "results": {
+            measurement.case: measurement.to_dict() for measurement in measurements
+        },
+    }
+
+
+def find_regressions(
+    measurements: Iterable[Measurement],
+    baseline: Mapping[str, Any],
+    workload: Workload,
+    tolerance: float,
+) -> list[str]:
+    """Compare measurements with a saved baseline of the same workload.
+
+    Throughput may drop and memory grow by ``tolerance`` (a fraction) before a
+    measurement counts as a regression.
+    """
+    if baseline["workload"] != asdict(workload):
+        msg = "the baseline was recorded for a different workload"
+        raise ValueError(msg)
+
+    results: Baseline = baseline["results"]
+    regressions: list[str] = []
+    for measurement in measurements:
+        expected = results.get(measurement.case)
+        if expected is None:
+            continue
+        actual = measurement.to_dict()
+        if actual["points_per_second"] < expected["points_per_second"] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"{measurement.case}: {actual['points_per_second']:,.0f} points/s,"
+                f" baseline {expected['points_per_second']:,.0f} points/s"
+            )
+        regressions.extend(
+            f"{measurement.case}: {actual[key]:,.0f} {key},"
+            f" baseline {expected[key]:,.0f} {key}"
+            for key in ("peak_bytes", "allocations")
+            # baselines may predate a measurement
+            if key in expected and actual[key] > expected[key] * (1 + tolerance)
+        )
+    return regressions
+
+
+def format_table(measurements: Iterable[Measurement]) -> str:
+    lines = [
+        f"{'case':<20} {'points/s':>14} {'seconds':>10} {'peak MiB':>10}"
+        f" {'allocations':>12}"
+    ]
+    lines.extend(
+        f"{m.case:<20} {m.points_per_second:>14,.0f} {m.seconds:>10.4f}"
+        f" {m.peak_bytes / 2**20:>10.2f} {m.allocations:>12,}"
+        for m in measurements
+    )
+    return "\n".join(lines)
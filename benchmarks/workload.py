@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    Gauge,
+    HistogramDataPoint,
+    Metric,
+    MetricsData,
+    NumberDataPoint,
+    ResourceMetrics,
+    ScopeMetrics,
+    Sum,
+)
+from opentelemetry.sdk.metrics.export import Histogram as HistogramData
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+
+INTERVAL_NANOS = 10**9
+START_TIME_UNIX_NANO = 1_724_678_400 * 10**9
+HISTOGRAM_BOUNDS = (0.0, 5.0, 10.0, 25.0, 50.0, 75.0, 100.0, 250.0, 500.0, 1000.0)
+
+
+@dataclass(frozen=True)
+class Workload:
+    """The shape of a generated MetricsData.
+
+    Every resource reports ``metrics`` metrics, each with ``attribute_sets``
+    distinct attribute sets of ``attribute_width`` attributes and
+    ``points_per_stream`` data points per attribute set. Metrics cycle through
+    delta sums, gauges and histograms.
+    """
+
+    resources: int = 4
+    metrics: int = 20
+    attribute_sets: int = 50
+    points_per_stream: int = 10
+    attribute_width: int = 8
+    value_length: int = 16
+    seed: int = 0
+
+    @property
+    def streams(self) -> int:
+        return self.resources * self.metrics * self.attribute_sets
+
+    @property
+    def data_points(self) -> int:
+        return self.streams * self.points_per_stream
+
+
+SCENARIOS = {
+    "small": Workload(resources=1, metrics=3, attribute_sets=5, points_per_stream=2),
+    "default": Workload(),
+    "high-cardinality": Workload(
+        resources=2, metrics=10, attribute_sets=1_000, points_per_stream=2
+    ),
+    "long-streams": Workload(
+        resources=1, metrics=10, attribute_sets=10, points_per_stream=1_000
+    ),
+    "wide-attributes": Workload(
+        resources=2, metrics=10, attribute_sets=50, attribute_width=32
+    ),
+}
+
+
+def make_metrics_data(workload: Workload) -> MetricsData:
+    rng = random.Random(workload.seed)  # noqa: S311
+
+    def make_value() -> str:
+        return "".join(
+            rng.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=workload.value_length)
+        )
+
+    attribute_sets = [
+        {
+            f"attribute.{index}": make_value()
+            for index in range(workload.attribute_width)
+        }
+        for _ in range(workload.attribute_sets)
+    ]
+
+    return MetricsData(
+        resource_metrics=[
+            ResourceMetrics(
+                resource=Resource(
+                    {
+                        "service.name": f"service-{resource}",
+                        "service.instance.id": make_value(),
+                        "host.name": make_value(),
+                    }
+                ),
+                scope_metrics=[
+                    ScopeMetrics(
+                        scope=InstrumentationScope("benchmarks", "1.0.0"),
+                        metrics=[
+                            _make_metric(index, attribute_sets, workload, rng)
+                            for index in range(workload.metrics)
+                        ],
+                        schema_url="",
+                    )
+                ],
+                schema_url="",
+            )
+            for resource in range(workload.resources)
+        ]
+    )
+
+
+def _make_metric(
+    index: int,
+    attribute_sets: list[dict[str, str]],
+    workload: Workload,
+    rng: random.Random,
+) -> Metric:
+    points = range(workload.points_per_stream)
+    name = f"benchmark.metric.{index}"
+
+    if index % 3 == 2:  # noqa: PLR2004
+        histogram_points = [
+            HistogramDataPoint(
+                attributes=attributes,
+                start_time_unix_nano=START_TIME_UNIX_NANO + point * INTERVAL_NANOS,
+                time_unix_nano=START_TIME_UNIX_NANO + (point + 1) * INTERVAL_NANOS,
+                count=sum(bucket_counts),
+                sum=sum(bucket_counts) * 42.0,
+                bucket_counts=bucket_counts,
+                explicit_bounds=HISTOGRAM_BOUNDS,
+                min=0.5,
+                max=1500.0,
+            )
+            for attributes in attribute_sets
+            for point in points
+            for bucket_counts in [
+                [rng.randrange(3) for _ in range(len(HISTOGRAM_BOUNDS) + 1)]
+            ]
+        ]
+        data = HistogramData(
+            data_points=histogram_points,
+            aggregation_temporality=AggregationTemporality.DELTA,
+        )
+        return Metric(name=name, description=None, unit="ms", data=data)
+
+    number_points = [
+        NumberDataPoint(
+            attributes=attributes,
+            start_time_unix_nano=START_TIME_UNIX_NANO + point * INTERVAL_NANOS,
+            time_unix_nano=START_TIME_UNIX_NANO + (point + 1) * INTERVAL_NANOS,
+            value=rng.random() * 100,
+        )
+        for attributes in attribute_sets
+        for point in points
+    ]
+    if index % 3 == 1:
+        return Metric(
+            name=name, description=None, unit="1", data=Gauge(data_points=number_points)
+        )
+    return Metric(
+        name=name,
+        description=None,
+        unit="1",
+        data=Sum(
+            data_points=number_points,
+            aggregation_temporality=AggregationTemporality.DELTA,
+            is_monotonic=True,
+        ),
+    )
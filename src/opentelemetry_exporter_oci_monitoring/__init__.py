@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 import json
+import time
 from dataclasses import InitVar, dataclass, field
 from functools import partial
 from http import HTTPStatus
 from logging import getLogger
-from typing import TYPE_CHECKING, Any, Callable, Literal
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    NamedTuple,
+    Sequence,
+)
 
-from oci.monitoring.models import PostMetricDataDetails
-from oci.util import to_dict
 from opentelemetry.sdk.metrics._internal.instrument import (
     Counter,
     Gauge,
@@ -25,15 +34,55 @@ from opentelemetry.sdk.metrics.export import (
     MetricsData,
 )
 
+from opentelemetry_exporter_oci_monitoring.batching import BatchLimits, iter_batches
+from opentelemetry_exporter_oci_monitoring.converter import (
+    BufferingMetricsConverter,
+    StreamingMetricsConverter,
+    TransactionalMetricsConverter,
+    to_metric_data_details,
+)
+from opentelemetry_exporter_oci_monitoring.dispatch import Dispatcher
+from opentelemetry_exporter_oci_monitoring.encoding import (
+    encode_post_metric_data,
+    write_metric_data,
+)
+from opentelemetry_exporter_oci_monitoring.queueing import ExportQueue
+from opentelemetry_exporter_oci_monitoring.ratelimit import (
+    RateLimiter,
+    shared_rate_limiter,
+)
+from opentelemetry_exporter_oci_monitoring.retry import is_retryable, retry_after_millis
+from opentelemetry_exporter_oci_monitoring.spool import DiskSpool
+from opentelemetry_exporter_oci_monitoring.telemetry import ExporterTelemetry
+from opentelemetry_exporter_oci_monitoring.validation import MetricValidator
+
 if TYPE_CHECKING:
     from oci.monitoring import MonitoringClient
+    from oci.monitoring.models import (
+        MetricDataDetails,
+        PostMetricDataDetails,
+        PostMetricDataResponseDetails,
+    )
+    from oci.response import Response
+    from opentelemetry.metrics import MeterProvider
     from opentelemetry.sdk.metrics.view import Aggregation
 
-    from opentelemetry_exporter_oci_monitoring.converter import MetricsConverter
+    from opentelemetry_exporter_oci_monitoring.converter import (
+        ConvertedMetric,
+        MetricsConverter,
+    )
+    from opentelemetry_exporter_oci_monitoring.dispatch import DispatchSettings
+    from opentelemetry_exporter_oci_monitoring.encoding import SerializationFormat
+    from opentelemetry_exporter_oci_monitoring.queueing import QueueSettings
+    from opentelemetry_exporter_oci_monitoring.ratelimit import RateLimitSettings
+    from opentelemetry_exporter_oci_monitoring.retry import RetryPolicy
+    from opentelemetry_exporter_oci_monitoring.spool import SpoolSettings
+    from opentelemetry_exporter_oci_monitoring.validation import ValidationRules
 
 logger = getLogger(__name__)
 
 BATCH_ATOMICITY = Literal["ATOMIC", "NON_ATOMIC"]
+PayloadEncoder = Callable[[Sequence["ConvertedMetric"], BATCH_ATOMICITY], bytes]
 
 
 @dataclass
@@ -42,9 +91,27 @@ class OCIMonitoringExporter(MetricExporter):
     converter: MetricsConverter = field(repr=False)
 
     batch_atomicity: BATCH_ATOMICITY = "ATOMIC"
+    batch_limits: BatchLimits = field(default_factory=BatchLimits)
+    payload_encoder: PayloadEncoder | None = None
+    export_queue: QueueSettings | None = None
+    retry_policy: RetryPolicy | None = None
+    spool: SpoolSettings | None = None
+    meter_provider: MeterProvider | None = field(default=None, repr=False)
+    validation: ValidationRules | None = None
+    dispatch: DispatchSettings | None = None
+    rate_limit: RateLimitSettings | None = None
     preferred_temporality: InitVar[dict[type, AggregationTemporality] | None] = None
     preferred_aggregation: InitVar[dict[type, Aggregation] | None] = None
 
+    _queue: ExportQueue[Sequence[ConvertedMetric]] | None = field(
+        default=None, init=False, repr=False
+    )
+    _spool: DiskSpool | None = field(default=None, init=False, repr=False)
+    _telemetry: ExporterTelemetry | None = field(default=None, init=False, repr=False)
+    _validator: MetricValidator | None = field(default=None, init=False, repr=False)
+    _dispatcher: Dispatcher | None = field(default=None, init=False, repr=False)
+    _rate_limiter: RateLimiter | None = field(default=None, init=False, repr=False)
+
     def __post_init__(
         self,
         preferred_temporality: dict[type, AggregationTemporality] | None,
@@ -67,26 +134,244 @@ class OCIMonitoringExporter(MetricExporter):
             preferred_aggregation=preferred_aggregation,
         )
 
+        if self.meter_provider is not None:
+            self._telemetry = ExporterTelemetry(self.meter_provider)
+        if self.validation is not None:
+            self._validator = MetricValidator(self.validation)
+        if self.spool is not None:
+            self._spool = DiskSpool(self.spool)
+        if self.dispatch is not None:
+            self._dispatcher = Dispatcher(self.dispatch, name=type(self).__name__)
+        if self.rate_limit is not None:
+            self._rate_limiter = shared_rate_limiter(self.rate_limit)
+        if self.export_queue is not None:
+            self._queue = ExportQueue(
+                self._post_and_replay, self.export_queue, name=type(self).__name__
+            )
+
     def export(
         self,
         metrics_data: MetricsData,
-        timeout_millis: float = 10_000,  # noqa: ARG002
+        timeout_millis: float = 10_000,
         **kwargs: Any,  # noqa: ANN401
     ) -> MetricExportResult:
         if len(kwargs) > 0:
             logger.warning(
                 "Ignored extra export kwargs.", extra={"ignored_kwargs": kwargs}
             )
+        return self._export(self._convert(metrics_data), timeout_millis)
+
+    def _export(
+        self, batches: Iterable[Sequence[ConvertedMetric]], timeout_millis: float
+    ) -> MetricExportResult:
+        if self._queue is not None:
+            accepted = [self._queue.put(batch) for batch in batches]
+            if all(accepted):
+                return MetricExportResult.SUCCESS
+            self._rollback()
+            return MetricExportResult.FAILURE
 
-        response = self.client.post_metric_data(
-            PostMetricDataDetails(
-                metric_data=list(self.converter.convert(metrics_data)),
-                batch_atomicity=self.batch_atomicity,
+        deadline = time.monotonic() + timeout_millis / 1e3
+        if self._dispatcher is not None:
+            results = self._dispatcher.map(
+                lambda client, batch: self._post_batch(batch, deadline, client), batches
             )
+        else:
+            results = [self._post_batch(batch, deadline) for batch in batches]
+
+        if all(result == MetricExportResult.SUCCESS for result in results):
+            self._replay_spool(deadline)
+            return MetricExportResult.SUCCESS
+        self._rollback()
+        return MetricExportResult.FAILURE
+
+    def _rollback(self) -> None:
+        # the converter must not act as if the failed export was delivered
+        if isinstance(self.converter, TransactionalMetricsConverter):
+            self.converter.rollback()
+
+    def _convert(
+        self, metrics_data: MetricsData
+    ) -> Iterable[Sequence[ConvertedMetric]]:
+        telemetry = self._telemetry
+        if telemetry is None:
+            return self._iter_batches(metrics_data)
+        start = time.perf_counter()
+        batches = list(self._iter_batches(metrics_data))
+        telemetry.record_conversion(time.perf_counter() - start, batches)
+        return batches
+
+    def _iter_batches(
+        self, metrics_data: MetricsData
+    ) -> Iterator[Sequence[ConvertedMetric]]:
+        converter = self.converter
+        validator = self._validator
+        if self.payload_encoder is not None and isinstance(
+            converter, StreamingMetricsConverter
+        ):
+            streams = converter.convert_streams(metrics_data)
+            if validator is not None:
+                streams = validator.validate_all(streams)
+            yield from iter_batches(streams, self.batch_limits, by_route=True)
+        else:
+            metric_data = converter.convert(metrics_data)
+            if validator is not None:
+                metric_data = validator.validate_all(metric_data)
+            yield from iter_batches(metric_data, self.batch_limits, by_route=True)
+
+    def _encode_batch(
+        self, batch: Sequence[ConvertedMetric]
+    ) -> PostMetricDataDetails | bytes:
+        if self.payload_encoder is not None:
+            return self.payload_encoder(batch, self.batch_atomicity)
+
+        from oci.monitoring.models import PostMetricDataDetails
+
+        return PostMetricDataDetails(
+            metric_data=[to_metric_data_details(metric_data) for metric_data in batch],
+            batch_atomicity=self.batch_atomicity,
+        )
+
+    def _post_batch(
+        self,
+        batch: Sequence[ConvertedMetric],
+        deadline: float | None = None,
+        client: MonitoringClient | None = None,
+    ) -> MetricExportResult:
+        result, transient, pending = self._post(
+            self._encode_batch(batch), deadline, client
         )
+        if transient and self._spool is not None:
+            self._spool.append(_spool_payload(pending))
+        return result
+
+    def _post_and_replay(self, batch: Sequence[ConvertedMetric]) -> None:
+        if self._post_batch(batch) == MetricExportResult.SUCCESS:
+            self._replay_spool()
+
+    def _replay_spool(self, deadline: float | None = None) -> None:
+        spool = self._spool
+        if spool is None:
+            return
+        for _ in range(spool.settings.replay_limit):
+            spooled = spool.peek()
+            if spooled is None:
+                return
+            result, transient, pending = self._post(spooled.payload, deadline)
+            if transient:
+                if pending is not spooled.payload:
+                    # only the failed metrics of a partial failure are kept
+                    spool.pop()
+                    spool.append(_spool_payload(pending), spooled.time_unix_nano)
+                return
+            if result != MetricExportResult.SUCCESS:
+                logger.warning(
+                    "Discarding a spooled payload that was rejected.",
+                    extra={"time_unix_nano": spooled.time_unix_nano},
+                )
+            spool.pop()
+
+    def _post(
+        self,
+        body: PostMetricDataDetails | bytes,
+        deadline: float | None,
+        client: MonitoringClient | None = None,
+    ) -> _PostResult:
+        client = self.client if client is None else client
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._post_once(client, body, deadline)
+            except Exception as error:
+                delay_millis = self._retry_delay_millis(attempt, deadline, error)
+                if delay_millis is None:
+                    logger.exception(
+                        "Failed posting metric data.", extra={"attempts": attempt}
+                    )
+                    return _PostResult(
+                        MetricExportResult.FAILURE, is_retryable(error), body
+                    )
+                logger.warning(
+                    "Retrying to post metric data.",
+                    extra={"attempt": attempt, "delay_millis": delay_millis},
+                    exc_info=True,
+                )
+                time.sleep(delay_millis / 1e3)
+                continue
 
-        response_data = response.data
-        if response_data.failed_metrics_count > 0:
+            resend = self._resend(response.data, attempt, deadline)
+            if resend is not None:
+                body = self._encode_batch(resend.batch)
+                time.sleep(resend.delay_millis / 1e3)
+                continue
+
+            return _PostResult(
+                MetricExportResult.SUCCESS
+                if response.status == HTTPStatus.OK
+                else MetricExportResult.FAILURE,
+                transient=False,
+                body=body,
+            )
+
+    def _post_once(
+        self,
+        client: MonitoringClient,
+        body: PostMetricDataDetails | bytes,
+        deadline: float | None,
+    ) -> Response[PostMetricDataResponseDetails, str]:
+        limiter = self._rate_limiter
+        if limiter is not None and not limiter.acquire(deadline):
+            msg = "Rate limit does not admit posting metric data before the deadline."
+            raise TimeoutError(msg)
+
+        telemetry = self._telemetry
+        start = time.perf_counter()
+        try:
+            response = client.post_metric_data(body)
+        except Exception as error:
+            status = getattr(error, "status", None)
+            if limiter is not None and isinstance(status, int):
+                limiter.record(status)
+            if telemetry is not None:
+                telemetry.record_request(
+                    time.perf_counter() - start, body, status, error
+                )
+            raise
+
+        if limiter is not None:
+            limiter.record(response.status)
+        if telemetry is not None:
+            telemetry.record_request(time.perf_counter() - start, body, response.status)
+            telemetry.record_failed_metrics(response.data.failed_metrics_count)
+        return response
+
+    def _retry_delay_millis(
+        self, attempt: int, deadline: float | None, error: Exception | None = None
+    ) -> float | None:
+        policy = self.retry_policy
+        if policy is None:
+            return None
+        if error is None:
+            return policy.delay_millis(attempt, deadline)
+        if not policy.is_retryable(error):
+            return None
+        return policy.delay_millis(attempt, deadline, retry_after_millis(error))
+
+    def _resend(
+        self,
+        response_data: PostMetricDataResponseDetails,
+        attempt: int,
+        deadline: float | None,
+    ) -> _Resend | None:
+        """Return the failed metrics of a partial failure if they are resent."""
+        if response_data.failed_metrics_count == 0:
+            return None
+        failed_batch = self._failed_batch(response_data)
+        delay_millis = (
+            self._retry_delay_millis(attempt, deadline) if failed_batch else None
+        )
+        if delay_millis is None:
             logger.warning(
                 "Failed exporting some metrics.",
                 extra={
@@ -94,25 +379,80 @@ class OCIMonitoringExporter(MetricExporter):
                     "failed_metrics_count": response_data.failed_metrics_count,
                 },
             )
-
-        return (
-            MetricExportResult.SUCCESS
-            if response.status == HTTPStatus.OK
-            else MetricExportResult.FAILURE
+            return None
+        logger.info(
+            "Resending failed metrics.",
+            extra={
+                "attempt": attempt,
+                "delay_millis": delay_millis,
+                "failed_metrics_count": len(failed_batch),
+            },
         )
+        return _Resend(failed_batch, delay_millis)
+
+    def _failed_batch(
+        self, response_data: PostMetricDataResponseDetails
+    ) -> list[MetricDataDetails]:
+        # with atomic batches, the service accepts all or none of the metrics
+        if self.batch_atomicity != "NON_ATOMIC" or not response_data.failed_metrics:
+            return []
+        return [record.metric_data for record in response_data.failed_metrics]
+
+    def force_flush(self, timeout_millis: float = 10_000) -> bool:
+        flushed = self._flush_converter(timeout_millis)
+        if self._queue is None:
+            return flushed
+        return self._queue.flush(timeout_millis) and flushed
 
-    def force_flush(self, timeout_millis: float = 10_000) -> bool:  # noqa: ARG002
-        return True
+    def _flush_converter(self, timeout_millis: float) -> bool:
+        """Export the streams the converter still holds back."""
+        converter = self.converter
+        if not isinstance(converter, BufferingMetricsConverter):
+            return True
+        streams = converter.flush_streams()
+        if self._validator is not None:
+            streams = self._validator.validate_all(streams)
+        batches = iter_batches(streams, self.batch_limits, by_route=True)
+        return self._export(batches, timeout_millis) == MetricExportResult.SUCCESS
 
     def shutdown(
         self,
-        timeout_millis: float = 30_000,  # noqa: ARG002
+        timeout_millis: float = 30_000,
         **kwargs: Any,  # noqa: ANN401
     ) -> None:
         if len(kwargs) > 0:
             logger.warning(
                 "Ignored extra shutdown kwargs.", extra={"ignored_kwargs": kwargs}
             )
+        _ = self._flush_converter(timeout_millis)
+        drained = self._queue is None or self._queue.shutdown(timeout_millis)
+        if self._dispatcher is not None:
+            self._dispatcher.shutdown()
+        if self._spool is not None:
+            if drained:
+                self._spool.close()
+            else:
+                # the worker may still spool or replay payloads
+                logger.warning("Leaving the spool open for the export queue worker.")
+
+
+class _PostResult(NamedTuple):
+    result: MetricExportResult
+    # whether the payload may be accepted when posted again later
+    transient: bool
+    # the payload last posted, only the failed metrics after a partial resend
+    body: PostMetricDataDetails | bytes
+
+
+class _Resend(NamedTuple):
+    batch: list[MetricDataDetails]
+    delay_millis: float
+
+
+def _spool_payload(body: PostMetricDataDetails | bytes) -> bytes:
+    if isinstance(body, bytes):
+        return body
+    return encode_post_metric_data(body.metric_data, body.batch_atomicity)
 
 
 @dataclass
@@ -121,6 +461,29 @@ class MetricsSerializer:
     json_serializer: Callable[[Any], str] = field(default=partial(json.dumps, indent=4))
 
     def __call__(self, metrics_data: MetricsData, /) -> str:
+        from oci.util import to_dict
+
         return self.json_serializer(
             [to_dict(obj) for obj in self.converter.convert(metrics_data)]
         )
+
+    def write(
+        self,
+        metrics_data: MetricsData,
+        output: IO[bytes],
+        output_format: SerializationFormat = "json",
+        *,
+        compact: bool = True,
+    ) -> int:
+        """Write the converted metrics to a binary stream while converting them.
+
+        Unlike ``__call__``, the metrics are encoded like in the body of a
+        PostMetricData request. Returns the number of bytes written.
+        """
+        converter = self.converter
+        metric_data: Iterable[ConvertedMetric] = (
+            converter.convert_streams(metrics_data)
+            if isinstance(converter, StreamingMetricsConverter)
+            else converter.convert(metrics_data)
+        )
+        return write_metric_data(metric_data, output, output_format, compact=compact)
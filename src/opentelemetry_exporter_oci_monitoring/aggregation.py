@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import Sequence
+
+from opentelemetry.sdk.metrics.export import AggregationTemporality, DataT, Gauge, Sum
+
+
+class AggregationKind(Enum):
+    """How the datapoints of a stream are folded into a time bucket.
+
+    Delta sums add up to the total of the bucket, for gauges and cumulative sums
+    the most recent value wins and for histograms the counts of equal bucket
+    values add up. The converter keeps the buckets open across exports, see
+    OpenBuckets.
+    """
+
+    SUM = "sum"
+    LAST_VALUE = "last_value"
+    DISTRIBUTION = "distribution"
+
+
+def aggregate_datapoints(
+    timestamps: Sequence[int],
+    values: Sequence[float],
+    counts: Sequence[int],
+    /,
+    resolution_nanos: int,
+    kind: AggregationKind,
+) -> tuple[list[int], list[float], list[int]]:
+    """Fold datapoints into time buckets of the given resolution.
+
+    The datapoints of a bucket are timestamped with the start of the bucket.
+    Buckets are returned in the order they first occur in.
+    """
+    if kind is AggregationKind.SUM:
+        totals: dict[int, float] = {}
+        for timestamp, value, count in zip(timestamps, values, counts):
+            bucket = timestamp - timestamp % resolution_nanos
+            totals[bucket] = totals.get(bucket, 0.0) + value * count
+        return list(totals), list(totals.values()), [1] * len(totals)
+
+    if kind is AggregationKind.LAST_VALUE:
+        last_values: dict[int, tuple[int, float]] = {}
+        for timestamp, value in zip(timestamps, values):
+            bucket = timestamp - timestamp % resolution_nanos
+            last = last_values.get(bucket)
+            if last is None or timestamp >= last[0]:
+                last_values[bucket] = (timestamp, value)
+        return (
+            list(last_values),
+            [value for _, value in last_values.values()],
+            [1] * len(last_values),
+        )
+
+    distribution: dict[tuple[int, float], int] = {}
+    for timestamp, value, count in zip(timestamps, values, counts):
+        key = (timestamp - timestamp % resolution_nanos, value)
+        distribution[key] = distribution.get(key, 0) + count
+    return (
+        [bucket for bucket, _ in distribution],
+        [value for _, value in distribution],
+        list(distribution.values()),
+    )
+
+
+def aggregation_kind(data: DataT, /) -> AggregationKind:
+    if isinstance(data, Sum):
+        return (
+            AggregationKind.SUM
+            if data.aggregation_temporality  # pyright: ignore[reportUnknownMemberType]
+            == AggregationTemporality.DELTA
+            else AggregationKind.LAST_VALUE
+        )
+    if isinstance(data, Gauge):
+        return AggregationKind.LAST_VALUE
+    return AggregationKind.DISTRIBUTION
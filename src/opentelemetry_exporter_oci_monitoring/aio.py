@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import time
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from logging import getLogger
+from typing import TYPE_CHECKING, Any, Sequence
+from urllib.parse import urlsplit
+
+from oci.exceptions import ServiceError
+from opentelemetry.sdk.metrics.export import MetricExportResult, MetricsData
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter, PayloadEncoder
+from opentelemetry_exporter_oci_monitoring.encoding import encode_post_metric_data
+from opentelemetry_exporter_oci_monitoring.retry import is_retryable
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession, ClientTimeout
+    from oci.monitoring.models import PostMetricDataResponseDetails
+    from opentelemetry.sdk.metrics.export import AggregationTemporality
+    from opentelemetry.sdk.metrics.view import Aggregation
+
+    from opentelemetry_exporter_oci_monitoring.converter import ConvertedMetric
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+logger = getLogger(__name__)
+
+POST_METRIC_DATA_PATH = "/metrics"
+
+
+@dataclass
+class AsyncOCIMonitoringExporter(OCIMonitoringExporter):
+    """Export metrics over asyncio, posting the batches of an export concurrently.
+
+    The endpoint, request signer and timeouts are taken from the given
+    MonitoringClient, the HTTP requests are sent with aiohttp. Use
+    ``export_async`` from a coroutine. The synchronous ``export`` of the
+    MetricExporter interface submits to ``loop`` if one is set and otherwise
+    runs the export in a new event loop.
+    """
+
+    payload_encoder: PayloadEncoder | None = encode_post_metric_data
+    max_concurrency: int = 4
+    session: ClientSession | None = field(default=None, repr=False)
+    loop: asyncio.AbstractEventLoop | None = field(default=None, repr=False)
+
+    def __post_init__(
+        self,
+        preferred_temporality: dict[type, AggregationTemporality] | None,
+        preferred_aggregation: dict[type, Aggregation] | None,
+    ) -> None:
+        if aiohttp is None:
+            msg = "AsyncOCIMonitoringExporter requires aiohttp, install the aio extra"
+            raise RuntimeError(msg)
+        if self.export_queue is not None:
+            msg = "AsyncOCIMonitoringExporter does not support an export queue"
+            raise ValueError(msg)
+        if self.max_concurrency < 1:
+            msg = "max_concurrency must be at least 1"
+            raise ValueError(msg)
+        super().__post_init__(preferred_temporality, preferred_aggregation)
+
+    def export(
+        self,
+        metrics_data: MetricsData,
+        timeout_millis: float = 10_000,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> MetricExportResult:
+        if len(kwargs) > 0:
+            logger.warning(
+                "Ignored extra export kwargs.", extra={"ignored_kwargs": kwargs}
+            )
+
+        coroutine = self.export_async(metrics_data, timeout_millis)
+        if self.loop is None:
+            return asyncio.run(coroutine)
+
+        if _running_loop() is self.loop:
+            coroutine.close()
+            logger.error("Cannot block on an export from within its own event loop.")
+            return MetricExportResult.FAILURE
+
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(timeout_millis / 1e3)
+        except concurrent.futures.TimeoutError:
+            _ = future.cancel()
+            logger.exception("Timed out exporting metrics.")
+            return MetricExportResult.FAILURE
+
+    async def export_async(
+        self, metrics_data: MetricsData, timeout_millis: float = 10_000
+    ) -> MetricExportResult:
+        assert aiohttp is not None  # noqa: S101
+
+        batches = list(self._convert(metrics_data))
+        if not batches:
+            return MetricExportResult.SUCCESS
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        deadline = time.monotonic() + timeout_millis / 1e3
+
+        async def post(session: ClientSession, body: bytes) -> MetricExportResult:
+            async with semaphore:
+                return await self._post_body(session, body, deadline)
+
+        async def export(session: ClientSession) -> MetricExportResult:
+            results = await asyncio.gather(
+                *(post(session, self._encode_body(batch)) for batch in batches)
+            )
+            if all(result == MetricExportResult.SUCCESS for result in results):
+                await self._replay_spool_async(session, deadline)
+                return MetricExportResult.SUCCESS
+            self._rollback()
+            return MetricExportResult.FAILURE
+
+        if self.session is not None:
+            return await export(self.session)
+        async with self._make_session() as session:
+            return await export(session)
+
+    def _make_session(self) -> ClientSession:
+        assert aiohttp is not None  # noqa: S101
+        return aiohttp.ClientSession()
+
+    def _client_timeout(self, deadline: float) -> ClientTimeout:
+        assert aiohttp is not None  # noqa: S101
+
+        timeout = self.client.base_client.timeout
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        return aiohttp.ClientTimeout(
+            total=max(deadline - time.monotonic(), 0.0),
+            sock_connect=connect,
+            sock_read=read,
+        )
+
+    def _encode_body(self, batch: Sequence[ConvertedMetric]) -> bytes:
+        encoder = self.payload_encoder or encode_post_metric_data
+        return encoder(batch, self.batch_atomicity)
+
+    async def _post_body(
+        self, session: ClientSession, body: bytes, deadline: float
+    ) -> MetricExportResult:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response_data = await self._send(session, body, deadline)
+            except Exception as error:
+                delay_millis = self._retry_delay_millis(attempt, deadline, error)
+                if delay_millis is None:
+                    logger.exception(
+                        "Failed posting metric data.", extra={"attempts": attempt}
+                    )
+                    if self._spool is not None and is_retryable(error):
+                        self._spool.append(body)
+                    return MetricExportResult.FAILURE
+                logger.warning(
+                    "Retrying to post metric data.",
+                    extra={"attempt": attempt, "delay_millis": delay_millis},
+                    exc_info=True,
+                )
+                await asyncio.sleep(delay_millis / 1e3)
+                continue
+
+            resend = self._resend(response_data, attempt, deadline)
+            if resend is not None:
+                body = self._encode_body(resend.batch)
+                await asyncio.sleep(resend.delay_millis / 1e3)
+                continue
+
+            return MetricExportResult.SUCCESS
+
+    async def _replay_spool_async(
+        self, session: ClientSession, deadline: float
+    ) -> None:
+        spool = self._spool
+        if spool is None:
+            return
+        for _ in range(spool.settings.replay_limit):
+            spooled = spool.peek()
+            if spooled is None:
+                return
+            try:
+                _ = await self._send(session, spooled.payload, deadline)
+            except Exception as error:
+                if is_retryable(error):
+                    return
+                logger.exception(
+                    "Discarding a spooled payload that was rejected.",
+                    extra={"time_unix_nano": spooled.time_unix_nano},
+                )
+            spool.pop()
+
+    async def _send(
+        self, session: ClientSession, body: bytes, deadline: float
+    ) -> PostMetricDataResponseDetails:
+        limiter = self._rate_limiter
+        if limiter is not None and not await limiter.acquire_async(deadline):
+            msg = "Rate limit does not admit posting metric data before the deadline."
+            raise TimeoutError(msg)
+
+        telemetry = self._telemetry
+        if telemetry is None:
+            return await self._request(session, body, deadline)
+
+        start = time.perf_counter()
+        try:
+            response_data = await self._request(session, body, deadline)
+        except Exception as error:
+            telemetry.record_request(
+                time.perf_counter() - start, body, getattr(error, "status", None), error
+            )
+            raise
+        telemetry.record_request(time.perf_counter() - start, body, HTTPStatus.OK)
+        telemetry.record_failed_metrics(response_data.failed_metrics_count)
+        return response_data
+
+    async def _request(
+        self, session: ClientSession, body: bytes, deadline: float
+    ) -> PostMetricDataResponseDetails:
+        assert aiohttp is not None  # noqa: S101
+
+        request = SignableRequest(
+            "POST", self.client.base_client.endpoint + POST_METRIC_DATA_PATH, body
+        )
+        _ = self.client.base_client.signer(request)
+        try:
+            async with session.post(
+                request.url,
+                data=body,
+                headers=request.headers,
+                timeout=self._client_timeout(deadline),
+            ) as response:
+                if self._rate_limiter is not None:
+                    self._rate_limiter.record(response.status)
+                if response.status != HTTPStatus.OK:
+                    raise ServiceError(
+                        response.status,
+                        response.reason or "",
+                        dict(response.headers),
+                        await response.text(),
+                    )
+                return self.client.base_client.deserialize_response_data(
+                    await response.read(), "PostMetricDataResponseDetails"
+                )
+        except aiohttp.ClientConnectionError as error:
+            raise ConnectionError(str(error)) from error
+
+
+@dataclass
+class SignableRequest:
+    """The subset of a prepared request the OCI signers read and update."""
+
+    method: str
+    url: str
+    body: bytes
+    headers: dict[str, str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.headers = {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "content-length": str(len(self.body)),
+        }
+
+    @property
+    def path_url(self) -> str:
+        url = urlsplit(self.url)
+        return f"{url.path}?{url.query}" if url.query else url.path
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
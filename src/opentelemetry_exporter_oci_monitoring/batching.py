@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    TypeVar,
+    cast,
+)
+
+from opentelemetry_exporter_oci_monitoring.converter import MetricStream
+
+if TYPE_CHECKING:
+    from oci.monitoring.models import Datapoint, MetricDataDetails
+
+    from opentelemetry_exporter_oci_monitoring.converter import ConvertedMetric
+
+T = TypeVar("T", MetricStream, "MetricDataDetails")
+
+# rough JSON sizes of the PostMetricData envelope and of a single datapoint like
+# {"timestamp": "2024-08-26T12:34:56.789123Z", "value": -1.2345678901234567e-123,
+# "count": 1234}
+REQUEST_OVERHEAD_BYTES = 64
+STREAM_OVERHEAD_BYTES = 128
+DATAPOINT_BYTES = 96
+
+
+@dataclass(frozen=True)
+class BatchLimits:
+    """Upper bounds for a single PostMetricData request.
+
+    The defaults follow the documented per-call limit of 50 unique metric streams
+    and keep the request body well below the maximum payload size accepted by the
+    ingestion endpoint.
+    """
+
+    max_streams: int = 50
+    max_datapoints_per_stream: int = 1_000
+    max_bytes: int = 512_000
+
+    def __post_init__(self) -> None:
+        if self.max_streams < 1:
+            msg = "max_streams must be at least 1"
+            raise ValueError(msg)
+        if self.max_datapoints_per_stream < 1:
+            msg = "max_datapoints_per_stream must be at least 1"
+            raise ValueError(msg)
+        if self.max_bytes < REQUEST_OVERHEAD_BYTES + STREAM_OVERHEAD_BYTES:
+            msg = "max_bytes is too small to hold a single metric stream"
+            raise ValueError(msg)
+
+
+def estimate_stream_header_size(metric_data: ConvertedMetric, /) -> int:
+    return (
+        STREAM_OVERHEAD_BYTES
+        + len(metric_data.namespace)
+        + len(metric_data.resource_group or "")
+        + len(metric_data.compartment_id)
+        + len(metric_data.name)
+        + _estimate_mapping_size(metric_data.dimensions)
+        + _estimate_mapping_size(metric_data.metadata)
+    )
+
+
+def estimate_size(metric_data: ConvertedMetric, /) -> int:
+    return (
+        estimate_stream_header_size(metric_data)
+        + datapoints_count(metric_data) * DATAPOINT_BYTES
+    )
+
+
+def datapoints_count(metric_data: ConvertedMetric, /) -> int:
+    if isinstance(metric_data, MetricStream):
+        return len(metric_data)
+    return len(metric_data.datapoints)
+
+
+def split_metric_data(metric_data: T, /, limits: BatchLimits) -> Iterator[T]:
+    """Split a stream whose datapoints do not fit into a single request."""
+    header_size = estimate_stream_header_size(metric_data)
+    fitting_datapoints = (
+        limits.max_bytes - REQUEST_OVERHEAD_BYTES - header_size
+    ) // DATAPOINT_BYTES
+    chunk_size = max(1, min(limits.max_datapoints_per_stream, fitting_datapoints))
+
+    count = datapoints_count(metric_data)
+    if count <= chunk_size:
+        yield metric_data
+        return
+
+    for start in range(0, count, chunk_size):
+        yield _slice(metric_data, start, start + chunk_size)
+
+
+def iter_batches(
+    metric_data: Iterable[T], /, limits: BatchLimits, *, by_route: bool = False
+) -> Iterator[list[T]]:
+    """Greedily pack metric streams into batches that respect the given limits.
+
+    The order of the streams is preserved. Parts of a stream that had to be split
+    always end up in different batches. With ``by_route``, streams of different
+    namespaces, resource groups or compartments never share a batch.
+    """
+    batches: dict[Hashable, list[T]] = {}
+    batch_sizes: dict[Hashable, int] = {}
+    for stream in metric_data:
+        route = _route_of(stream) if by_route else None
+        batch = batches.setdefault(route, [])
+        batch_size = batch_sizes.get(route, REQUEST_OVERHEAD_BYTES)
+        stream_in_batch = False
+        for part in split_metric_data(stream, limits):
+            part_size = estimate_size(part)
+            if batch and (
+                stream_in_batch
+                or len(batch) >= limits.max_streams
+                or batch_size + part_size > limits.max_bytes
+            ):
+                yield batch
+                batch = batches[route] = []
+                batch_size = REQUEST_OVERHEAD_BYTES
+
+            batch.append(part)
+            batch_size += part_size
+            stream_in_batch = True
+        batch_sizes[route] = batch_size
+
+    for batch in batches.values():
+        if batch:
+            yield batch
+
+
+def _route_of(metric_data: ConvertedMetric) -> Hashable:
+    return (
+        metric_data.namespace,
+        metric_data.resource_group,
+        metric_data.compartment_id,
+    )
+
+
+def _estimate_mapping_size(mapping: Mapping[str, str] | None) -> int:
+    return 4 if mapping is None else len(json.dumps(dict(mapping)))
+
+
+def _slice(metric_data: T, start: int, stop: int) -> T:
+    if isinstance(metric_data, MetricStream):
+        return cast(T, metric_data.slice(start, stop))
+    return cast(T, _with_datapoints(metric_data, metric_data.datapoints[start:stop]))
+
+
+def _with_datapoints(
+    metric_data_details: MetricDataDetails, datapoints: Sequence[Datapoint]
+) -> MetricDataDetails:
+    from oci.monitoring.models import MetricDataDetails
+
+    return MetricDataDetails(
+        namespace=metric_data_details.namespace,
+        resource_group=metric_data_details.resource_group,
+        compartment_id=metric_data_details.compartment_id,
+        name=metric_data_details.name,
+        dimensions=metric_data_details.dimensions,
+        metadata=metric_data_details.metadata,
+        datapoints=datapoints,
+    )
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from logging import getLogger
+from types import MappingProxyType
+from typing import Callable, Hashable, Mapping, NamedTuple
+
+from opentelemetry_exporter_oci_monitoring.cache import LRUCache
+
+logger = getLogger(__name__)
+
+OVERFLOW_DIMENSIONS: Mapping[str, str] = MappingProxyType(
+    {"otel.metric.overflow": "true"}
+)
+
+
+@dataclass(frozen=True)
+class CardinalityLimits:
+    """Bounds for the number of distinct streams of a metric.
+
+    A stream counts towards the limit of its metric name until it has not been
+    seen for ``window``. Streams beyond ``max_streams_per_metric`` are folded
+    into a single stream with the ``overflow_dimensions``. At most
+    ``max_metrics`` metric names are tracked, the least recently seen is
+    forgotten first.
+    """
+
+    max_streams_per_metric: int = 2_000
+    window: timedelta = timedelta(hours=1)
+    max_metrics: int = 1_000
+    overflow_dimensions: Mapping[str, str] = field(
+        default_factory=lambda: OVERFLOW_DIMENSIONS
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_streams_per_metric < 1:
+            msg = "max_streams_per_metric must be at least 1"
+            raise ValueError(msg)
+        if self.window <= timedelta():
+            msg = "window must be positive"
+            raise ValueError(msg)
+        if self.max_metrics < 1:
+            msg = "max_metrics must be at least 1"
+            raise ValueError(msg)
+        if not self.overflow_dimensions:
+            msg = "overflow_dimensions must not be empty"
+            raise ValueError(msg)
+
+
+class CardinalityInfo(NamedTuple):
+    overflowed_streams: int
+    overflowed_datapoints: int
+    tracked_metrics: int
+    tracked_streams: int
+
+
+class CardinalityLimiter:
+    """Tracks the distinct streams per metric name over a sliding window.
+
+    Only the hashes of the stream keys are kept, ordered by when they were last
+    seen, so expired streams are evicted from the front.
+    """
+
+    def __init__(
+        self, limits: CardinalityLimits, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        super().__init__()
+        self.limits = limits
+        self.overflowed_streams = 0
+        self.overflowed_datapoints = 0
+        self._clock = clock
+        self._window = limits.window.total_seconds()
+        self._metrics: LRUCache[str, OrderedDict[int, float]] = LRUCache(
+            limits.max_metrics
+        )
+
+    def admit(self, metric_name: str, key: Hashable) -> bool:
+        """Return whether the stream may be exported with its own dimensions."""
+        now = self._clock()
+        streams: OrderedDict[int, float] | None = self._metrics.get(metric_name)
+        if streams is None:
+            streams = OrderedDict()
+            self._metrics.put(metric_name, streams)
+
+        key_hash = hash(key)
+        if key_hash in streams:
+            streams[key_hash] = now
+            streams.move_to_end(key_hash)
+            return True
+
+        expired = now - self._window
+        while streams and next(iter(streams.values())) < expired:
+            _ = streams.popitem(last=False)
+
+        if len(streams) < self.limits.max_streams_per_metric:
+            streams[key_hash] = now
+            return True
+        return False
+
+    def record_overflow(self, metric_name: str, streams: int, datapoints: int) -> None:
+        if self.overflowed_streams == 0:
+            logger.warning(
+                "Folding metric streams beyond the cardinality limit.",
+                extra={
+                    "metric_name": metric_name,
+                    "max_streams_per_metric": self.limits.max_streams_per_metric,
+                },
+            )
+        self.overflowed_streams += streams
+        self.overflowed_datapoints += datapoints
+
+    def info(self) -> CardinalityInfo:
+        return CardinalityInfo(
+            overflowed_streams=self.overflowed_streams,
+            overflowed_datapoints=self.overflowed_datapoints,
+            tracked_metrics=len(self._metrics),
+            tracked_streams=sum(len(streams) for streams in self._metrics.values()),
+        )
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from importlib.util import find_spec
+from operator import attrgetter
+from typing import TYPE_CHECKING, Protocol, Sequence
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics.export import NumberDataPoint
+
+# NumPy takes longer to import than the exporter itself, so it is imported on
+# first use only
+HAS_NUMPY = find_spec("numpy") is not None
+
+_time_unix_nano = attrgetter("time_unix_nano")
+_value = attrgetter("value")
+
+# below this many data points per stream, sorting and splitting the columns
+# costs more than appending the data points one by one
+MIN_POINTS_PER_STREAM = 8
+
+
+class NumberColumns(Protocol):
+    def append(self, time_unix_nano: int, value: float) -> None: ...
+
+    def append_columns(
+        self, timestamps: Sequence[int], values: Sequence[float]
+    ) -> None: ...
+
+
+def fill_number_streams(
+    streams: Sequence[NumberColumns],
+    owners: Sequence[NumberColumns],
+    data_points: Sequence[NumberDataPoint],
+) -> None:
+    """Append number data points to their streams column by column.
+
+    ``owners`` holds the stream of each data point. The columns are gathered
+    and converted in bulk. If NumPy is installed and the streams are long, they
+    are grouped by stream with a stable sort, so the streams keep the order of
+    their data points.
+    """
+    if len(streams) == 1:
+        streams[0].append_columns(
+            list(map(_time_unix_nano, data_points)),
+            list(map(float, map(_value, data_points))),
+        )
+        return
+
+    if not HAS_NUMPY or len(data_points) < MIN_POINTS_PER_STREAM * len(streams):
+        for stream, time_unix_nano, value in zip(
+            owners, map(_time_unix_nano, data_points), map(_value, data_points)
+        ):
+            stream.append(time_unix_nano, float(value))
+        return
+
+    _fill_grouped(streams, owners, data_points)
+
+
+def _fill_grouped(
+    streams: Sequence[NumberColumns],
+    owners: Sequence[NumberColumns],
+    data_points: Sequence[NumberDataPoint],
+) -> None:
+    import numpy as np
+
+    codes_by_stream = {id(stream): code for code, stream in enumerate(streams)}
+    codes = np.fromiter(
+        map(codes_by_stream.__getitem__, map(id, owners)),
+        dtype=np.intp,
+        count=len(owners),
+    )
+    order = np.argsort(codes, kind="stable")
+    bounds = np.cumsum(np.bincount(codes, minlength=len(streams)))[:-1]
+    timestamps = np.fromiter(
+        map(_time_unix_nano, data_points), dtype=np.int64, count=len(data_points)
+    )[order]
+    values = np.fromiter(
+        map(_value, data_points), dtype=np.float64, count=len(data_points)
+    )[order]
+    for stream, stream_timestamps, stream_values in zip(
+        streams, np.split(timestamps, bounds), np.split(values, bounds)
+    ):
+        stream.append_columns(stream_timestamps.tolist(), stream_values.tolist())
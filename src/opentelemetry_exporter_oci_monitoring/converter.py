@@ -1,23 +1,69 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta, timezone
+from itertools import compress, count, repeat
 from logging import getLogger
-from typing import TYPE_CHECKING, Iterator, Mapping, Protocol, Sequence, Union
+from operator import attrgetter
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Hashable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Protocol,
+    Sequence,
+    Tuple,
+    Union,
+    runtime_checkable,
+)
 
-from oci.monitoring.models import Datapoint, MetricDataDetails
 from opentelemetry.sdk.metrics.export import (
-    Histogram,
+    ExponentialHistogramDataPoint,
+    Gauge,
     HistogramDataPoint,
     Metric,
     MetricsData,
     NumberDataPoint,
+    Sum,
 )
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.util.instrumentation import InstrumentationScope
 
+from opentelemetry_exporter_oci_monitoring.aggregation import (
+    AggregationKind,
+    aggregate_datapoints,
+    aggregation_kind,
+)
+from opentelemetry_exporter_oci_monitoring.cache import CacheInfo, LRUCache
+from opentelemetry_exporter_oci_monitoring.cardinality import (
+    CardinalityInfo,
+    CardinalityLimiter,
+    CardinalityLimits,
+)
+from opentelemetry_exporter_oci_monitoring.columnar import fill_number_streams
+from opentelemetry_exporter_oci_monitoring.filters import FilterRules, NameFilter
+from opentelemetry_exporter_oci_monitoring.histogram import (
+    expand_exponential_histogram,
+    expand_histogram,
+)
+from opentelemetry_exporter_oci_monitoring.routing import (
+    DatapointRouter,
+    Route,
+    Router,
+    RoutingSettings,
+)
+from opentelemetry_exporter_oci_monitoring.suppression import (
+    StreamSuppressor,
+    SuppressionInfo,
+    SuppressionSettings,
+)
+
 if TYPE_CHECKING:
+    from oci.monitoring.models import MetricDataDetails
     from opentelemetry.sdk.resources import Resource
     from opentelemetry.sdk.util.instrumentation import InstrumentationScope
 
@@ -25,6 +71,7 @@ AttributeValue = Union[
     str, bool, int, float, Sequence[str], Sequence[bool], Sequence[int], Sequence[float]
 ]
 Attributes = Mapping[str, AttributeValue]
+DataPoint = Union[NumberDataPoint, HistogramDataPoint, ExponentialHistogramDataPoint]
 
 
 logger = getLogger(__name__)
@@ -34,13 +81,25 @@ UTC = timezone(timedelta())
 
 class DimensionsExtractor(Protocol):
     def extract(
-        self,
-        resource: Resource,
-        scope: InstrumentationScope,
-        data_point: NumberDataPoint | HistogramDataPoint,
+        self, resource: Resource, scope: InstrumentationScope, data_point: DataPoint
     ) -> Mapping[str, str]: ...
 
 
+StreamKey = Hashable
+
+
+class InternedDimensions(NamedTuple):
+    dimensions: Mapping[str, str]
+    key: StreamKey
+
+
+@runtime_checkable
+class InterningDimensionsExtractor(DimensionsExtractor, Protocol):
+    def extract_interned(
+        self, resource: Resource, scope: InstrumentationScope, data_point: DataPoint
+    ) -> InternedDimensions: ...
+
+
 def flatten_attribute_value(value: AttributeValue, /) -> str:
     if isinstance(value, str):
         return value
@@ -58,28 +117,158 @@ def normalize_attributes(
     }
 
 
+def attributes_key(attributes: Attributes, /) -> tuple[Hashable, ...]:
+    # 1, True and 1.0 are equal but flatten differently, so the types are part
+    # of the key; sequences given as lists are made hashable
+    return tuple(
+        (key, type(value), value)
+        if isinstance(value, (str, bool, int, float))
+        else (key, type(value), tuple((type(item), item) for item in value))
+        for key, value in attributes.items()
+    )
+
+
+class AttributeSetInterner:
+    """Interns attribute sets as normalized, immutable dimensions.
+
+    Data points usually share a small number of distinct attribute sets. Each set
+    is normalized once and mapped to a read-only dimension map together with a
+    precomputed stream key, so streams can be grouped without hashing the
+    dimensions again. The number of interned sets is bounded, the least recently
+    used set is evicted first. Attributes whose key the ``key_filter`` rejects
+    are left out of the dimensions.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, key_filter: NameFilter | None = None
+    ) -> None:
+        super().__init__()
+        self._cache: LRUCache[Hashable, InternedDimensions] = LRUCache(maxsize)
+        self._key_filter = key_filter
+
+    def intern(
+        self,
+        attributes: Attributes,
+        /,
+        base_key: Hashable = None,
+        base_dimensions: Mapping[str, str] | None = None,
+    ) -> InternedDimensions:
+        """Return the interned dimensions of the attributes.
+
+        Args:
+            attributes: The attributes to normalize.
+            base_key: Identifies the base_dimensions in the cache.
+            base_dimensions: Dimensions the attribute dimensions are merged into.
+        """
+        cache_key = (base_key, attributes_key(attributes))
+        interned = self._cache.get(cache_key)
+        if interned is None:
+            if self._key_filter is not None:
+                attributes = self._key_filter.filter_keys(attributes)
+            dimensions = {**(base_dimensions or {}), **normalize_attributes(attributes)}
+            interned = InternedDimensions(
+                dimensions=MappingProxyType(dimensions),
+                key=frozenset(dimensions.items()),
+            )
+            self._cache.put(cache_key, interned)
+        return interned
+
+    def cache_info(self) -> CacheInfo:
+        return self._cache.info()
+
+
 @dataclass
-class PrefixedDimensionsExtractor(DimensionsExtractor):
+class PrefixedDimensionsExtractor(InterningDimensionsExtractor):
     prefix_resource: str = ""
     prefix_scope: str = "scope."
+    cache_size: int = 128
+    attributes_cache_size: int = 1024
+    resource_attributes_filter: FilterRules | None = None
+    scope_attributes_filter: FilterRules | None = None
+    datapoint_attributes_filter: FilterRules | None = None
+
+    _cache: LRUCache[
+        tuple[int, int], tuple[Resource, InstrumentationScope, int, Mapping[str, str]]
+    ] = field(init=False, repr=False, compare=False)
+    _interner: AttributeSetInterner = field(init=False, repr=False, compare=False)
+    _resource_filter: NameFilter | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _scope_filter: NameFilter | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._cache = LRUCache(self.cache_size)
+        self._interner = AttributeSetInterner(
+            self.attributes_cache_size, _name_filter(self.datapoint_attributes_filter)
+        )
+        self._resource_filter = _name_filter(self.resource_attributes_filter)
+        self._scope_filter = _name_filter(self.scope_attributes_filter)
 
     def extract(
-        self,
-        resource: Resource,
-        scope: InstrumentationScope,
-        data_point: NumberDataPoint | HistogramDataPoint,
+        self, resource: Resource, scope: InstrumentationScope, data_point: DataPoint
     ) -> Mapping[str, str]:
-        scope_dimensions = {self.prefix_scope + "name": scope.name}
-        if scope.version:
-            scope_dimensions[self.prefix_scope + "version"] = scope.version
+        return self.extract_interned(resource, scope, data_point).dimensions
+
+    def extract_interned(
+        self, resource: Resource, scope: InstrumentationScope, data_point: DataPoint
+    ) -> InternedDimensions:
+        static_key, static_dimensions = self._extract_static(resource, scope)
+        return self._interner.intern(
+            data_point.attributes or {}, static_key, static_dimensions
+        )
 
+    def extract_static(
+        self, resource: Resource, scope: InstrumentationScope
+    ) -> Mapping[str, str]:
+        """Return the dimensions derived from the resource and the scope.
+
+        The result is cached per resource and scope object. Cache entries keep a
+        reference to both objects, so their ids cannot be reused while cached.
+        """
+        return self._extract_static(resource, scope)[1]
+
+    def cache_info(self) -> CacheInfo:
+        """Return the statistics of the attribute set interning cache."""
+        return self._interner.cache_info()
+
+    def _extract_static(
+        self, resource: Resource, scope: InstrumentationScope
+    ) -> tuple[int, Mapping[str, str]]:
+        key = (id(resource), id(scope))
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached[2], cached[3]
+
+        scope_attributes = {"name": scope.name}
+        if scope.version:
+            scope_attributes["version"] = scope.version
+        resource_attributes = resource.attributes
+        if self._scope_filter is not None:
+            scope_attributes = self._scope_filter.filter_keys(scope_attributes)
+        if self._resource_filter is not None:
+            resource_attributes = self._resource_filter.filter_keys(resource_attributes)
+
+        scope_dimensions = {
+            self.prefix_scope + key: value for key, value in scope_attributes.items()
+        }
         resource_dimensions = normalize_attributes(
-            resource.attributes, prefix=self.prefix_resource
+            resource_attributes, prefix=self.prefix_resource
         )
 
-        attribute_dimensions = normalize_attributes(data_point.attributes or {})
+        static_key = next(_static_keys)
+        static_dimensions = {**scope_dimensions, **resource_dimensions}
+        self._cache.put(key, (resource, scope, static_key, static_dimensions))
+        return static_key, static_dimensions
+
+
+def _name_filter(rules: FilterRules | None) -> NameFilter | None:
+    return None if rules is None else NameFilter(rules)
+
 
-        return {**scope_dimensions, **resource_dimensions, **attribute_dimensions}
+_static_keys = count()
+_attributes = attrgetter("attributes")
 
 
 class MetadataExtractor(Protocol):
@@ -103,12 +292,217 @@ class DefaultMetadataExtractor(MetadataExtractor):
         return metadata or None
 
 
+@dataclass
+class MetricStream:
+    """Accumulates the datapoints of a single metric stream.
+
+    Datapoints are appended column-wise and only turned into OCI models once the
+    stream is complete.
+    """
+
+    namespace: str
+    resource_group: str
+    compartment_id: str
+    name: str
+    dimensions: Mapping[str, str]
+    metadata: Mapping[str, str] | None = None
+    timestamps: list[int] = field(default_factory=list)  # pyright: ignore[reportUnknownVariableType]
+    values: list[float] = field(default_factory=list)  # pyright: ignore[reportUnknownVariableType]
+    counts: list[int] = field(default_factory=list)  # pyright: ignore[reportUnknownVariableType]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def append(self, time_unix_nano: int, value: float, count: int = 1) -> None:
+        self.timestamps.append(time_unix_nano)
+        self.values.append(value)
+        self.counts.append(count)
+
+    def append_columns(
+        self, timestamps: Sequence[int], values: Sequence[float]
+    ) -> None:
+        self.timestamps.extend(timestamps)
+        self.values.extend(values)
+        self.counts.extend(repeat(1, len(values)))
+
+    def extend(
+        self, time_unix_nano: int, values: Sequence[float], counts: Sequence[int]
+    ) -> None:
+        self.timestamps.extend(repeat(time_unix_nano, len(values)))
+        self.values.extend(values)
+        self.counts.extend(counts)
+
+    def add_data_point(self, data_point: DataPoint) -> None:
+        if isinstance(data_point, NumberDataPoint):
+            self.append(data_point.time_unix_nano, float(data_point.value))
+        elif isinstance(data_point, HistogramDataPoint):
+            self.extend(data_point.time_unix_nano, *expand_histogram(data_point))
+        else:
+            self.extend(
+                data_point.time_unix_nano, *expand_exponential_histogram(data_point)
+            )
+
+    def prepend(self, other: MetricStream) -> None:
+        """Put the datapoints of another stream before the own ones."""
+        self.timestamps = other.timestamps + self.timestamps
+        self.values = other.values + self.values  # noqa: PD011
+        self.counts = other.counts + self.counts
+
+    def aggregate(self, resolution_nanos: int, kind: AggregationKind) -> None:
+        """Fold the datapoints into time buckets of the given resolution."""
+        self.timestamps, self.values, self.counts = aggregate_datapoints(
+            self.timestamps,
+            self.values,
+            self.counts,
+            resolution_nanos=resolution_nanos,
+            kind=kind,
+        )
+
+    def select(self, selectors: Sequence[bool]) -> None:
+        """Keep only the datapoints whose selector is true."""
+        self.timestamps = list(compress(self.timestamps, selectors))
+        self.values = list(compress(self.values, selectors))
+        self.counts = list(compress(self.counts, selectors))
+
+    def slice(self, start: int, stop: int) -> MetricStream:
+        return replace(
+            self,
+            timestamps=self.timestamps[start:stop],
+            values=self.values[start:stop],
+            counts=self.counts[start:stop],
+        )
+
+    def to_metric_data_details(self) -> MetricDataDetails:
+        from oci.monitoring.models import Datapoint, MetricDataDetails
+
+        return MetricDataDetails(
+            namespace=self.namespace,
+            resource_group=self.resource_group,
+            compartment_id=self.compartment_id,
+            name=self.name,
+            dimensions=dict(self.dimensions),
+            metadata=self.metadata,
+            datapoints=[
+                Datapoint(
+                    timestamp=datetime.fromtimestamp(time_unix_nano / 1e9, tz=UTC),
+                    value=value,
+                    count=count,
+                )
+                for time_unix_nano, value, count in zip(
+                    self.timestamps, self.values, self.counts
+                )
+            ],
+        )
+
+
+_OpenStream = Tuple[MetricStream, AggregationKind]
+
+
+class OpenBuckets:
+    """Holds the time buckets of streams until their resolution boundary passes.
+
+    A bucket is closed once a datapoint of any stream is timestamped at or
+    after its end, so the buckets that may still receive datapoints are kept
+    open across exports. Datapoints that arrive for a bucket that was already
+    closed are folded into the first open one, so no stream sends two
+    datapoints with the same timestamp.
+    """
+
+    def __init__(self, resolution_nanos: int) -> None:
+        super().__init__()
+        self.resolution_nanos = resolution_nanos
+        self._streams: dict[Hashable, _OpenStream] = {}
+        self._closed_until = 0
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def add(self, key: Hashable, stream: MetricStream, kind: AggregationKind) -> None:
+        """Fold the datapoints of a stream into its open buckets."""
+        closed_until = self._closed_until
+        if stream.timestamps and min(stream.timestamps) < closed_until:
+            stream.timestamps = [
+                max(timestamp, closed_until) for timestamp in stream.timestamps
+            ]
+        opened = self._streams.get(key)
+        if opened is not None:
+            # the new stream carries the latest metadata
+            stream.prepend(opened[0])
+        stream.aggregate(self.resolution_nanos, kind)
+        self._streams[key] = (stream, kind)
+
+    def close(
+        self, time_unix_nano: int
+    ) -> Iterator[tuple[Hashable, MetricStream, AggregationKind]]:
+        """Remove and yield the buckets that end at or before the given time."""
+        self._closed_until = max(
+            self._closed_until, time_unix_nano - time_unix_nano % self.resolution_nanos
+        )
+        closed_until = self._closed_until
+        for key, (stream, kind) in list(self._streams.items()):
+            closed = [timestamp < closed_until for timestamp in stream.timestamps]
+            if all(closed):
+                del self._streams[key]
+                yield key, stream, kind
+            elif any(closed):
+                closed_stream = stream.slice(0, len(stream))
+                closed_stream.select(closed)
+                stream.select([not is_closed for is_closed in closed])
+                yield key, closed_stream, kind
+
+    def flush(self) -> Iterator[tuple[Hashable, MetricStream, AggregationKind]]:
+        """Remove and yield all buckets, later datapoints start a new bucket."""
+        streams, self._streams = self._streams, {}
+        for key, (stream, kind) in streams.items():
+            if stream.timestamps:
+                self._closed_until = max(
+                    self._closed_until, max(stream.timestamps) + self.resolution_nanos
+                )
+            yield key, stream, kind
+
+
+ConvertedMetric = Union[MetricStream, "MetricDataDetails"]
+
+
+def to_metric_data_details(metric_data: ConvertedMetric, /) -> MetricDataDetails:
+    if isinstance(metric_data, MetricStream):
+        return metric_data.to_metric_data_details()
+    return metric_data
+
+
 class MetricsConverter(Protocol):
     def convert(self, metrics_data: MetricsData, /) -> Iterator[MetricDataDetails]: ...
 
 
+@runtime_checkable
+class StreamingMetricsConverter(MetricsConverter, Protocol):
+    """A converter that can also yield its streams before they become OCI models."""
+
+    def convert_streams(
+        self, metrics_data: MetricsData, /
+    ) -> Iterator[MetricStream]: ...
+
+
+@runtime_checkable
+class BufferingMetricsConverter(StreamingMetricsConverter, Protocol):
+    """A streaming converter that holds back streams for later conversions."""
+
+    def flush_streams(self) -> Iterator[MetricStream]:
+        """Yield and forget the streams held back so far."""
+        ...
+
+
+@runtime_checkable
+class TransactionalMetricsConverter(MetricsConverter, Protocol):
+    """A converter whose state depends on the metrics it converted before."""
+
+    def rollback(self) -> None:
+        """Undo the state changes of the last conversion, whose export failed."""
+        ...
+
+
 @dataclass
-class DefaultMetricsConverter(MetricsConverter):
+class DefaultMetricsConverter(BufferingMetricsConverter, TransactionalMetricsConverter):
     namespace: str
     resource_group: str
     compartment_id: str
@@ -119,61 +513,238 @@ class DefaultMetricsConverter(MetricsConverter):
     metadata_extractor: MetadataExtractor = field(
         default_factory=DefaultMetadataExtractor
     )
+    aggregation_resolution: timedelta | None = None
+    cardinality_limits: CardinalityLimits | None = None
+    suppression: SuppressionSettings | None = None
+    routing: RoutingSettings | None = None
+    metric_filter: FilterRules | None = None
+    columnar: bool = False
+
+    _cardinality_limiter: CardinalityLimiter | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _overflow: InternedDimensions | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _suppressor: StreamSuppressor | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _router: Router | None = field(default=None, init=False, repr=False, compare=False)
+    _open_buckets: OpenBuckets | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _metric_filter: NameFilter | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        limits = self.cardinality_limits
+        if limits is not None:
+            self._cardinality_limiter = CardinalityLimiter(limits)
+            dimensions = limits.overflow_dimensions
+            # a tuple never equals the frozenset keys of the regular streams
+            self._overflow = InternedDimensions(dimensions, tuple(dimensions.items()))
+        if self.suppression is not None:
+            self._suppressor = StreamSuppressor(self.suppression)
+        if self.aggregation_resolution is not None:
+            self._open_buckets = OpenBuckets(
+                self.aggregation_resolution // timedelta(microseconds=1) * 1_000
+            )
+        self._metric_filter = _name_filter(self.metric_filter)
+        if self.routing is not None:
+            self._router = Router(
+                self.routing,
+                Route(self.namespace, self.resource_group, self.compartment_id),
+            )
+
+    def cardinality_info(self) -> CardinalityInfo | None:
+        """Return the statistics of the cardinality limiter, if limits are set."""
+        if self._cardinality_limiter is None:
+            return None
+        return self._cardinality_limiter.info()
+
+    def suppression_info(self) -> SuppressionInfo | None:
+        """Return the statistics of the suppression of idle streams, if enabled."""
+        if self._suppressor is None:
+            return None
+        return self._suppressor.info()
+
+    def rollback(self) -> None:
+        if self._suppressor is not None:
+            self._suppressor.rollback()
 
     def convert(self, metrics_data: MetricsData, /) -> Iterator[MetricDataDetails]:
+        for stream in self.convert_streams(metrics_data):
+            yield stream.to_metric_data_details()
+
+    def convert_streams(self, metrics_data: MetricsData, /) -> Iterator[MetricStream]:
+        extract = self._interned_dimensions_extractor()
+        if self._suppressor is not None:
+            self._suppressor.checkpoint()
+        if self._open_buckets is not None:
+            yield from self._convert_buckets(metrics_data, self._open_buckets)
+            return
+
+        overflow = None if self._overflow is None else self._overflow.dimensions
+        for resource, scope, metric in self._iter_metrics(metrics_data):
+            streams = self._group_streams(resource, scope, metric, extract)
+
+            kind = aggregation_kind(metric.data)
+            for key, stream in streams.items():
+                if stream.dimensions is overflow:
+                    # fold the datapoints of equal timestamps
+                    stream.aggregate(1, kind)
+                if self._select((metric.name, key), stream, kind):
+                    yield stream
+
+    def flush_streams(self) -> Iterator[MetricStream]:
+        """Yield the time buckets still open, see ``aggregation_resolution``."""
+        if self._open_buckets is None:
+            return
+        if self._suppressor is not None:
+            self._suppressor.checkpoint()
+        for key, stream, kind in self._open_buckets.flush():
+            if self._select(key, stream, kind):
+                yield stream
+
+    def _convert_buckets(
+        self, metrics_data: MetricsData, open_buckets: OpenBuckets
+    ) -> Iterator[MetricStream]:
+        extract = self._interned_dimensions_extractor()
+        latest = 0
+        for resource, scope, metric in self._iter_metrics(metrics_data):
+            streams = self._group_streams(resource, scope, metric, extract)
+
+            kind = aggregation_kind(metric.data)
+            for key, stream in streams.items():
+                if stream.timestamps:
+                    latest = max(latest, *stream.timestamps)
+                open_buckets.add((metric.name, key), stream, kind)
+
+        for key, stream, kind in open_buckets.close(latest):
+            if self._select(key, stream, kind):
+                yield stream
+
+    def _select(
+        self, key: Hashable, stream: MetricStream, kind: AggregationKind
+    ) -> bool:
+        """Leave out the suppressed datapoints, returning whether any are left."""
+        suppressor = self._suppressor
+        if suppressor is not None:
+            selectors = suppressor.select(key, stream.timestamps, stream.values, kind)
+            if selectors is not None:
+                stream.select(selectors)
+        return bool(stream)
+
+    def _iter_metrics(
+        self, metrics_data: MetricsData
+    ) -> Iterator[tuple[Resource, InstrumentationScope, Metric]]:
+        """Yield the metrics that pass the metric filter, before touching their data."""
+        metric_filter = self._metric_filter
         for resource_metric in metrics_data.resource_metrics:
             resource = resource_metric.resource
             for scope_metric in resource_metric.scope_metrics:
                 scope = scope_metric.scope
                 for metric in scope_metric.metrics:
-                    name = metric.name
-                    data = metric.data
-
-                    if isinstance(data, Histogram):
-                        logger.warning(
-                            "Ignoring histogram metric data: Not implemented.",
-                            extra={
-                                "metric.name": metric.name,
-                                "metric.description": metric.description,
-                            },
-                        )
-                        continue
-
-                    metadata = self.metadata_extractor.extract(resource, scope, metric)
-
-                    metric_data_details_map: Mapping[
-                        frozenset[tuple[str, str]], MetricDataDetails
-                    ] = {}
-                    for data_point in data.data_points:
-                        dimensions = self.dimensions_extractor.extract(
-                            resource, scope, data_point
-                        )
-
-                        key = frozenset(dimensions.items())
-                        metric_data_details = metric_data_details_map.get(key)
-                        if metric_data_details is None:
-                            metric_data_details = MetricDataDetails(
-                                namespace=self.namespace,
-                                resource_group=self.resource_group,
-                                compartment_id=self.compartment_id,
-                                name=name,
-                                dimensions=dimensions,
-                                metadata=metadata,
-                                datapoints=[],
-                            )
-                            metric_data_details_map[key] = metric_data_details
-
-                        datapoint = Datapoint(
-                            timestamp=datetime.fromtimestamp(
-                                data_point.time_unix_nano / 1e9, tz=UTC
-                            ),
-                            value=float(data_point.value),
-                            count=1,
-                        )
-
-                        metric_data_details.datapoints = [
-                            *metric_data_details.datapoints,
-                            datapoint,
-                        ]
-
-                    yield from metric_data_details_map.values()
+                    if metric_filter is None or metric_filter(metric.name):
+                        yield resource, scope, metric
+
+    def _group_streams(
+        self,
+        resource: Resource,
+        scope: InstrumentationScope,
+        metric: Metric,
+        extract: Callable[
+            [Resource, InstrumentationScope, DataPoint], InternedDimensions
+        ],
+    ) -> dict[StreamKey, MetricStream]:
+        name = metric.name
+        metadata = self.metadata_extractor.extract(resource, scope, metric)
+        limiter = self._cardinality_limiter
+        overflow = self._overflow
+        overflowed: set[StreamKey] = set()
+        overflow_keys: set[StreamKey] = set()
+        streams: dict[StreamKey, MetricStream] = {}
+        route_datapoint: DatapointRouter | None = (
+            None if self._router is None else self._router.resolve(resource, scope)
+        )
+        default_route = (self.namespace, self.resource_group, self.compartment_id)
+
+        def stream_of(data_point: DataPoint) -> MetricStream:
+            dimensions, key = extract(resource, scope, data_point)
+            route = None
+            if route_datapoint is not None:
+                # streams of different routes never share their state
+                route = route_datapoint(data_point.attributes)
+                key = (route, key)
+            stream = streams.get(key)
+            if (
+                stream is None
+                and limiter is not None
+                and overflow is not None
+                and (key in overflowed or not limiter.admit(name, key))
+            ):
+                overflowed.add(key)
+                dimensions, key = overflow
+                if route is not None:
+                    key = (route, key)
+                overflow_keys.add(key)
+                stream = streams.get(key)
+            if stream is None:
+                namespace, resource_group, compartment_id = route or default_route
+                stream = streams[key] = MetricStream(
+                    namespace=namespace,
+                    resource_group=resource_group,
+                    compartment_id=compartment_id,
+                    name=name,
+                    dimensions=dimensions,
+                    metadata=metadata,
+                )
+            return stream
+
+        data = metric.data
+        if self.columnar and isinstance(data, (Sum, Gauge)):
+            _fill_columnar(streams, data.data_points, stream_of)
+        else:
+            for data_point in data.data_points:
+                stream_of(data_point).add_data_point(data_point)
+
+        if limiter is not None and overflowed:
+            limiter.record_overflow(
+                name, len(overflowed), sum(len(streams[key]) for key in overflow_keys)
+            )
+        return streams
+
+    def _interned_dimensions_extractor(
+        self,
+    ) -> Callable[[Resource, InstrumentationScope, DataPoint], InternedDimensions]:
+        dimensions_extractor = self.dimensions_extractor
+        if isinstance(dimensions_extractor, InterningDimensionsExtractor):
+            return dimensions_extractor.extract_interned
+
+        def extract_interned(
+            resource: Resource, scope: InstrumentationScope, data_point: DataPoint
+        ) -> InternedDimensions:
+            dimensions = dimensions_extractor.extract(resource, scope, data_point)
+            return InternedDimensions(dimensions, frozenset(dimensions.items()))
+
+        return extract_interned
+
+
+def _fill_columnar(
+    streams: Mapping[StreamKey, MetricStream],
+    data_points: Sequence[NumberDataPoint],
+    stream_of: Callable[[DataPoint], MetricStream],
+) -> None:
+    # the dimensions are assumed to depend on the attributes only, so points
+    # sharing an attributes object share their stream
+    attributes_ids = list(map(id, map(_attributes, data_points)))
+    streams_by_attributes: dict[int, MetricStream] = {}
+    for attributes_id, data_point in zip(attributes_ids, data_points):
+        if attributes_id not in streams_by_attributes:
+            streams_by_attributes[attributes_id] = stream_of(data_point)
+    fill_number_streams(
+        list(streams.values()),
+        list(map(streams_by_attributes.__getitem__, attributes_ids)),
+        data_points,
+    )
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Iterable, TypeVar
+
+if TYPE_CHECKING:
+    from oci.monitoring import MonitoringClient
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class DispatchSettings:
+    """Settings for posting the batches of an export in parallel.
+
+    Every worker thread creates its own client with ``client_factory`` on first
+    use and keeps it, so its HTTP session and connections are reused across
+    exports.
+    """
+
+    client_factory: Callable[[], MonitoringClient] = field(repr=False)
+    max_workers: int = 4
+
+    def __post_init__(self) -> None:
+        if self.max_workers < 1:
+            msg = "max_workers must be at least 1"
+            raise ValueError(msg)
+
+
+class Dispatcher:
+    """A bounded thread pool whose workers each own a MonitoringClient."""
+
+    def __init__(self, settings: DispatchSettings, *, name: str = "Dispatcher") -> None:
+        super().__init__()
+        self.settings = settings
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.max_workers, thread_name_prefix=name
+        )
+
+    def client(self) -> MonitoringClient:
+        """Return the client of the calling worker thread."""
+        client: MonitoringClient | None = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.settings.client_factory()
+        return client
+
+    def map(
+        self, function: Callable[[MonitoringClient, T], R], items: Iterable[T]
+    ) -> list[R]:
+        """Call ``function`` with a worker's client for every item, in parallel.
+
+        The results are returned in the order of the items.
+        """
+
+        def call(item: T) -> R:
+            return function(self.client(), item)
+
+        return list(self._executor.map(call, items))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import math
+from datetime import datetime, timedelta, timezone
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, Literal, Mapping
+
+from opentelemetry_exporter_oci_monitoring.converter import MetricStream
+
+if TYPE_CHECKING:
+    from oci.monitoring.models import Datapoint
+
+    from opentelemetry_exporter_oci_monitoring.converter import ConvertedMetric
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+UTC = timezone(timedelta())
+
+_float_repr = float.__repr__
+
+# the separators of json.dumps, which the OCI SDK uses
+_SDK_SEPARATORS = (", ", ": ")
+_COMPACT_SEPARATORS = (",", ":")
+
+SerializationFormat = Literal["json", "ndjson"]
+# chunks smaller than this are collected before they are written
+WRITE_BUFFER_SIZE = 64 * 1024
+# distinct timestamps formatted per write before the cache is cleared
+MAX_CACHED_TIMESTAMPS = 4096
+
+
+def encode_post_metric_data(
+    metric_data: Iterable[ConvertedMetric],
+    batch_atomicity: Literal["ATOMIC", "NON_ATOMIC"] | None = None,
+) -> bytes:
+    """Encode the body of a PostMetricData request.
+
+    The output is byte-identical to the body the OCI SDK sends for the equivalent
+    PostMetricDataDetails model, without building the models or walking their
+    attribute maps.
+    """
+    timestamps: dict[int, str] = {}
+    body = '{"metricData": [' + ", ".join(
+        _encode_stream(stream, timestamps) for stream in metric_data
+    )
+    if batch_atomicity is None:
+        return (body + "]}").encode()
+    return (body + '], "batchAtomicity": ' + json.dumps(batch_atomicity) + "}").encode()
+
+
+def encode_post_metric_data_orjson(
+    metric_data: Iterable[ConvertedMetric],
+    batch_atomicity: Literal["ATOMIC", "NON_ATOMIC"] | None = None,
+) -> bytes:
+    """Encode the body of a PostMetricData request using orjson.
+
+    The output is semantically equal to the one of encode_post_metric_data, but
+    compact and therefore not byte-identical. Requires the optional orjson package.
+    """
+    if orjson is None:
+        msg = "encode_post_metric_data_orjson requires orjson, install the orjson extra"
+        raise RuntimeError(msg)
+
+    timestamps: dict[int, str] = {}
+    body: dict[str, Any] = {
+        "metricData": [_stream_to_dict(stream, timestamps) for stream in metric_data]
+    }
+    if batch_atomicity is not None:
+        body["batchAtomicity"] = batch_atomicity
+    return orjson.dumps(body)
+
+
+def write_metric_data(
+    metric_data: Iterable[ConvertedMetric],
+    output: IO[bytes],
+    output_format: SerializationFormat = "json",
+    *,
+    compact: bool = True,
+) -> int:
+    """Write metrics as a JSON array or as NDJSON, returning the bytes written.
+
+    Each metric is encoded like in the body of a PostMetricData request and
+    written as soon as enough of them are collected, so the memory used does
+    not grow with the number of metrics.
+    """
+    separators = _COMPACT_SEPARATORS if compact else _SDK_SEPARATORS
+    if output_format == "json":
+        start, delimiter, end = "[", separators[0], "]\n"
+    else:
+        start, delimiter, end = "", "\n", "\n"
+
+    timestamps: dict[int, str] = {}
+    written = 0
+    chunks: list[str] = [start]
+    size = len(start)
+    streams = 0
+    for stream in metric_data:
+        if len(timestamps) > MAX_CACHED_TIMESTAMPS:
+            timestamps.clear()
+        if streams:
+            chunks.append(delimiter)
+        chunk = _encode_stream(stream, timestamps, separators)
+        chunks.append(chunk)
+        streams += 1
+        size += len(chunk)
+        if size >= WRITE_BUFFER_SIZE:
+            written += output.write("".join(chunks).encode())
+            chunks.clear()
+            size = 0
+    if streams or output_format == "json":
+        chunks.append(end)
+    return written + output.write("".join(chunks).encode())
+
+
+def format_timestamp(time_unix_nano: int, /) -> str:
+    """Format a timestamp the way the OCI SDK serializes the datapoint datetime."""
+    return datetime.fromtimestamp(time_unix_nano / 1e9, tz=UTC).isoformat()[:-6] + "Z"
+
+
+def format_datetime(timestamp: datetime, /) -> str:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    return timestamp.astimezone(UTC).isoformat().replace("+00:00", "Z")
+
+
+def _encode_stream(
+    stream: ConvertedMetric,
+    timestamps: dict[int, str],
+    separators: tuple[str, str] = _SDK_SEPARATORS,
+) -> str:
+    item_separator, key_separator = separators
+    header = json.dumps(_header(stream), separators=separators)
+    datapoints = item_separator.join(_encode_datapoints(stream, timestamps, separators))
+    return (
+        header[:-1]
+        + item_separator
+        + '"datapoints"'
+        + key_separator
+        + "["
+        + datapoints
+        + "]}"
+    )
+
+
+def _header(stream: ConvertedMetric) -> dict[str, Any]:
+    header: dict[str, Any] = {"namespace": stream.namespace}
+    if stream.resource_group is not None:
+        header["resourceGroup"] = stream.resource_group
+    header["compartmentId"] = stream.compartment_id
+    header["name"] = stream.name
+    header["dimensions"] = _to_dict(stream.dimensions)
+    if stream.metadata is not None:
+        header["metadata"] = _to_dict(stream.metadata)
+    return header
+
+
+def _encode_datapoints(
+    stream: ConvertedMetric,
+    timestamps: dict[int, str],
+    separators: tuple[str, str] = _SDK_SEPARATORS,
+) -> Iterator[str]:
+    item_separator, key_separator = separators
+    timestamp_prefix = '{"timestamp"' + key_separator + '"'
+    value_prefix = '"' + item_separator + '"value"' + key_separator
+    count_prefix = item_separator + '"count"' + key_separator
+    if isinstance(stream, MetricStream):
+        for time_unix_nano, value, count in zip(
+            stream.timestamps, stream.values, stream.counts
+        ):
+            timestamp = timestamps.get(time_unix_nano)
+            if timestamp is None:
+                timestamp = timestamps[time_unix_nano] = format_timestamp(
+                    time_unix_nano
+                )
+            yield (
+                timestamp_prefix
+                + timestamp
+                + value_prefix
+                + _encode_value(value)
+                + count_prefix
+                + str(count)
+                + "}"
+            )
+        return
+
+    for datapoint in stream.datapoints:
+        encoded = (
+            timestamp_prefix
+            + format_datetime(datapoint.timestamp)
+            + value_prefix
+            + _encode_value(datapoint.value)
+        )
+        if datapoint.count is not None:
+            encoded += count_prefix + json.dumps(datapoint.count)
+        yield encoded + "}"
+
+
+def _encode_value(value: float) -> str:
+    if type(value) is float and math.isfinite(value):
+        return _float_repr(value)
+    return json.dumps(value)
+
+
+def _stream_to_dict(
+    stream: ConvertedMetric, timestamps: dict[int, str]
+) -> dict[str, Any]:
+    stream_dict = _header(stream)
+    if isinstance(stream, MetricStream):
+        datapoints: list[dict[str, Any]] = []
+        for time_unix_nano, value, count in zip(
+            stream.timestamps, stream.values, stream.counts
+        ):
+            timestamp = timestamps.get(time_unix_nano)
+            if timestamp is None:
+                timestamp = timestamps[time_unix_nano] = format_timestamp(
+                    time_unix_nano
+                )
+            datapoints.append({"timestamp": timestamp, "value": value, "count": count})
+    else:
+        datapoints = [_datapoint_to_dict(datapoint) for datapoint in stream.datapoints]
+    stream_dict["datapoints"] = datapoints
+    return stream_dict
+
+
+def _datapoint_to_dict(datapoint: Datapoint) -> dict[str, Any]:
+    datapoint_dict: dict[str, Any] = {
+        "timestamp": format_datetime(datapoint.timestamp),
+        "value": datapoint.value,
+    }
+    if datapoint.count is not None:
+        datapoint_dict["count"] = datapoint.count
+    return datapoint_dict
+
+
+def _to_dict(mapping: Mapping[str, str]) -> dict[str, str]:
+    return mapping if isinstance(mapping, dict) else dict(mapping)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import fnmatch
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal, Mapping, Sequence, TypeVar
+
+from opentelemetry_exporter_oci_monitoring.cache import CacheInfo, LRUCache
+
+if TYPE_CHECKING:
+    from re import Pattern
+
+PatternSyntax = Literal["glob", "regex"]
+PATTERN_SYNTAXES: tuple[PatternSyntax, ...] = ("glob", "regex")
+
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class FilterRules:
+    """Which names, of metrics or of attribute keys, are kept.
+
+    A name is kept if it matches one of the ``include`` patterns, or if there
+    are none, and none of the ``exclude`` patterns. Patterns match the whole
+    name. The decisions for at most ``cache_size`` names are memoized.
+    """
+
+    include: Sequence[str] = ()
+    exclude: Sequence[str] = ()
+    syntax: PatternSyntax = "glob"
+    cache_size: int = 4096
+
+    def __post_init__(self) -> None:
+        if self.syntax not in PATTERN_SYNTAXES:
+            msg = f"syntax must be one of {', '.join(PATTERN_SYNTAXES)}"
+            raise ValueError(msg)
+        if self.cache_size < 1:
+            msg = "cache_size must be at least 1"
+            raise ValueError(msg)
+        try:
+            _ = _compile(self.include, self.syntax)
+            _ = _compile(self.exclude, self.syntax)
+        except re.error as error:
+            msg = f"invalid pattern: {error}"
+            raise ValueError(msg) from error
+
+
+class NameFilter:
+    """Matches names against the rules compiled into a single regex each."""
+
+    def __init__(self, rules: FilterRules) -> None:
+        super().__init__()
+        self.rules = rules
+        self._include = _compile(rules.include, rules.syntax)
+        self._exclude = _compile(rules.exclude, rules.syntax)
+        self._cache: LRUCache[str, bool] = LRUCache(rules.cache_size)
+
+    def __call__(self, name: str, /) -> bool:
+        """Return whether the name is kept."""
+        kept = self._cache.get(name)
+        if kept is None:
+            kept = (self._include is None or bool(self._include.fullmatch(name))) and (
+                self._exclude is None or not self._exclude.fullmatch(name)
+            )
+            self._cache.put(name, kept)
+        return kept
+
+    def filter_keys(self, mapping: Mapping[str, V], /) -> Mapping[str, V]:
+        """Return the items of the mapping whose key is kept."""
+        if all(map(self, mapping)):
+            return mapping
+        return {key: value for key, value in mapping.items() if self(key)}
+
+    def cache_info(self) -> CacheInfo:
+        return self._cache.info()
+
+
+def _compile(patterns: Sequence[str], syntax: PatternSyntax) -> Pattern[str] | None:
+    if not patterns:
+        return None
+    if syntax == "glob":
+        patterns = [fnmatch.translate(pattern) for pattern in patterns]
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
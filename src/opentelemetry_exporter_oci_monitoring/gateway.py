@@ -0,0 +1,464 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import signal
+import threading
+from dataclasses import replace
+from datetime import timedelta
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import basicConfig, getLogger
+from pathlib import Path
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Hashable,
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from oci.auth.signers import InstancePrincipalsSecurityTokenSigner
+from oci.config import DEFAULT_LOCATION, DEFAULT_PROFILE, from_file
+from oci.monitoring import MonitoringClient
+from opentelemetry.sdk.metrics.export import (
+    MetricExportResult,
+    MetricsData,
+    ResourceMetrics,
+    ScopeMetrics,
+)
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.cache import LRUCache
+from opentelemetry_exporter_oci_monitoring.converter import (
+    DefaultMetricsConverter,
+    attributes_key,
+)
+from opentelemetry_exporter_oci_monitoring.encoding import encode_post_metric_data
+from opentelemetry_exporter_oci_monitoring.otlp import (
+    JSON_CONTENT_TYPE,
+    PROTOBUF_CONTENT_TYPE,
+    OTLPDecodeError,
+    UnsupportedContentTypeError,
+    decode_export_request,
+)
+from opentelemetry_exporter_oci_monitoring.temporality import CumulativeToDelta
+
+if TYPE_CHECKING:
+    from socketserver import BaseServer
+
+    from opentelemetry.sdk.metrics.export import DataPointT, DataT, Metric
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+    from opentelemetry.util.types import Attributes
+
+logger = getLogger(__name__)
+
+METRICS_PATH = "/v1/metrics"
+DEFAULT_LISTEN_ADDRESS = "127.0.0.1:4318"
+DEFAULT_SERVICE_ENDPOINT = "https://telemetry-ingestion.{region}.oraclecloud.com"
+MAX_BODY_SIZE = 16 * 1024 * 1024
+# distinct resources and scopes that keep their identity across exports
+MAX_INTERNED_OBJECTS = 1024
+
+_ScopeKey = Tuple[str, Optional[str]]
+_MetricKey = Tuple[str, type, object, object]
+
+
+def merge_metrics_data(metrics_data: Iterable[MetricsData]) -> MetricsData:
+    """Merge the metrics of many exports into one MetricsData.
+
+    Metrics of the same resource, scope, name, type and temporality share one
+    Metric holding all of their data points, so the converter groups the data
+    points of equal dimensions into a single stream. Cumulative sums of many
+    processes are not summed up, convert them with CumulativeToDelta first.
+    """
+    resources: dict[
+        frozenset[Hashable],
+        tuple[
+            Resource,
+            dict[_ScopeKey, tuple[InstrumentationScope, dict[_MetricKey, Metric]]],
+        ],
+    ] = {}
+    for data in metrics_data:
+        for resource_metrics in data.resource_metrics:
+            resource = resource_metrics.resource
+            _, scopes = resources.setdefault(
+                frozenset(attributes_key(resource.attributes)), (resource, {})
+            )
+            for scope_metrics in resource_metrics.scope_metrics:
+                scope = scope_metrics.scope
+                _, metrics = scopes.setdefault((scope.name, scope.version), (scope, {}))
+                for metric in scope_metrics.metrics:
+                    key = (
+                        metric.name,
+                        type(metric.data),
+                        getattr(metric.data, "aggregation_temporality", None),
+                        getattr(metric.data, "is_monotonic", None),
+                    )
+                    merged = metrics.get(key)
+                    if merged is None:
+                        metrics[key] = _copy_metric(metric)
+                    else:
+                        _data_points(merged.data).extend(metric.data.data_points)
+
+    return MetricsData(
+        resource_metrics=[
+            ResourceMetrics(
+                resource=resource,
+                scope_metrics=[
+                    ScopeMetrics(
+                        scope=scope, metrics=list(metrics.values()), schema_url=""
+                    )
+                    for scope, metrics in scopes.values()
+                ],
+                schema_url="",
+            )
+            for resource, scopes in resources.values()
+        ]
+    )
+
+
+def _copy_metric(metric: Metric) -> Metric:
+    data = metric.data
+    return replace(metric, data=replace(data, data_points=list(data.data_points)))
+
+
+def _data_points(data: DataT) -> list[DataPointT]:
+    # the data points of merged metrics are always lists, see _copy_metric
+    return data.data_points  # pyright: ignore[reportReturnType]
+
+
+class MetricsGateway:
+    """Buffers the metrics received from many processes and exports them together.
+
+    Every ``export_interval_millis`` the buffered metrics are merged and passed
+    to the exporter in one call. Once ``max_pending_data_points`` are buffered,
+    further metrics are rejected until the next export. Cumulative sums and
+    histograms are converted to deltas of each process when they are received,
+    so they add up across processes like the deltas do. Resources and scopes
+    of equal content are passed to the exporter as the same objects in every
+    export, so the caches of the converter keyed on them keep hitting.
+    """
+
+    def __init__(
+        self,
+        exporter: OCIMonitoringExporter,
+        *,
+        export_interval_millis: float = 60_000,
+        export_timeout_millis: float = 30_000,
+        max_pending_data_points: int = 1_000_000,
+        max_cumulative_streams: int = 100_000,
+    ) -> None:
+        super().__init__()
+        if export_interval_millis <= 0:
+            msg = "export_interval_millis must be positive"
+            raise ValueError(msg)
+        if max_pending_data_points < 1:
+            msg = "max_pending_data_points must be at least 1"
+            raise ValueError(msg)
+        self.exporter = exporter
+        self.export_interval_millis = export_interval_millis
+        self.export_timeout_millis = export_timeout_millis
+        self.max_pending_data_points = max_pending_data_points
+        self.rejected_data_points = 0
+        self._pending: list[MetricsData] = []
+        self._pending_data_points = 0
+        self._cumulative_to_delta = CumulativeToDelta(max_cumulative_streams)
+        self._resources: LRUCache[Hashable, Resource] = LRUCache(MAX_INTERNED_OBJECTS)
+        self._scopes: LRUCache[Hashable, InstrumentationScope] = LRUCache(
+            MAX_INTERNED_OBJECTS
+        )
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(
+            target=self._run, name=type(self).__name__, daemon=True
+        )
+
+    def start(self) -> None:
+        self._worker.start()
+
+    def receive(self, metrics_data: MetricsData) -> bool:
+        """Buffer metrics for the next export, returning whether they were accepted."""
+        data_points = sum(
+            len(metric.data.data_points)
+            for resource_metrics in metrics_data.resource_metrics
+            for scope_metrics in resource_metrics.scope_metrics
+            for metric in scope_metrics.metrics
+        )
+        with self._lock:
+            if (
+                self._stopped.is_set()
+                or self._pending_data_points + data_points
+                > self.max_pending_data_points
+            ):
+                self.rejected_data_points += data_points
+                return False
+            # only accepted metrics move the baselines, rejected ones are resent
+            self._pending.append(self._cumulative_to_delta.convert(metrics_data))
+            self._pending_data_points += data_points
+        return True
+
+    def export_pending(self) -> MetricExportResult:
+        with self._export_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                self._pending_data_points = 0
+            if not pending:
+                return MetricExportResult.SUCCESS
+            try:
+                return self.exporter.export(
+                    self._intern(merge_metrics_data(pending)),
+                    timeout_millis=self.export_timeout_millis,
+                )
+            except Exception:
+                logger.exception("Failed to export the received metrics.")
+                return MetricExportResult.FAILURE
+
+    def shutdown(self) -> None:
+        """Stop the schedule, export the buffered metrics and shut down the exporter."""
+        self._stopped.set()
+        if self._worker.is_alive():
+            self._worker.join()
+        _ = self.export_pending()
+        self.exporter.shutdown()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.export_interval_millis / 1e3):
+            _ = self.export_pending()
+
+    def _intern(self, metrics_data: MetricsData) -> MetricsData:
+        return MetricsData(
+            resource_metrics=[
+                replace(
+                    resource_metrics,
+                    resource=self._intern_resource(resource_metrics.resource),
+                    scope_metrics=[
+                        replace(
+                            scope_metrics, scope=self._intern_scope(scope_metrics.scope)
+                        )
+                        for scope_metrics in resource_metrics.scope_metrics
+                    ],
+                )
+                for resource_metrics in metrics_data.resource_metrics
+            ]
+        )
+
+    def _intern_resource(self, resource: Resource) -> Resource:
+        key = (frozenset(attributes_key(resource.attributes)), resource.schema_url)
+        interned = self._resources.get(key)
+        if interned is None:
+            self._resources.put(key, resource)
+            return resource
+        return interned
+
+    def _intern_scope(self, scope: InstrumentationScope) -> InstrumentationScope:
+        # scope attributes are supported since opentelemetry-sdk 1.27
+        attributes = cast("Attributes", getattr(scope, "attributes", None))
+        key = (
+            scope.name,
+            scope.version,
+            scope.schema_url,
+            frozenset(attributes_key(attributes or {})),
+        )
+        interned = self._scopes.get(key)
+        if interned is None:
+            self._scopes.put(key, scope)
+            return scope
+        return interned
+
+
+class OTLPRequestHandler(BaseHTTPRequestHandler):
+    """Accepts OTLP/HTTP metrics export requests and hands them to the gateway."""
+
+    def __init__(self, *args: Any, gateway: MetricsGateway, **kwargs: Any) -> None:  # noqa: ANN401
+        self.gateway = gateway
+        super().__init__(*args, **kwargs)
+
+    def do_POST(self) -> None:  # noqa: N802
+        if self.path.partition("?")[0] != METRICS_PATH:
+            self._respond(HTTPStatus.NOT_FOUND)
+            return
+
+        content_type = self.headers.get("Content-Type", JSON_CONTENT_TYPE)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_SIZE:
+            self._respond(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            return
+        body = self.rfile.read(length)
+        try:
+            if self.headers.get("Content-Encoding", "").lower() == "gzip":
+                body = gzip.decompress(body)
+            metrics_data = decode_export_request(body, content_type)
+        except UnsupportedContentTypeError:
+            self._respond(HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+            return
+        except (OSError, EOFError, OTLPDecodeError) as error:
+            logger.warning("Rejected a malformed export request.", exc_info=error)
+            self._respond(HTTPStatus.BAD_REQUEST)
+            return
+
+        if not self.gateway.receive(metrics_data):
+            self._respond(HTTPStatus.SERVICE_UNAVAILABLE)
+            return
+
+        # an empty ExportMetricsServiceResponse in either encoding
+        if content_type.startswith(PROTOBUF_CONTENT_TYPE):
+            self._respond(HTTPStatus.OK, b"", PROTOBUF_CONTENT_TYPE)
+        else:
+            self._respond(HTTPStatus.OK, b"{}", JSON_CONTENT_TYPE)
+
+    def address_string(self) -> str:
+        # unix socket clients have no address
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        logger.debug(format, *args)
+
+    def _respond(
+        self,
+        status: HTTPStatus,
+        body: bytes = b"",
+        content_type: str = JSON_CONTENT_TYPE,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        _ = self.wfile.write(body)
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(
+    gateway: MetricsGateway,
+    *,
+    address: tuple[str, int] | None = None,
+    unix_socket: str | None = None,
+) -> BaseServer:
+    """Create an OTLP/HTTP server that listens on a TCP address or a unix socket."""
+    handler = partial(OTLPRequestHandler, gateway=gateway)
+    if unix_socket is None:
+        return ThreadingHTTPServer(
+            address or _parse_address(DEFAULT_LISTEN_ADDRESS), handler
+        )
+
+    path = Path(unix_socket)
+    if path.is_socket():
+        # a socket left behind by a previous gateway
+        path.unlink()
+    return ThreadingUnixHTTPServer(unix_socket, handler)
+
+
+def _parse_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        msg = f"invalid address {address!r}, expected host:port"
+        raise argparse.ArgumentTypeError(msg)
+    return host.strip("[]"), int(port)
+
+
+def _make_client(args: argparse.Namespace) -> MonitoringClient:
+    if args.instance_principal:
+        signer = InstancePrincipalsSecurityTokenSigner()
+        config: dict[str, object] = {"region": signer.region}
+    else:
+        signer = None
+        config = from_file(args.config_file, args.profile)
+    service_endpoint = args.service_endpoint or DEFAULT_SERVICE_ENDPOINT.format(
+        region=config["region"]
+    )
+    return MonitoringClient(config, service_endpoint=service_endpoint, signer=signer)
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="otel-oci-gateway",
+        description=(
+            "Receive OTLP/HTTP metrics from many processes and export them "
+            "to the OCI Monitoring Service together."
+        ),
+    )
+    _ = parser.add_argument("--namespace", required=True)
+    _ = parser.add_argument("--resource-group", required=True)
+    _ = parser.add_argument("--compartment-id", required=True)
+    listen = parser.add_mutually_exclusive_group()
+    _ = listen.add_argument(
+        "--listen",
+        type=_parse_address,
+        default=DEFAULT_LISTEN_ADDRESS,
+        help="host:port to listen on (default: %(default)s)",
+    )
+    _ = listen.add_argument("--unix-socket", help="path of a unix socket to listen on")
+    _ = parser.add_argument(
+        "--export-interval",
+        type=float,
+        default=60.0,
+        help="seconds between exports (default: %(default)s)",
+    )
+    _ = parser.add_argument(
+        "--aggregation-resolution",
+        type=float,
+        default=60.0,
+        help=(
+            "seconds of the time buckets the datapoints of equal streams are "
+            "aggregated into, 0 to disable (default: %(default)s)"
+        ),
+    )
+    _ = parser.add_argument("--service-endpoint")
+    _ = parser.add_argument("--config-file", default=DEFAULT_LOCATION)
+    _ = parser.add_argument("--profile", default=DEFAULT_PROFILE)
+    _ = parser.add_argument(
+        "--instance-principal",
+        action="store_true",
+        help="authenticate as the instance instead of with the config file",
+    )
+    _ = parser.add_argument("--log-level", default="INFO")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parse_args(argv)
+    basicConfig(level=args.log_level.upper())
+
+    converter = DefaultMetricsConverter(
+        namespace=args.namespace,
+        resource_group=args.resource_group,
+        compartment_id=args.compartment_id,
+        aggregation_resolution=timedelta(seconds=args.aggregation_resolution)
+        if args.aggregation_resolution > 0
+        else None,
+    )
+    exporter = OCIMonitoringExporter(
+        _make_client(args), converter, payload_encoder=encode_post_metric_data
+    )
+    gateway = MetricsGateway(
+        exporter, export_interval_millis=args.export_interval * 1e3
+    )
+    server = make_server(gateway, address=args.listen, unix_socket=args.unix_socket)
+
+    def stop(*_: object) -> None:
+        # shutdown() waits for serve_forever(), which runs on this thread
+        threading.Thread(target=server.shutdown).start()
+
+    _ = signal.signal(signal.SIGTERM, stop)
+    gateway.start()
+    logger.info(
+        "Receiving OTLP metrics.", extra={"address": args.unix_socket or args.listen}
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        gateway.shutdown()
+    return 0
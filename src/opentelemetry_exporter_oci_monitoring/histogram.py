@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from itertools import compress
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics.export import (
+        ExponentialHistogramDataPoint,
+        HistogramDataPoint,
+    )
+
+
+@lru_cache(maxsize=64)
+def explicit_bucket_values(explicit_bounds: tuple[float, ...], /) -> tuple[float, ...]:
+    """Return a representative value per bucket of an explicit bucket histogram.
+
+    Inner buckets are represented by their midpoint, the unbounded outer buckets
+    by their finite bound.
+    """
+    if not explicit_bounds:
+        return (0.0,)
+    midpoints = tuple(
+        (lower + upper) / 2
+        for lower, upper in zip(explicit_bounds, explicit_bounds[1:])
+    )
+    return (explicit_bounds[0], *midpoints, explicit_bounds[-1])
+
+
+@lru_cache(maxsize=64)
+def exponential_bucket_values(
+    scale: int, offset: int, length: int, /
+) -> tuple[float, ...]:
+    """Return the geometric midpoint of each positive exponential bucket.
+
+    Bucket ``index`` covers ``(base ** index, base ** (index + 1)]`` with
+    ``base = 2 ** (2 ** -scale)``.
+    """
+    factor = 2.0**-scale
+    return tuple(
+        2.0 ** ((index + 0.5) * factor) for index in range(offset, offset + length)
+    )
+
+
+def expand_histogram(
+    data_point: HistogramDataPoint, /
+) -> tuple[list[float], list[int]]:
+    """Expand a histogram data point into datapoint values and counts.
+
+    Every non-empty bucket becomes one datapoint whose value represents the bucket
+    and whose count is the number of measurements in it. The representative values
+    only depend on the bucket layout and are cached, so the buckets are expanded
+    with itertools instead of a Python loop per bucket.
+    """
+    bucket_counts = data_point.bucket_counts
+    if len(bucket_counts) <= 1:
+        if not data_point.count:
+            return [], []
+        return [data_point.sum / data_point.count], [data_point.count]
+
+    bucket_values = explicit_bucket_values(tuple(data_point.explicit_bounds))
+    values = list(compress(bucket_values, bucket_counts))
+    counts = list(filter(None, bucket_counts))
+    _clamp_extremes(values, data_point.min, data_point.max)
+    return values, counts
+
+
+def expand_exponential_histogram(
+    data_point: ExponentialHistogramDataPoint, /
+) -> tuple[list[float], list[int]]:
+    scale = data_point.scale
+    positive = data_point.positive
+    negative = data_point.negative
+
+    values: list[float] = [
+        -value
+        for value in compress(
+            exponential_bucket_values(
+                scale, negative.offset, len(negative.bucket_counts)
+            ),
+            negative.bucket_counts,
+        )
+    ]
+    values.reverse()
+    counts = [count for count in reversed(negative.bucket_counts) if count]
+
+    if data_point.zero_count:
+        values.append(0.0)
+        counts.append(data_point.zero_count)
+
+    values.extend(
+        compress(
+            exponential_bucket_values(
+                scale, positive.offset, len(positive.bucket_counts)
+            ),
+            positive.bucket_counts,
+        )
+    )
+    counts.extend(filter(None, positive.bucket_counts))
+
+    _clamp_extremes(values, data_point.min, data_point.max)
+    return values, counts
+
+
+def _clamp_extremes(values: list[float], minimum: float, maximum: float) -> None:
+    # the representative values are sorted, so only the outermost non-empty
+    # buckets can lie outside of the recorded range
+    if not values or not (math.isfinite(minimum) and math.isfinite(maximum)):
+        return
+    if minimum > maximum:
+        return
+    values[0] = _clamp(values[0], minimum, maximum)
+    values[-1] = _clamp(values[-1], minimum, maximum)
+
+
+def _clamp(value: float, minimum: float, maximum: float) -> float:
+    return min(max(value, minimum), maximum)
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import inspect
+import json
+import math
+from logging import getLogger
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Sequence, cast
+
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    Buckets,
+    ExponentialHistogram,
+    ExponentialHistogramDataPoint,
+    Gauge,
+    Histogram,
+    HistogramDataPoint,
+    Metric,
+    MetricsData,
+    NumberDataPoint,
+    ResourceMetrics,
+    ScopeMetrics,
+    Sum,
+)
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics.export import DataT
+
+    from opentelemetry_exporter_oci_monitoring.converter import (
+        Attributes,
+        AttributeValue,
+    )
+
+try:
+    from google.protobuf.json_format import MessageToDict
+    from opentelemetry.proto.collector.metrics.v1.metrics_service_pb2 import (
+        ExportMetricsServiceRequest,
+    )
+except ImportError:  # pragma: no cover
+    MessageToDict = None
+    ExportMetricsServiceRequest = None
+
+logger = getLogger(__name__)
+
+JSON_CONTENT_TYPE = "application/json"
+PROTOBUF_CONTENT_TYPE = "application/x-protobuf"
+
+_TEMPORALITY_PREFIX = "AGGREGATION_TEMPORALITY_"
+
+JSONObject = Mapping[str, Any]
+
+# scope attributes are supported since opentelemetry-sdk 1.27
+_SCOPE_HAS_ATTRIBUTES = (
+    "attributes" in inspect.signature(InstrumentationScope).parameters
+)
+
+
+class OTLPDecodeError(ValueError):
+    pass
+
+
+class UnsupportedContentTypeError(OTLPDecodeError):
+    pass
+
+
+def decode_export_request(body: bytes, content_type: str) -> MetricsData:
+    """Decode the body of an OTLP/HTTP metrics export request.
+
+    JSON bodies are always accepted. Protobuf bodies require the optional
+    opentelemetry-proto package.
+    """
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type == JSON_CONTENT_TYPE:
+        try:
+            message = json.loads(body)
+        except ValueError as error:
+            raise OTLPDecodeError(str(error)) from error
+    elif (
+        media_type == PROTOBUF_CONTENT_TYPE
+        and ExportMetricsServiceRequest is not None
+        and MessageToDict is not None
+    ):
+        request = ExportMetricsServiceRequest()
+        try:
+            _ = request.ParseFromString(body)
+        except Exception as error:
+            raise OTLPDecodeError(str(error)) from error
+        message = MessageToDict(request)
+    else:
+        msg = f"unsupported content type {content_type!r}"
+        raise UnsupportedContentTypeError(msg)
+
+    if not isinstance(message, dict):
+        msg = "the request body is not a JSON object"
+        raise OTLPDecodeError(msg)
+    try:
+        return decode_metrics_data(cast("JSONObject", message))
+    except (KeyError, TypeError, ValueError) as error:
+        raise OTLPDecodeError(str(error)) from error
+
+
+def decode_metrics_data(message: JSONObject) -> MetricsData:
+    """Build MetricsData from an ExportMetricsServiceRequest in the JSON mapping.
+
+    64-bit integers may be given as numbers or strings and enums as numbers or
+    names, so the output of protobuf's MessageToDict is accepted as well.
+    Summaries are not supported by the converter and are skipped.
+    """
+    return MetricsData(
+        resource_metrics=[
+            ResourceMetrics(
+                resource=Resource(
+                    _attributes(resource_metrics.get("resource", {})),
+                    resource_metrics.get("schemaUrl") or None,
+                ),
+                scope_metrics=[
+                    _scope_metrics(scope_metrics)
+                    for scope_metrics in resource_metrics.get("scopeMetrics", [])
+                ],
+                schema_url=resource_metrics.get("schemaUrl", ""),
+            )
+            for resource_metrics in message.get("resourceMetrics", [])
+        ]
+    )
+
+
+def _scope_metrics(scope_metrics: JSONObject) -> ScopeMetrics:
+    scope = scope_metrics.get("scope", {})
+    metrics = [_metric(metric) for metric in scope_metrics.get("metrics", [])]
+    return ScopeMetrics(
+        scope=_instrumentation_scope(scope, scope_metrics.get("schemaUrl") or None),
+        metrics=[metric for metric in metrics if metric is not None],
+        schema_url=scope_metrics.get("schemaUrl", ""),
+    )
+
+
+def _instrumentation_scope(
+    scope: JSONObject, schema_url: str | None
+) -> InstrumentationScope:
+    name = scope.get("name", "")
+    version = scope.get("version") or None
+    if _SCOPE_HAS_ATTRIBUTES:
+        return InstrumentationScope(name, version, schema_url, _attributes(scope))
+    return InstrumentationScope(name, version, schema_url)
+
+
+def _metric(metric: JSONObject) -> Metric | None:
+    data: DataT
+    if "sum" in metric:
+        sum_ = metric["sum"]
+        data = Sum(
+            data_points=[_number_point(point) for point in sum_.get("dataPoints", [])],
+            aggregation_temporality=_temporality(sum_),
+            is_monotonic=bool(sum_.get("isMonotonic", False)),
+        )
+    elif "gauge" in metric:
+        data = Gauge(
+            data_points=[
+                _number_point(point) for point in metric["gauge"].get("dataPoints", [])
+            ]
+        )
+    elif "histogram" in metric:
+        histogram = metric["histogram"]
+        data = Histogram(
+            data_points=[
+                _histogram_point(point) for point in histogram.get("dataPoints", [])
+            ],
+            aggregation_temporality=_temporality(histogram),
+        )
+    elif "exponentialHistogram" in metric:
+        histogram = metric["exponentialHistogram"]
+        data = ExponentialHistogram(
+            data_points=[
+                _exponential_histogram_point(point)
+                for point in histogram.get("dataPoints", [])
+            ],
+            aggregation_temporality=_temporality(histogram),
+        )
+    else:
+        logger.debug(
+            "Skipped unsupported metric.", extra={"metric": metric.get("name")}
+        )
+        return None
+
+    return Metric(
+        name=metric["name"],
+        description=metric.get("description", ""),
+        unit=metric.get("unit", ""),
+        data=data,
+    )
+
+
+def _temporality(data: JSONObject) -> AggregationTemporality:
+    temporality = data.get("aggregationTemporality", 0)
+    if isinstance(temporality, str):
+        if temporality.startswith(_TEMPORALITY_PREFIX):
+            temporality = temporality[len(_TEMPORALITY_PREFIX) :]
+        return AggregationTemporality[temporality]
+    return AggregationTemporality(temporality)
+
+
+def _number_point(point: JSONObject) -> NumberDataPoint:
+    value: float
+    if "asDouble" in point:
+        value = float(point["asDouble"])
+    else:
+        value = int(point.get("asInt", 0))
+    return NumberDataPoint(
+        attributes=_attributes(point),
+        start_time_unix_nano=int(point.get("startTimeUnixNano", 0)),
+        time_unix_nano=int(point.get("timeUnixNano", 0)),
+        value=value,
+    )
+
+
+def _histogram_point(point: JSONObject) -> HistogramDataPoint:
+    return HistogramDataPoint(
+        attributes=_attributes(point),
+        start_time_unix_nano=int(point.get("startTimeUnixNano", 0)),
+        time_unix_nano=int(point.get("timeUnixNano", 0)),
+        count=int(point.get("count", 0)),
+        sum=float(point.get("sum", 0.0)),
+        bucket_counts=[int(count) for count in point.get("bucketCounts", [])],
+        explicit_bounds=[float(bound) for bound in point.get("explicitBounds", [])],
+        min=float(point.get("min", math.inf)),
+        max=float(point.get("max", -math.inf)),
+    )
+
+
+def _exponential_histogram_point(point: JSONObject) -> ExponentialHistogramDataPoint:
+    return ExponentialHistogramDataPoint(
+        attributes=_attributes(point),
+        start_time_unix_nano=int(point.get("startTimeUnixNano", 0)),
+        time_unix_nano=int(point.get("timeUnixNano", 0)),
+        count=int(point.get("count", 0)),
+        sum=float(point.get("sum", 0.0)),
+        scale=int(point.get("scale", 0)),
+        zero_count=int(point.get("zeroCount", 0)),
+        positive=_buckets(point.get("positive", {})),
+        negative=_buckets(point.get("negative", {})),
+        flags=int(point.get("flags", 0)),
+        min=float(point.get("min", math.inf)),
+        max=float(point.get("max", -math.inf)),
+    )
+
+
+def _buckets(buckets: JSONObject) -> Buckets:
+    return Buckets(
+        offset=int(buckets.get("offset", 0)),
+        bucket_counts=[int(count) for count in buckets.get("bucketCounts", [])],
+    )
+
+
+def _attributes(owner: JSONObject) -> Attributes:
+    attributes: dict[str, AttributeValue] = {}
+    for attribute in owner.get("attributes", []):
+        value = _any_value(attribute.get("value", {}))
+        if value is not None:
+            attributes[attribute["key"]] = value
+    return attributes
+
+
+def _any_value(value: JSONObject) -> AttributeValue | None:
+    for field, convert in _ANY_VALUE_CONVERTERS:
+        if field in value:
+            return convert(value[field])
+    return None
+
+
+def _array_value(array: JSONObject) -> AttributeValue:
+    primitives = [_any_value(value) for value in array.get("values", [])]
+    # attribute arrays are homogeneous, nested values are not supported
+    return tuple(  # pyright: ignore[reportReturnType]
+        primitive
+        for primitive in primitives
+        if isinstance(primitive, (str, bool, int, float))
+    )
+
+
+def _kvlist_value(kvlist: JSONObject) -> str:
+    return json.dumps(_attributes({"attributes": kvlist.get("values", [])}))
+
+
+_ANY_VALUE_CONVERTERS: Sequence[tuple[str, Callable[[Any], AttributeValue]]] = (
+    ("stringValue", str),
+    ("boolValue", bool),
+    ("intValue", int),
+    ("doubleValue", float),
+    ("arrayValue", _array_value),
+    ("kvlistValue", _kvlist_value),
+    ("bytesValue", str),
+)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from logging import getLogger
+from typing import Callable, Generic, TypeVar
+
+logger = getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class OverflowPolicy(Enum):
+    """What to do with a batch that is added to a full queue."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    BLOCK = "block"
+
+
+@dataclass(frozen=True)
+class QueueSettings:
+    """Settings of the background export queue.
+
+    With ``OverflowPolicy.BLOCK``, adding to a full queue waits for at most
+    ``block_timeout_millis`` and drops the new batch afterwards.
+    """
+
+    max_size: int = 64
+    overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    block_timeout_millis: float = 1_000
+
+    def __post_init__(self) -> None:
+        if self.max_size < 1:
+            msg = "max_size must be at least 1"
+            raise ValueError(msg)
+        if self.block_timeout_millis < 0:
+            msg = "block_timeout_millis must not be negative"
+            raise ValueError(msg)
+
+
+class ExportQueue(Generic[T]):
+    """A bounded queue drained by a single worker thread.
+
+    ``process`` is called on the worker thread for every item in the order they
+    were added. Exceptions it raises are logged and do not stop the worker.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[T], object],
+        settings: QueueSettings,
+        *,
+        name: str = "ExportQueue",
+    ) -> None:
+        super().__init__()
+        self.settings = settings
+        self.dropped = 0
+        self._process = process
+        self._items: deque[T] = deque()
+        self._unfinished = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._items)
+
+    def put(self, item: T) -> bool:
+        """Add an item, returning whether it was accepted."""
+        settings = self.settings
+        with self._condition:
+            if self._closed:
+                return False
+
+            if len(self._items) >= settings.max_size:
+                if settings.overflow_policy is OverflowPolicy.DROP_NEWEST:
+                    self._drop()
+                    return False
+                if settings.overflow_policy is OverflowPolicy.DROP_OLDEST:
+                    _ = self._items.popleft()
+                    self._unfinished -= 1
+                    self._drop()
+                elif not self._condition.wait_for(
+                    lambda: self._closed or len(self._items) < settings.max_size,
+                    settings.block_timeout_millis / 1e3,
+                ):
+                    self._drop()
+                    return False
+                elif self._closed:
+                    return False
+
+            self._items.append(item)
+            self._unfinished += 1
+            self._condition.notify_all()
+            return True
+
+    def flush(self, timeout_millis: float | None = None) -> bool:
+        """Wait until all items added so far are processed."""
+        timeout = None if timeout_millis is None else timeout_millis / 1e3
+        with self._condition:
+            return self._condition.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def shutdown(self, timeout_millis: float | None = None) -> bool:
+        """Reject new items and wait for the worker to drain the queue."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._worker.join(None if timeout_millis is None else timeout_millis / 1e3)
+        if self._worker.is_alive():
+            logger.warning(
+                "Timed out draining the export queue.",
+                extra={"pending_count": self._unfinished},
+            )
+            return False
+        return True
+
+    def _drop(self) -> None:
+        self.dropped += 1
+        logger.warning(
+            "Dropped a batch from the full export queue.",
+            extra={
+                "overflow_policy": self.settings.overflow_policy.value,
+                "dropped_count": self.dropped,
+            },
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                _ = self._condition.wait_for(lambda: self._closed or self._items)
+                if not self._items:
+                    return
+                item = self._items.popleft()
+                self._condition.notify_all()
+
+            try:
+                _ = self._process(item)
+            except Exception:
+                logger.exception("Failed processing a queued batch.")
+            finally:
+                with self._condition:
+                    self._unfinished -= 1
+                    self._condition.notify_all()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Callable, NamedTuple
+
+# throttling responses within this many seconds decrease the rate only once,
+# they are usually caused by the same burst
+DECREASE_INTERVAL_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class RateLimitSettings:
+    """A token bucket for the PostMetricData requests of all exporters in the process.
+
+    Requests are admitted at up to ``rate`` per second, in bursts of up to
+    ``burst``. A throttling response multiplies the rate by ``decrease_factor``,
+    down to ``min_rate``, and every accepted request adds ``increase`` until
+    ``rate`` is reached again. Requests that have to wait sleep up to a random
+    fraction of ``jitter`` longer, which spreads out exporters that fire at the
+    same moment. All exporters with the same ``key`` share one bucket, use
+    different keys for exporters that post to different tenancies.
+    """
+
+    rate: float = 10.0
+    burst: int = 10
+    min_rate: float = 1.0
+    increase: float = 0.5
+    decrease_factor: float = 0.5
+    jitter: float = 0.2
+    random: Callable[[], float] = field(
+        default=random.random, repr=False, compare=False
+    )
+    key: str = "default"
+
+    def __post_init__(self) -> None:
+        if self.burst < 1:
+            msg = "burst must be at least 1"
+            raise ValueError(msg)
+        if not 0 < self.min_rate <= self.rate:
+            msg = "min_rate must be positive and at most rate"
+            raise ValueError(msg)
+        if self.increase < 0:
+            msg = "increase must not be negative"
+            raise ValueError(msg)
+        if not 0 < self.decrease_factor < 1:
+            msg = "decrease_factor must be between 0 and 1"
+            raise ValueError(msg)
+        if not 0 <= self.jitter <= 1:
+            msg = "jitter must be between 0 and 1"
+            raise ValueError(msg)
+
+
+class RateLimitInfo(NamedTuple):
+    rate: float
+    throttled_responses: int
+    delayed_requests: int
+
+
+class RateLimiter:
+    """A thread-safe token bucket whose rate adapts to throttling (AIMD)."""
+
+    def __init__(
+        self,
+        settings: RateLimitSettings,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self.settings = settings
+        self.throttled_responses = 0
+        self.delayed_requests = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rate = settings.rate
+        self._tokens = float(settings.burst)
+        self._updated = clock()
+        self._last_decrease = float("-inf")
+
+    def reserve(self, deadline: float | None = None) -> float | None:
+        """Take a token and return how many seconds to wait before using it.
+
+        Returns None without taking a token if the wait would end after the
+        ``deadline``, a value of the clock.
+        """
+        settings = self.settings
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            wait = max(0.0, (1 - self._tokens) / self._rate)
+            if wait > 0:
+                wait *= 1 + settings.jitter * settings.random()
+            if deadline is not None and now + wait > deadline:
+                return None
+            self._tokens -= 1
+            if wait > 0:
+                self.delayed_requests += 1
+            return wait
+
+    def acquire(self, deadline: float | None = None) -> bool:
+        """Wait for a token, return False if there is none before the deadline."""
+        wait = self.reserve(deadline)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, deadline: float | None = None) -> bool:
+        wait = self.reserve(deadline)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def record(self, status: int) -> None:
+        """Adapt the rate to the HTTP status of a response."""
+        settings = self.settings
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if status == HTTPStatus.TOO_MANY_REQUESTS:
+                self.throttled_responses += 1
+                # the rest of the burst would be throttled as well
+                self._tokens = min(self._tokens, 0.0)
+                if now - self._last_decrease >= DECREASE_INTERVAL_SECONDS:
+                    self._last_decrease = now
+                    self._rate = max(
+                        settings.min_rate, self._rate * settings.decrease_factor
+                    )
+            elif HTTPStatus.OK <= status < HTTPStatus.MULTIPLE_CHOICES:
+                self._rate = min(settings.rate, self._rate + settings.increase)
+
+    def info(self) -> RateLimitInfo:
+        with self._lock:
+            return RateLimitInfo(
+                rate=self._rate,
+                throttled_responses=self.throttled_responses,
+                delayed_requests=self.delayed_requests,
+            )
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            float(self.settings.burst),
+            self._tokens + (now - self._updated) * self._rate,
+        )
+        self._updated = now
+
+
+_shared_limiters: dict[str, RateLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(settings: RateLimitSettings, /) -> RateLimiter:
+    """Return the process-wide limiter of the settings' key, creating it on first use.
+
+    Raises:
+        ValueError: If the limiter of the key was created with other settings.
+    """
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(settings.key)
+        if limiter is None:
+            limiter = _shared_limiters[settings.key] = RateLimiter(settings)
+        elif limiter.settings != settings:
+            msg = (
+                f"the rate limiter {settings.key!r} is shared with other settings "
+                f"({limiter.settings}), use equal settings or another key"
+            )
+            raise ValueError(msg)
+        return limiter
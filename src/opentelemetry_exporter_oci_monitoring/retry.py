@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Callable, Mapping
+
+if TYPE_CHECKING:
+    from oci.exceptions import ServiceError
+    from typing_extensions import TypeGuard
+
+RETRYABLE_STATUSES = frozenset(
+    {
+        HTTPStatus.REQUEST_TIMEOUT,
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how long to wait before posting a batch again.
+
+    The n-th retry waits ``initial_backoff_millis * multiplier ** (n - 1)``,
+    capped at ``max_backoff_millis`` and reduced by a random fraction of up to
+    ``jitter``. A Retry-After header sent by the service extends the wait. No
+    retry is started if the wait would end after the deadline of the export.
+    """
+
+    max_attempts: int = 5
+    initial_backoff_millis: float = 250
+    max_backoff_millis: float = 10_000
+    multiplier: float = 2.0
+    jitter: float = 0.5
+    retryable_statuses: frozenset[int] = RETRYABLE_STATUSES
+    random: Callable[[], float] = field(
+        default=random.random, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            msg = "max_attempts must be at least 1"
+            raise ValueError(msg)
+        if not 0 <= self.initial_backoff_millis <= self.max_backoff_millis:
+            msg = "initial_backoff_millis must be between 0 and max_backoff_millis"
+            raise ValueError(msg)
+        if self.multiplier < 1:
+            msg = "multiplier must be at least 1"
+            raise ValueError(msg)
+        if not 0 <= self.jitter <= 1:
+            msg = "jitter must be between 0 and 1"
+            raise ValueError(msg)
+
+    def is_retryable(self, error: Exception, /) -> bool:
+        return is_retryable(error, self.retryable_statuses)
+
+    def backoff_millis(self, retry: int, /) -> float:
+        backoff = min(
+            self.initial_backoff_millis * self.multiplier ** (retry - 1),
+            self.max_backoff_millis,
+        )
+        return backoff * (1 - self.jitter * self.random())
+
+    def delay_millis(
+        self,
+        attempt: int,
+        /,
+        deadline: float | None = None,
+        retry_after_millis: float | None = None,
+    ) -> float | None:
+        """Return how long to wait before the next attempt, or None to give up.
+
+        ``attempt`` is the number of attempts made so far and ``deadline`` a
+        ``time.monotonic()`` value.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.backoff_millis(attempt)
+        if retry_after_millis is not None:
+            delay = max(delay, retry_after_millis)
+        if deadline is not None and time.monotonic() + delay / 1e3 >= deadline:
+            return None
+        return delay
+
+
+def is_retryable(
+    error: Exception, /, retryable_statuses: frozenset[int] = RETRYABLE_STATUSES
+) -> bool:
+    """Return whether posting again may succeed after the given error."""
+    if _is_service_error(error):
+        return error.status in retryable_statuses
+    # connection errors and timeouts of the SDK's HTTP client are OSErrors
+    return isinstance(error, (OSError, asyncio.TimeoutError))
+
+
+def retry_after_millis(error: Exception, /) -> float | None:
+    """Return the wait requested by the Retry-After header of a service error."""
+    if not _is_service_error(error):
+        return None
+    return parse_retry_after(error.headers)
+
+
+def _is_service_error(error: Exception) -> TypeGuard[ServiceError]:
+    # a ServiceError can only have been raised once oci is imported, so there
+    # is no need to import it here
+    exceptions = sys.modules.get("oci.exceptions")
+    return exceptions is not None and isinstance(error, exceptions.ServiceError)
+
+
+def parse_retry_after(headers: Mapping[str, str] | None, /) -> float | None:
+    value = None
+    for name, header in (headers or {}).items():
+        if name.lower() == "retry-after":
+            value = header.strip()
+    if not value:
+        return None
+
+    if value.isdigit():
+        return int(value) * 1e3
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds() * 1e3, 0.0)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import inspect
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+
+from opentelemetry_exporter_oci_monitoring.cache import LRUCache
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.resources import Resource
+
+RouteSource = Literal["resource", "scope", "datapoint"]
+ROUTE_SOURCES: tuple[RouteSource, ...] = ("resource", "scope", "datapoint")
+
+# scopes have attributes since opentelemetry-sdk 1.27
+_SCOPE_HAS_ATTRIBUTES = (
+    "attributes" in inspect.signature(InstrumentationScope).parameters
+)
+
+
+class Route(NamedTuple):
+    namespace: str
+    resource_group: str
+    compartment_id: str
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """Routes the metrics whose attribute ``key`` has one of the values in ``routes``.
+
+    ``source`` selects whether the attributes of the resource, of the
+    instrumentation scope or of the data points are matched. Only string
+    attribute values match. Scopes have attributes since opentelemetry-sdk
+    1.27, older versions reject scope rules.
+    """
+
+    key: str
+    routes: Mapping[str, Route]
+    source: RouteSource = "resource"
+
+    def __post_init__(self) -> None:
+        if not self.key:
+            msg = "key must not be empty"
+            raise ValueError(msg)
+        if not self.routes:
+            msg = "routes must not be empty"
+            raise ValueError(msg)
+        if self.source not in ROUTE_SOURCES:
+            msg = f"source must be one of {', '.join(ROUTE_SOURCES)}"
+            raise ValueError(msg)
+        if self.source == "scope" and not _SCOPE_HAS_ATTRIBUTES:
+            msg = "scope rules require opentelemetry-sdk 1.27 or later"
+            raise ValueError(msg)
+
+
+@dataclass(frozen=True)
+class RoutingSettings:
+    """Rules that choose the namespace, resource group and compartment of a stream.
+
+    The first matching rule wins, metrics that no rule matches keep the route of
+    the converter. The decisions for at most ``cache_size`` pairs of resource and
+    scope are cached.
+    """
+
+    rules: Sequence[RoutingRule]
+    cache_size: int = 1024
+
+    def __post_init__(self) -> None:
+        if not self.rules:
+            msg = "rules must not be empty"
+            raise ValueError(msg)
+        if self.cache_size < 1:
+            msg = "cache_size must be at least 1"
+            raise ValueError(msg)
+
+
+DatapointRouter = Callable[[Optional[Mapping[str, Any]]], Route]
+
+
+class Router:
+    """Resolves the routing rules once per resource and scope."""
+
+    def __init__(self, settings: RoutingSettings, default: Route) -> None:
+        super().__init__()
+        self.settings = settings
+        self.default = default
+        self._rules = [
+            (rule.source, rule.key, dict(rule.routes)) for rule in settings.rules
+        ]
+        self._cache: LRUCache[
+            tuple[int, int], tuple[Resource, InstrumentationScope, DatapointRouter]
+        ] = LRUCache(settings.cache_size)
+
+    def resolve(
+        self, resource: Resource, scope: InstrumentationScope
+    ) -> DatapointRouter:
+        """Return the function that routes the data points of the resource and scope.
+
+        The result is cached per resource and scope object. Cache entries keep a
+        reference to both objects, so their ids cannot be reused while cached.
+        """
+        key = (id(resource), id(scope))
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached[2]
+        route_datapoint = self._compile(resource, scope)
+        self._cache.put(key, (resource, scope, route_datapoint))
+        return route_datapoint
+
+    def _compile(
+        self, resource: Resource, scope: InstrumentationScope
+    ) -> DatapointRouter:
+        # the data point rules that precede the first matching static rule
+        datapoint_rules: list[tuple[str, dict[str, Route]]] = []
+        route = self.default
+        for source, key, routes in self._rules:
+            if source == "datapoint":
+                datapoint_rules.append((key, routes))
+                continue
+            attributes: Mapping[str, Any] | None = (
+                resource.attributes if source == "resource" else scope.attributes
+            )
+            matched = _match(attributes, key, routes)
+            if matched is not None:
+                route = matched
+                break
+
+        if not datapoint_rules:
+            return lambda _: route
+
+        def route_datapoint(attributes: Mapping[str, Any] | None) -> Route:
+            if attributes:
+                for key, routes in datapoint_rules:
+                    matched = _match(attributes, key, routes)
+                    if matched is not None:
+                        return matched
+            return route
+
+        return route_datapoint
+
+
+def _match(
+    attributes: Mapping[str, Any] | None, key: str, routes: Mapping[str, Route]
+) -> Route | None:
+    if not attributes:
+        return None
+    value = attributes.get(key)
+    return routes.get(value) if isinstance(value, str) else None
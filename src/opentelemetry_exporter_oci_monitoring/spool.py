@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import mmap
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from datetime import timedelta
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, NamedTuple, Union
+
+if TYPE_CHECKING:
+    import os
+
+logger = getLogger(__name__)
+
+StrPath = Union[str, "os.PathLike[str]"]
+
+# timestamp in nanoseconds, payload length and CRC32 of the payload
+RECORD_HEADER = struct.Struct("<QII")
+SEGMENT_SUFFIX = ".spool"
+
+
+@dataclass(frozen=True)
+class SpoolSettings:
+    """Settings of the on-disk spool for payloads that could not be posted.
+
+    The spool never grows beyond ``max_bytes`` and discards payloads older than
+    ``max_age``, oldest first. At most ``replay_limit`` spooled payloads are
+    posted per export, after the live batches succeeded.
+    """
+
+    directory: StrPath
+    max_bytes: int = 256 * 2**20
+    max_age: timedelta = timedelta(hours=6)
+    segment_bytes: int = 8 * 2**20
+    replay_limit: int = 8
+
+    def __post_init__(self) -> None:
+        if self.segment_bytes < RECORD_HEADER.size:
+            msg = "segment_bytes is too small to hold a record"
+            raise ValueError(msg)
+        if self.max_bytes < self.segment_bytes:
+            msg = "max_bytes must be at least segment_bytes"
+            raise ValueError(msg)
+        if self.max_age <= timedelta():
+            msg = "max_age must be positive"
+            raise ValueError(msg)
+        if self.replay_limit < 1:
+            msg = "replay_limit must be at least 1"
+            raise ValueError(msg)
+
+
+class SpooledPayload(NamedTuple):
+    time_unix_nano: int
+    payload: bytes
+
+
+class DiskSpool:
+    """An append-only queue of payloads stored in segment files.
+
+    Payloads are appended to the newest segment and read from the oldest one
+    through a memory map, so they come out in the order they were spooled.
+    Fully read segments are deleted. Opening a spool only lists the segment
+    files, so it is fast regardless of the size of the backlog.
+
+    Delivery is at least once: the read position within the oldest segment is
+    kept in memory only, so payloads read before a restart but not yet deleted
+    are read again.
+    """
+
+    def __init__(self, settings: SpoolSettings) -> None:
+        super().__init__()
+        self.settings = settings
+        self.directory = Path(settings.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._segments: deque[Path] = deque(
+            sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+        )
+        self._size = sum(path.stat().st_size for path in self._segments)
+        self._writer: BinaryIO | None = None
+        self._writer_size = 0
+        self._reader: mmap.mmap | None = None
+        self._read_offset = 0
+        self._next_offset = 0
+
+    @property
+    def size(self) -> int:
+        """The number of bytes the spool occupies on disk."""
+        return self._size
+
+    def __bool__(self) -> bool:
+        return bool(self._segments)
+
+    def append(self, payload: bytes, time_unix_nano: int | None = None) -> None:
+        if time_unix_nano is None:
+            time_unix_nano = time.time_ns()
+        record = (
+            RECORD_HEADER.pack(time_unix_nano, len(payload), zlib.crc32(payload))
+            + payload
+        )
+        if len(record) > self.settings.max_bytes:
+            logger.warning(
+                "Payload exceeds the spool size.", extra={"size": len(record)}
+            )
+            return
+
+        with self._lock:
+            if (
+                self._writer is None
+                or self._writer_size + len(record) > self.settings.segment_bytes
+            ):
+                self._open_segment(time_unix_nano)
+            assert self._writer is not None  # noqa: S101
+            _ = self._writer.write(record)
+            self._writer.flush()
+            self._writer_size += len(record)
+            self._size += len(record)
+
+            while self._size > self.settings.max_bytes and len(self._segments) > 1:
+                logger.warning(
+                    "Discarding spooled payloads to stay within max_bytes.",
+                    extra={"segment": self._segments[0].name},
+                )
+                self._remove_oldest()
+            self._remove_expired()
+
+    def peek(self) -> SpooledPayload | None:
+        """Return the oldest spooled payload that is not expired."""
+        with self._lock:
+            max_age_nanos = self.settings.max_age // timedelta(microseconds=1) * 1_000
+            min_time_unix_nano = time.time_ns() - max_age_nanos
+            self._remove_expired()
+            while self._segments:
+                record = self._read_record()
+                if record is None:
+                    self._remove_oldest()
+                    continue
+                if record.time_unix_nano < min_time_unix_nano:
+                    self._read_offset = self._next_offset
+                    continue
+                return record
+            return None
+
+    def pop(self) -> None:
+        """Discard the payload returned by the last peek."""
+        with self._lock:
+            self._read_offset = self._next_offset
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_reader()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def _open_segment(self, time_unix_nano: int) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        path = self.directory / f"{time_unix_nano:020d}{SEGMENT_SUFFIX}"
+        while path.exists() or (self._segments and path <= self._segments[-1]):
+            time_unix_nano += 1
+            path = self.directory / f"{time_unix_nano:020d}{SEGMENT_SUFFIX}"
+        self._writer = path.open("xb")
+        self._writer_size = 0
+        self._segments.append(path)
+
+    def _read_record(self) -> SpooledPayload | None:
+        if self._reader is None:
+            path = self._segments[0]
+            if len(self._segments) == 1 and self._writer is not None:
+                # map the newest segment only once it is complete
+                self._writer.close()
+                self._writer = None
+            size = path.stat().st_size
+            if size == 0:
+                return None
+            with path.open("rb") as file:
+                self._reader = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+
+        reader = self._reader
+        offset = self._read_offset
+        end = offset + RECORD_HEADER.size
+        if end > len(reader):
+            return None
+        time_unix_nano, length, checksum = RECORD_HEADER.unpack_from(reader, offset)
+        payload = reader[end : end + length]
+        if len(payload) != length or zlib.crc32(payload) != checksum:
+            # a torn write at the end of a segment
+            logger.warning(
+                "Discarding a corrupt spool record.",
+                extra={"segment": self._segments[0].name, "offset": offset},
+            )
+            return None
+        self._next_offset = end + length
+        return SpooledPayload(time_unix_nano, payload)
+
+    def _remove_expired(self) -> None:
+        # a segment last written before max_age only holds expired payloads
+        min_mtime = time.time() - self.settings.max_age.total_seconds()
+        while len(self._segments) > 1 and self._segments[0].stat().st_mtime < min_mtime:
+            self._remove_oldest()
+
+    def _remove_oldest(self) -> None:
+        path = self._segments.popleft()
+        self._close_reader()
+        self._size -= path.stat().st_size
+        path.unlink()
+
+    def _close_reader(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        self._read_offset = self._next_offset = 0
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Hashable, NamedTuple, Sequence
+
+from opentelemetry_exporter_oci_monitoring.aggregation import AggregationKind
+from opentelemetry_exporter_oci_monitoring.cache import LRUCache
+
+
+@dataclass(frozen=True)
+class SuppressionSettings:
+    """Which datapoints of idle streams are left out of the export.
+
+    Delta sums with a value of 0 and gauges or cumulative sums whose value did
+    not change since it was last exported are suppressed, unless the stream
+    has not been exported for ``heartbeat``. The state of at most
+    ``max_streams`` streams is kept, the least recently seen is forgotten
+    first and exported in full when it reappears. When an export fails, the
+    state of its streams is rolled back, so nothing it carried is suppressed
+    in the next export.
+    """
+
+    heartbeat: timedelta = timedelta(minutes=5)
+    max_streams: int = 100_000
+
+    def __post_init__(self) -> None:
+        if self.heartbeat <= timedelta():
+            msg = "heartbeat must be positive"
+            raise ValueError(msg)
+        if self.max_streams < 1:
+            msg = "max_streams must be at least 1"
+            raise ValueError(msg)
+
+
+class SuppressionInfo(NamedTuple):
+    suppressed_streams: int
+    suppressed_datapoints: int
+    tracked_streams: int
+
+
+class _LastExport(NamedTuple):
+    time_unix_nano: int
+    value: float
+
+
+class StreamSuppressor:
+    """Remembers the last exported datapoint of each stream across exports.
+
+    The state changed since the last ``checkpoint`` can be restored with
+    ``rollback``.
+    """
+
+    def __init__(self, settings: SuppressionSettings) -> None:
+        super().__init__()
+        self.settings = settings
+        self.suppressed_streams = 0
+        self.suppressed_datapoints = 0
+        self._heartbeat_nanos = settings.heartbeat // timedelta(microseconds=1) * 1_000
+        self._streams: LRUCache[Hashable, _LastExport] = LRUCache(settings.max_streams)
+        self._previous: dict[Hashable, _LastExport | None] = {}
+
+    def select(
+        self,
+        key: Hashable,
+        timestamps: Sequence[int],
+        values: Sequence[float],
+        kind: AggregationKind,
+    ) -> list[bool] | None:
+        """Return which datapoints to export, or None to export all of them."""
+        if kind is AggregationKind.DISTRIBUTION:
+            return None
+
+        last = previous = self._streams.get(key)
+        selectors: list[bool] = []
+        for timestamp, value in zip(timestamps, values):
+            keep = (
+                last is None
+                or timestamp - last.time_unix_nano >= self._heartbeat_nanos
+                or (value != 0 if kind is AggregationKind.SUM else value != last.value)
+            )
+            if keep:
+                last = _LastExport(timestamp, value)
+            selectors.append(keep)
+        if last is not None:
+            if last is not previous:
+                _ = self._previous.setdefault(key, previous)
+            self._streams.put(key, last)
+
+        suppressed = selectors.count(False)
+        if not suppressed:
+            return None
+        self.suppressed_datapoints += suppressed
+        if suppressed == len(selectors):
+            self.suppressed_streams += 1
+        return selectors
+
+    def checkpoint(self) -> None:
+        """Keep the current state, a later rollback restores it."""
+        self._previous.clear()
+
+    def rollback(self) -> None:
+        """Restore the state of the streams selected since the last checkpoint."""
+        for key, last in self._previous.items():
+            if last is None:
+                _ = self._streams.pop(key)
+            else:
+                self._streams.put(key, last)
+        self._previous.clear()
+
+    def info(self) -> SuppressionInfo:
+        return SuppressionInfo(
+            suppressed_streams=self.suppressed_streams,
+            suppressed_datapoints=self.suppressed_datapoints,
+            tracked_streams=len(self._streams),
+        )
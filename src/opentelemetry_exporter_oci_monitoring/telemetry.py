@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import inspect
+from typing import TYPE_CHECKING, Sequence
+
+from opentelemetry.metrics import Meter
+
+from opentelemetry_exporter_oci_monitoring.batching import datapoints_count
+from opentelemetry_exporter_oci_monitoring.encoding import encode_post_metric_data
+
+if TYPE_CHECKING:
+    from oci.monitoring.models import PostMetricDataDetails
+    from opentelemetry.metrics import Histogram, MeterProvider
+    from opentelemetry.util.types import Attributes
+
+    from opentelemetry_exporter_oci_monitoring.converter import ConvertedMetric
+
+METER_NAME = "opentelemetry_exporter_oci_monitoring"
+
+STATUS_CODE_ATTRIBUTE = "http.response.status_code"
+ERROR_TYPE_ATTRIBUTE = "error.type"
+
+# status codes answered by the PostMetricData API
+_KNOWN_STATUS_CODES = (200, 400, 401, 404, 408, 413, 429, 500, 502, 503, 504)
+
+_DURATION_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+_COUNT_BUCKETS = (1, 10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000)
+_BYTES_BUCKETS = (1_024, 8_192, 32_768, 65_536, 131_072, 262_144, 524_288, 1_048_576)
+
+# bucket boundary advice is supported since opentelemetry-api 1.27
+_HAS_BOUNDARIES_ADVISORY = (
+    "explicit_bucket_boundaries_advisory"
+    in inspect.signature(Meter.create_histogram).parameters
+)
+
+
+def _create_histogram(
+    meter: Meter, name: str, unit: str, description: str, buckets: Sequence[float]
+) -> Histogram:
+    if _HAS_BOUNDARIES_ADVISORY:
+        return meter.create_histogram(
+            name,
+            unit=unit,
+            description=description,
+            explicit_bucket_boundaries_advisory=buckets,
+        )
+    return meter.create_histogram(name, unit=unit, description=description)
+
+
+class ExporterTelemetry:
+    """Instruments describing the exporter itself.
+
+    The meter provider must not export through the instrumented exporter, or
+    every export would record metrics that feed the next one.
+    """
+
+    def __init__(self, meter_provider: MeterProvider) -> None:
+        super().__init__()
+        meter = meter_provider.get_meter(METER_NAME)
+        self.convert_duration = _create_histogram(
+            meter,
+            "oci_monitoring.exporter.convert.duration",
+            "s",
+            "Time spent converting and batching one export.",
+            _DURATION_BUCKETS,
+        )
+        self.streams = _create_histogram(
+            meter,
+            "oci_monitoring.exporter.export.streams",
+            "{stream}",
+            "Metric streams converted per export.",
+            _COUNT_BUCKETS,
+        )
+        self.datapoints = _create_histogram(
+            meter,
+            "oci_monitoring.exporter.export.datapoints",
+            "{datapoint}",
+            "Datapoints converted per export.",
+            _COUNT_BUCKETS,
+        )
+        self.request_body_size = _create_histogram(
+            meter,
+            "oci_monitoring.exporter.request.body.size",
+            "By",
+            "Size of the encoded PostMetricData request bodies.",
+            _BYTES_BUCKETS,
+        )
+        self.request_duration = _create_histogram(
+            meter,
+            "oci_monitoring.exporter.request.duration",
+            "s",
+            "Latency of the PostMetricData requests.",
+            _DURATION_BUCKETS,
+        )
+        self.requests = meter.create_counter(
+            "oci_monitoring.exporter.requests",
+            unit="{request}",
+            description="PostMetricData requests by response status code.",
+        )
+        self.failed_metrics = meter.create_counter(
+            "oci_monitoring.exporter.failed_metrics",
+            unit="{metric}",
+            description="Metrics the service reported as failed.",
+        )
+        self._status_attributes: dict[int, Attributes] = {
+            status: {STATUS_CODE_ATTRIBUTE: status} for status in _KNOWN_STATUS_CODES
+        }
+        self._error_attributes: dict[str, Attributes] = {}
+
+    def record_conversion(
+        self, duration: float, batches: Sequence[Sequence[ConvertedMetric]]
+    ) -> None:
+        self.convert_duration.record(duration)
+        self.streams.record(sum(len(batch) for batch in batches))
+        self.datapoints.record(
+            sum(datapoints_count(metric) for batch in batches for metric in batch)
+        )
+
+    def record_request(
+        self,
+        duration: float,
+        body: PostMetricDataDetails | bytes,
+        status: int | None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record one attempt to post a request body.
+
+        Model bodies are measured by encoding them the way the OCI SDK serializes
+        them. ``status`` is None when no response was received.
+        """
+        attributes = (
+            self.status_attributes(status)
+            if status is not None
+            else self.error_attributes(error)
+        )
+        self.request_duration.record(duration, attributes)
+        self.requests.add(1, attributes)
+        if not isinstance(body, bytes):
+            body = encode_post_metric_data(body.metric_data, body.batch_atomicity)
+        self.request_body_size.record(len(body))
+
+    def record_failed_metrics(self, count: int) -> None:
+        if count > 0:
+            self.failed_metrics.add(count)
+
+    def status_attributes(self, status: int) -> Attributes:
+        attributes = self._status_attributes.get(status)
+        if attributes is None:
+            attributes = self._status_attributes[status] = {
+                STATUS_CODE_ATTRIBUTE: status
+            }
+        return attributes
+
+    def error_attributes(self, error: BaseException | None) -> Attributes:
+        error_type = "unknown" if error is None else type(error).__qualname__
+        attributes = self._error_attributes.get(error_type)
+        if attributes is None:
+            attributes = self._error_attributes[error_type] = {
+                ERROR_TYPE_ATTRIBUTE: error_type
+            }
+        return attributes
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from typing import TYPE_CHECKING, Dict, Hashable, Union
+
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    Buckets,
+    ExponentialHistogram,
+    ExponentialHistogramDataPoint,
+    Histogram,
+    HistogramDataPoint,
+    Metric,
+    MetricsData,
+    NumberDataPoint,
+    ResourceMetrics,
+    ScopeMetrics,
+    Sum,
+)
+
+from opentelemetry_exporter_oci_monitoring.cache import LRUCache
+from opentelemetry_exporter_oci_monitoring.converter import attributes_key
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+
+CumulativeDataPoint = Union[
+    NumberDataPoint, HistogramDataPoint, ExponentialHistogramDataPoint
+]
+_BucketCounts = Dict[int, int]
+
+
+class CumulativeToDelta:
+    """Turns cumulative sums and histograms into deltas across exports.
+
+    The last data point of every stream is remembered. Streams are told apart
+    by resource, scope, metric, attributes and start time, so the streams of
+    processes with equal resources are still converted separately. The first
+    data point of a stream that started before ``start_time_unix_nano`` only
+    sets the baseline, so a restart does not export the totals of every
+    process at once. The state of at most ``max_streams`` streams is kept.
+    """
+
+    def __init__(
+        self, max_streams: int = 100_000, start_time_unix_nano: int | None = None
+    ) -> None:
+        super().__init__()
+        self.start_time_unix_nano = (
+            time.time_ns() if start_time_unix_nano is None else start_time_unix_nano
+        )
+        self._streams: LRUCache[Hashable, CumulativeDataPoint] = LRUCache(max_streams)
+
+    def convert(self, metrics_data: MetricsData) -> MetricsData:
+        return MetricsData(
+            resource_metrics=[
+                replace(
+                    resource_metrics,
+                    scope_metrics=[
+                        self._convert_scope_metrics(resource_metrics, scope_metrics)
+                        for scope_metrics in resource_metrics.scope_metrics
+                    ],
+                )
+                for resource_metrics in metrics_data.resource_metrics
+            ]
+        )
+
+    def _convert_scope_metrics(
+        self, resource_metrics: ResourceMetrics, scope_metrics: ScopeMetrics
+    ) -> ScopeMetrics:
+        return replace(
+            scope_metrics,
+            metrics=[
+                self._convert_metric(
+                    resource_metrics.resource, scope_metrics.scope, metric
+                )
+                for metric in scope_metrics.metrics
+            ],
+        )
+
+    def _convert_metric(
+        self, resource: Resource, scope: InstrumentationScope, metric: Metric
+    ) -> Metric:
+        data = metric.data
+        if (
+            not isinstance(data, (Sum, Histogram, ExponentialHistogram))
+            or data.aggregation_temporality  # pyright: ignore[reportUnknownMemberType]
+            != AggregationTemporality.CUMULATIVE
+        ):
+            return metric
+
+        metric_key = (
+            attributes_key(resource.attributes),
+            scope.name,
+            scope.version,
+            metric.name,
+            type(data),
+        )
+        data_points: list[CumulativeDataPoint] = []
+        for data_point in data.data_points:
+            key = (
+                metric_key,
+                attributes_key(data_point.attributes or {}),
+                data_point.start_time_unix_nano,
+            )
+            previous = self._streams.get(key)
+            if previous is not None and (
+                data_point.time_unix_nano <= previous.time_unix_nano
+            ):
+                continue  # a duplicate or out of order
+            self._streams.put(key, data_point)
+            if previous is None:
+                if data_point.start_time_unix_nano >= self.start_time_unix_nano:
+                    data_points.append(data_point)
+                continue
+            delta = _delta(data_point, previous, is_monotonic=_is_monotonic(data))
+            if delta is not None:
+                data_points.append(delta)
+
+        return replace(
+            metric,
+            data=replace(
+                data,
+                data_points=data_points,
+                aggregation_temporality=AggregationTemporality.DELTA,
+            ),
+        )
+
+
+def _is_monotonic(data: Sum | Histogram | ExponentialHistogram) -> bool:
+    return data.is_monotonic if isinstance(data, Sum) else True
+
+
+def _delta(
+    current: CumulativeDataPoint, previous: CumulativeDataPoint, *, is_monotonic: bool
+) -> CumulativeDataPoint | None:
+    """Return the change since the previous data point.
+
+    If a monotonic stream decreased, it was reset and the current data point
+    is the delta. None is returned if the histogram buckets changed without a
+    reset, the current data point then only sets the new baseline.
+    """
+    if isinstance(current, NumberDataPoint) and isinstance(previous, NumberDataPoint):
+        if is_monotonic and current.value < previous.value:
+            return current
+        return replace(
+            current,
+            start_time_unix_nano=previous.time_unix_nano,
+            value=current.value - previous.value,
+        )
+    if isinstance(current, HistogramDataPoint) and isinstance(
+        previous, HistogramDataPoint
+    ):
+        return _histogram_delta(current, previous)
+    if isinstance(current, ExponentialHistogramDataPoint) and isinstance(
+        previous, ExponentialHistogramDataPoint
+    ):
+        return _exponential_histogram_delta(current, previous)
+    return None
+
+
+def _histogram_delta(
+    current: HistogramDataPoint, previous: HistogramDataPoint
+) -> HistogramDataPoint | None:
+    if current.count < previous.count:
+        return current
+    if list(current.explicit_bounds) != list(previous.explicit_bounds) or len(
+        current.bucket_counts
+    ) != len(previous.bucket_counts):
+        return None
+    # the min and max of the interval are unknown, the cumulative ones bound them
+    return replace(
+        current,
+        start_time_unix_nano=previous.time_unix_nano,
+        count=current.count - previous.count,
+        sum=current.sum - previous.sum,
+        bucket_counts=[
+            count - previous_count
+            for count, previous_count in zip(
+                current.bucket_counts, previous.bucket_counts
+            )
+        ],
+    )
+
+
+def _exponential_histogram_delta(
+    current: ExponentialHistogramDataPoint, previous: ExponentialHistogramDataPoint
+) -> ExponentialHistogramDataPoint | None:
+    if current.count < previous.count:
+        return current
+    # histograms only ever lower their scale, both are compared at the lower one
+    scale = min(current.scale, previous.scale)
+    positive = _subtract_buckets(
+        _downscale(current.positive, current.scale - scale),
+        _downscale(previous.positive, previous.scale - scale),
+    )
+    negative = _subtract_buckets(
+        _downscale(current.negative, current.scale - scale),
+        _downscale(previous.negative, previous.scale - scale),
+    )
+    if positive is None or negative is None:
+        return None
+    return replace(
+        current,
+        start_time_unix_nano=previous.time_unix_nano,
+        count=current.count - previous.count,
+        sum=current.sum - previous.sum,
+        scale=scale,
+        zero_count=current.zero_count - previous.zero_count,
+        positive=positive,
+        negative=negative,
+    )
+
+
+def _downscale(buckets: Buckets, shift: int) -> _BucketCounts:
+    counts: _BucketCounts = {}
+    for index, count in enumerate(buckets.bucket_counts, start=buckets.offset):
+        if count:
+            key = index >> shift
+            counts[key] = counts.get(key, 0) + count
+    return counts
+
+
+def _subtract_buckets(
+    current: _BucketCounts, previous: _BucketCounts
+) -> Buckets | None:
+    counts = {index: count - previous.get(index, 0) for index, count in current.items()}
+    if any(count < 0 for count in counts.values()) or not previous.keys() <= (
+        current.keys()
+    ):
+        return None
+    counts = {index: count for index, count in counts.items() if count}
+    if not counts:
+        return Buckets(offset=0, bucket_counts=[])
+    offset = min(counts)
+    return Buckets(
+        offset=offset,
+        bucket_counts=[
+            counts.get(index, 0) for index in range(offset, max(counts) + 1)
+        ],
+    )
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from enum import Enum
+from itertools import compress, islice
+from logging import getLogger
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    cast,
+)
+
+from opentelemetry_exporter_oci_monitoring.cache import LRUCache
+from opentelemetry_exporter_oci_monitoring.converter import UTC, MetricStream
+
+if TYPE_CHECKING:
+    from re import Pattern
+
+    from oci.monitoring.models import Datapoint
+
+    from opentelemetry_exporter_oci_monitoring.batching import T
+
+logger = getLogger(__name__)
+
+# characters the PostMetricData API accepts in metric names and dimension keys
+INVALID_NAME_CHARACTERS = re.compile(r"[^A-Za-z0-9._\-$]")
+INVALID_DIMENSION_KEY_CHARACTERS = re.compile(r"[^!-~]")
+REPLACEMENT_CHARACTER = "_"
+# metric names must start with a letter, others get this prefix when sanitized
+NAME_START = re.compile(r"[A-Za-z]")
+NAME_PREFIX = "metric_"
+
+
+class ValidationPolicy(Enum):
+    """How names and dimensions that the ingestion API would reject are handled.
+
+    SANITIZE replaces invalid characters, prefixes metric names that do not
+    start with a letter, truncates over-long strings and removes dimensions
+    with empty keys or values. TRUNCATE only truncates over-long strings and
+    drops streams with any other violation. DROP drops every stream with a
+    violation. With every policy, datapoints outside of the accepted time
+    window are dropped.
+    """
+
+    SANITIZE = "sanitize"
+    TRUNCATE = "truncate"
+    DROP = "drop"
+
+
+@dataclass(frozen=True)
+class ValidationRules:
+    """The constraints of the PostMetricData API that are checked before posting."""
+
+    policy: ValidationPolicy = ValidationPolicy.SANITIZE
+    max_name_length: int = 255
+    max_dimensions: int = 20
+    max_dimension_key_length: int = 256
+    max_dimension_value_length: int = 512
+    max_metadata_value_length: int = 256
+    max_past: timedelta = timedelta(hours=2)
+    max_future: timedelta = timedelta(minutes=10)
+    cache_size: int = 4096
+
+    def __post_init__(self) -> None:
+        for name in (
+            "max_name_length",
+            "max_dimensions",
+            "max_dimension_key_length",
+            "max_dimension_value_length",
+            "max_metadata_value_length",
+            "cache_size",
+        ):
+            if getattr(self, name) < 1:
+                msg = f"{name} must be at least 1"
+                raise ValueError(msg)
+        if self.max_past < timedelta() or self.max_future < timedelta():
+            msg = "max_past and max_future must not be negative"
+            raise ValueError(msg)
+
+
+class ValidationInfo(NamedTuple):
+    modified_streams: int
+    dropped_streams: int
+    dropped_datapoints: int
+
+
+class MetricValidator:
+    """Checks converted metrics against the rules before they are batched.
+
+    The outcome for each metric name and dimension key is memoized, so valid
+    streams cost a few dictionary lookups and are passed on unchanged.
+    """
+
+    def __init__(
+        self, rules: ValidationRules, clock: Callable[[], float] = time.time
+    ) -> None:
+        super().__init__()
+        self.rules = rules
+        self.modified_streams = 0
+        self.dropped_streams = 0
+        self.dropped_datapoints = 0
+        self._clock = clock
+        # an empty string marks a name or key that cannot be used
+        self._names: LRUCache[str, str] = LRUCache(rules.cache_size)
+        self._dimension_keys: LRUCache[str, str] = LRUCache(rules.cache_size)
+
+    def validate_all(self, metric_data: Iterable[T], /) -> Iterator[T]:
+        now = self._clock()
+        dropped_streams = self.dropped_streams
+        for metric in metric_data:
+            valid = self.validate(metric, now)
+            if valid is not None:
+                yield valid
+
+        if self.dropped_streams > dropped_streams:
+            logger.warning(
+                "Dropped invalid metric streams.",
+                extra={"dropped_streams": self.dropped_streams - dropped_streams},
+            )
+
+    def validate(self, metric_data: T, /, now: float | None = None) -> T | None:
+        """Return the metric, a corrected copy of it, or None to drop it."""
+        name = self._name(metric_data.name)
+        dimensions = self._dimensions(metric_data.dimensions) if name else None
+        metadata = (
+            self._metadata(metric_data.metadata) if dimensions is not None else None
+        )
+        if dimensions is None or metadata is None:
+            self.dropped_streams += 1
+            return None
+
+        if (
+            name != metric_data.name
+            or dimensions is not metric_data.dimensions
+            or metadata is not (metric_data.metadata or _NO_METADATA)
+        ):
+            self.modified_streams += 1
+            metric_data = _copy(
+                metric_data, name=name, dimensions=dimensions, metadata=metadata
+            )
+
+        valid = self._within_time_window(
+            metric_data, self._clock() if now is None else now
+        )
+        if valid is None:
+            self.dropped_streams += 1
+        return valid
+
+    def info(self) -> ValidationInfo:
+        return ValidationInfo(
+            modified_streams=self.modified_streams,
+            dropped_streams=self.dropped_streams,
+            dropped_datapoints=self.dropped_datapoints,
+        )
+
+    def _name(self, name: str) -> str:
+        valid = self._names.get(name)
+        if valid is None:
+            rules = self.rules
+            valid = self._normalize(
+                name, INVALID_NAME_CHARACTERS, rules.max_name_length
+            )
+            if valid and NAME_START.match(valid) is None:
+                valid = (
+                    (NAME_PREFIX + valid)[: rules.max_name_length]
+                    if rules.policy is ValidationPolicy.SANITIZE
+                    else ""
+                )
+            self._names.put(name, valid)
+        return valid
+
+    def _dimension_key(self, key: str) -> str:
+        valid = self._dimension_keys.get(key)
+        if valid is None:
+            valid = self._normalize(
+                key,
+                INVALID_DIMENSION_KEY_CHARACTERS,
+                self.rules.max_dimension_key_length,
+            )
+            self._dimension_keys.put(key, valid)
+        return valid
+
+    def _normalize(self, value: str, invalid: Pattern[str], max_length: int) -> str:
+        policy = self.rules.policy
+        normalized = value
+        if invalid.search(normalized) is not None:
+            if policy is not ValidationPolicy.SANITIZE:
+                return ""
+            normalized = invalid.sub(REPLACEMENT_CHARACTER, normalized)
+        if len(normalized) > max_length:
+            if policy is ValidationPolicy.DROP:
+                return ""
+            normalized = normalized[:max_length]
+        return normalized
+
+    def _dimensions(self, dimensions: Mapping[str, str]) -> Mapping[str, str] | None:
+        rules = self.rules
+        sanitize = rules.policy is ValidationPolicy.SANITIZE
+        max_value_length = rules.max_dimension_value_length
+        changed = False
+        valid: dict[str, str] = {}
+        for key, value in dimensions.items():
+            valid_key = self._dimension_key(key)
+            if not valid_key or not value:
+                if not sanitize:
+                    return None
+                changed = True
+                continue
+            if len(value) > max_value_length:
+                if rules.policy is ValidationPolicy.DROP:
+                    return None
+                value = value[:max_value_length]  # noqa: PLW2901
+                changed = True
+            changed = changed or valid_key != key
+            valid[valid_key] = value
+
+        if len(valid) > rules.max_dimensions:
+            if rules.policy is ValidationPolicy.DROP:
+                return None
+            valid = dict(islice(valid.items(), rules.max_dimensions))
+            changed = True
+        return valid if changed else dimensions
+
+    def _metadata(self, metadata: Mapping[str, str] | None) -> Mapping[str, str] | None:
+        """Return the metadata with values of the accepted length, None to drop."""
+        max_length = self.rules.max_metadata_value_length
+        if not metadata:
+            return _NO_METADATA
+        if all(len(value) <= max_length for value in metadata.values()):
+            return metadata
+        if self.rules.policy is ValidationPolicy.DROP:
+            return None
+        return {key: value[:max_length] for key, value in metadata.items()}
+
+    def _within_time_window(self, metric_data: T, now: float) -> T | None:
+        rules = self.rules
+        if isinstance(metric_data, MetricStream):
+            timestamps = metric_data.timestamps
+            start = int((now - rules.max_past.total_seconds()) * 1e9)
+            end = int((now + rules.max_future.total_seconds()) * 1e9)
+            if timestamps and start <= min(timestamps) and max(timestamps) <= end:
+                return metric_data
+            selectors = [start <= timestamp <= end for timestamp in timestamps]
+            kept: MetricStream = replace(
+                metric_data,
+                timestamps=list(compress(timestamps, selectors)),
+                values=list(compress(metric_data.values, selectors)),
+                counts=list(compress(metric_data.counts, selectors)),
+            )
+            self.dropped_datapoints += len(metric_data) - len(kept)
+            return cast("T", kept) if kept else None
+
+        start_time = datetime.fromtimestamp(now, tz=UTC) - rules.max_past
+        end_time = datetime.fromtimestamp(now, tz=UTC) + rules.max_future
+        datapoints = [
+            datapoint
+            for datapoint in metric_data.datapoints
+            if start_time <= datapoint.timestamp <= end_time
+        ]
+        self.dropped_datapoints += len(metric_data.datapoints) - len(datapoints)
+        if not datapoints:
+            return None
+        if len(datapoints) == len(metric_data.datapoints):
+            return metric_data
+        return _copy(metric_data, datapoints=datapoints)
+
+
+# stands in for missing metadata, as None marks a stream to drop
+_NO_METADATA: Mapping[str, str] = {}
+
+
+def _copy(
+    metric_data: T,
+    *,
+    name: str | None = None,
+    dimensions: Mapping[str, str] | None = None,
+    metadata: Mapping[str, str] | None = None,
+    datapoints: list[Datapoint] | None = None,
+) -> T:
+    name = metric_data.name if name is None else name
+    dimensions = metric_data.dimensions if dimensions is None else dimensions
+    metadata = metric_data.metadata if metadata is None else metadata or None
+    if isinstance(metric_data, MetricStream):
+        return cast(
+            "T",
+            replace(metric_data, name=name, dimensions=dimensions, metadata=metadata),
+        )
+
+    from oci.monitoring.models import MetricDataDetails
+
+    return cast(
+        "T",
+        MetricDataDetails(
+            namespace=metric_data.namespace,
+            resource_group=metric_data.resource_group,
+            compartment_id=metric_data.compartment_id,
+            name=name,
+            dimensions=dict(dimensions),
+            metadata=None if metadata is None else dict(metadata),
+            datapoints=metric_data.datapoints if datapoints is None else datapoints,
+        ),
+    )
@@ -1,10 +1,56 @@
-from typing import Mapping
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+from opentelemetry.sdk.metrics.export import (
+    Metric,
+    MetricsData,
+    ResourceMetrics,
+    ScopeMetrics,
+)
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics.export import DataT
 
 ASCII_PRINTABLE_MIN = 33
 ASCII_PRINTABLE_MAX = 126
 DIM_KEY_MAX_LEN = 256
 DIM_VALUE_MAX_LEN = 512
 
+EMPTY_RESOURCE = Resource({})
+SCOPE = InstrumentationScope("scope")
+
+
+def wrap_metrics(
+    *metrics: Metric | DataT,
+    resources: Iterable[Resource] = (EMPTY_RESOURCE,),
+    scope: InstrumentationScope = SCOPE,
+) -> MetricsData:
+    """Wrap the metrics in one scope of every resource.
+
+    Data that is not wrapped in a Metric yet becomes a metric named "metric".
+    """
+    wrapped = [
+        metric
+        if isinstance(metric, Metric)
+        else Metric(name="metric", description=None, unit=None, data=metric)
+        for metric in metrics
+    ]
+    return MetricsData(
+        resource_metrics=[
+            ResourceMetrics(
+                resource=resource,
+                scope_metrics=[
+                    ScopeMetrics(scope=scope, metrics=wrapped, schema_url="")
+                ],
+                schema_url="",
+            )
+            for resource in resources
+        ]
+    )
+
 
 def assert_wellformed_oci_metric_dimensions(dimensions: Mapping[str, str]) -> None:
     """Validate the dimensions conform to OCI specifications.
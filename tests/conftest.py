@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, NoReturn, TypeVar
 from unittest.mock import NonCallableMock
 
 import pytest
+from oci.auth.signers import SecurityTokenSigner
 from oci.monitoring import MonitoringClient
 from oci.monitoring.models import PostMetricDataResponseDetails
 from oci.response import Response
@@ -24,6 +26,9 @@ from opentelemetry_exporter_oci_monitoring.converter import (
     DefaultMetricsConverter,
 )
 
+if TYPE_CHECKING:
+    from oci.request import Request
+
 
 @pytest.fixture
 def attributes() -> Attributes:
@@ -139,3 +144,43 @@ def oci_monitoring_exporter(
     monitoring_client: NonCallableMock, oci_metrics_converter: DefaultMetricsConverter
 ) -> OCIMonitoringExporter:
     return OCIMonitoringExporter(monitoring_client, oci_metrics_converter)
+
+
+_R = TypeVar("_R")
+
+
+class NoopSigner(SecurityTokenSigner):
+    def __init__(self) -> None:  # pyright: ignore[reportMissingSuperCall]
+        pass
+
+    def __call__(
+        self,
+        request: _R,
+        enforce_content_headers: bool = True,  # noqa: ARG002, FBT001, FBT002
+    ) -> _R:
+        return request
+
+
+@pytest.fixture
+def sdk_monitoring_client() -> MonitoringClient:
+    """A real MonitoringClient that does not sign its requests."""
+    return MonitoringClient(
+        {}, signer=NoopSigner(), service_endpoint="http://127.0.0.1:9"
+    )
+
+
+@pytest.fixture
+def sdk_request_bodies(sdk_monitoring_client: MonitoringClient) -> list[str | bytes]:
+    """Capture the bodies the SDK client would send instead of sending them."""
+    bodies: list[str | bytes] = []
+
+    def request(request: Request[str | bytes], *args: object) -> NoReturn:  # noqa: ARG001
+        bodies.append(request.body)
+        raise RequestCapturedError
+
+    sdk_monitoring_client.base_client.request = request  # pyright: ignore[reportAttributeAccessIssue]
+    return bodies
+
+
+class RequestCapturedError(Exception):
+    pass
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    Gauge,
+    MetricExportResult,
+    MetricsData,
+    NumberDataPoint,
+    Sum,
+)
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.aggregation import (
+    AggregationKind,
+    aggregate_datapoints,
+    aggregation_kind,
+)
+from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+from tests import wrap_metrics
+
+if TYPE_CHECKING:
+    from unittest.mock import NonCallableMock
+
+SECOND = 1_000_000_000
+MINUTE = 60 * SECOND
+
+
+@pytest.fixture
+def converter() -> DefaultMetricsConverter:
+    return DefaultMetricsConverter(
+        "my-namespace",
+        "my-resource-group",
+        "my-compartment-id",
+        aggregation_resolution=timedelta(minutes=1),
+    )
+
+
+def delta_sum(*points: tuple[int, float]) -> MetricsData:
+    data_points = [
+        NumberDataPoint({}, 0, timestamp, value) for timestamp, value in points
+    ]
+    return wrap_metrics(
+        Sum(data_points, AggregationTemporality.DELTA, is_monotonic=True)
+    )
+
+
+def flushed(converter: DefaultMetricsConverter) -> list[tuple[float, float]]:
+    return [
+        (timestamp / SECOND, value)
+        for stream in converter.flush_streams()
+        for timestamp, value in zip(stream.timestamps, stream.values)
+    ]
+
+
+def test_aggregate_sums() -> None:
+    timestamps = [10 * SECOND, 40 * SECOND, MINUTE + 5 * SECOND]
+
+    assert aggregate_datapoints(
+        timestamps,
+        [1.0, 2.0, 4.0],
+        [1, 3, 1],
+        resolution_nanos=MINUTE,
+        kind=AggregationKind.SUM,
+    ) == ([0, MINUTE], [7.0, 4.0], [1, 1])
+
+
+def test_aggregate_last_values() -> None:
+    timestamps = [40 * SECOND, 10 * SECOND, MINUTE + 5 * SECOND]
+
+    assert aggregate_datapoints(
+        timestamps,
+        [1.0, 2.0, 4.0],
+        [1, 1, 1],
+        resolution_nanos=MINUTE,
+        kind=AggregationKind.LAST_VALUE,
+    ) == ([0, MINUTE], [1.0, 4.0], [1, 1])
+
+
+def test_aggregate_distributions() -> None:
+    timestamps = [10 * SECOND, 20 * SECOND, 30 * SECOND, MINUTE]
+
+    assert aggregate_datapoints(
+        timestamps,
+        [5.0, 15.0, 5.0, 5.0],
+        [2, 1, 3, 1],
+        resolution_nanos=MINUTE,
+        kind=AggregationKind.DISTRIBUTION,
+    ) == ([0, 0, MINUTE], [5.0, 15.0, 5.0], [5, 1, 1])
+
+
+def test_aggregation_kind() -> None:
+    delta = Sum([], AggregationTemporality.DELTA, is_monotonic=True)
+    cumulative = Sum([], AggregationTemporality.CUMULATIVE, is_monotonic=True)
+
+    assert aggregation_kind(delta) is AggregationKind.SUM
+    assert aggregation_kind(cumulative) is AggregationKind.LAST_VALUE
+    assert aggregation_kind(Gauge([])) is AggregationKind.LAST_VALUE
+
+
+def test_convert_with_aggregation_resolution(
+    converter: DefaultMetricsConverter,
+) -> None:
+    data_points = [
+        NumberDataPoint({"foo": "bar"}, 0, timestamp, 1)
+        for timestamp in range(0, 3 * MINUTE, 10 * SECOND)
+    ]
+    data = Sum(data_points, AggregationTemporality.DELTA, is_monotonic=True)
+    metrics_data = wrap_metrics(data)
+
+    (converted,) = converter.convert(metrics_data)
+
+    # the last minute is still open
+    assert [datapoint.value for datapoint in converted.datapoints] == [6.0] * 2
+    assert [datapoint.count for datapoint in converted.datapoints] == [1] * 2
+    assert [datapoint.timestamp.timestamp() for datapoint in converted.datapoints] == [
+        0.0,
+        60.0,
+    ]
+    assert flushed(converter) == [(120.0, 6.0)]
+
+
+def test_buckets_span_exports(converter: DefaultMetricsConverter) -> None:
+    converted = [
+        list(
+            converter.convert(
+                wrap_metrics(Gauge([NumberDataPoint({}, 0, timestamp, value)]))
+            )
+        )
+        for value, timestamp in enumerate((10 * SECOND, 20 * SECOND, 70 * SECOND))
+    ]
+
+    # the first minute is sent once, when a datapoint of the next one arrives
+    assert [
+        [(point.timestamp.timestamp(), point.value) for point in metric.datapoints]
+        for metrics in converted
+        for metric in metrics
+    ] == [[(0.0, 1.0)]]
+    assert flushed(converter) == [(60.0, 2.0)]
+
+
+def test_late_datapoints_join_the_first_open_bucket(
+    converter: DefaultMetricsConverter,
+) -> None:
+    assert list(converter.convert_streams(delta_sum((10 * SECOND, 1)))) == []
+    (closed,) = converter.convert_streams(delta_sum((70 * SECOND, 1)))
+    assert list(converter.convert_streams(delta_sum((30 * SECOND, 5)))) == []
+
+    assert closed.timestamps == [0]
+    assert flushed(converter) == [(60.0, 6.0)]
+
+
+def test_flushed_buckets_are_not_sent_again(converter: DefaultMetricsConverter) -> None:
+    _ = list(converter.convert_streams(delta_sum((10 * SECOND, 1))))
+    assert flushed(converter) == [(0.0, 1.0)]
+
+    _ = list(converter.convert_streams(delta_sum((20 * SECOND, 2))))
+    assert flushed(converter) == [(60.0, 2.0)]
+
+
+def test_exporter_flushes_open_buckets(
+    monitoring_client: NonCallableMock, converter: DefaultMetricsConverter
+) -> None:
+    exporter = OCIMonitoringExporter(monitoring_client, converter)
+
+    assert exporter.export(delta_sum((10 * SECOND, 1))) == MetricExportResult.SUCCESS
+    monitoring_client.post_metric_data.assert_not_called()
+    assert exporter.force_flush()
+    details = monitoring_client.post_metric_data.call_args.args[0]
+    assert [metric.datapoints[0].value for metric in details.metric_data] == [1.0]
+
+    assert exporter.export(delta_sum((70 * SECOND, 2))) == MetricExportResult.SUCCESS
+    exporter.shutdown()
+    details = monitoring_client.post_metric_data.call_args.args[0]
+    assert [metric.datapoints[0].value for metric in details.metric_data] == [2.0]
+    assert monitoring_client.post_metric_data.call_count == 2  # noqa: PLR2004
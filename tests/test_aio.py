@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Awaitable, Callable, TypeVar
+
+from aiohttp import web
+from oci.monitoring import MonitoringClient
+from opentelemetry.sdk.metrics.export import MetricExportResult
+
+from opentelemetry_exporter_oci_monitoring.aio import (
+    AsyncOCIMonitoringExporter,
+    SignableRequest,
+)
+from opentelemetry_exporter_oci_monitoring.batching import BatchLimits
+from opentelemetry_exporter_oci_monitoring.encoding import encode_post_metric_data
+from opentelemetry_exporter_oci_monitoring.retry import RetryPolicy
+from tests.conftest import NoopSigner
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics.export import MetricsData
+
+    from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+_R = TypeVar("_R")
+
+
+class HeaderSigner(NoopSigner):
+    def __call__(
+        self,
+        request: _R,
+        enforce_content_headers: bool = True,  # noqa: FBT001, FBT002
+    ) -> _R:
+        assert isinstance(request, SignableRequest)
+        request.headers["authorization"] = "Signature test"
+        return super().__call__(request, enforce_content_headers)
+
+
+@asynccontextmanager
+async def ingestion_server(handler: Handler) -> AsyncGenerator[MonitoringClient, None]:
+    """Serve the PostMetricData operation on localhost."""
+    app = web.Application()
+    _ = app.router.add_post("/20180401/metrics", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port: int = runner.addresses[0][1]
+    try:
+        yield MonitoringClient(
+            {}, signer=HeaderSigner(), service_endpoint=f"http://127.0.0.1:{port}"
+        )
+    finally:
+        await runner.cleanup()
+
+
+def ok_response(failed_metrics_count: int = 0) -> web.Response:
+    return web.json_response(
+        {"failedMetricsCount": failed_metrics_count, "failedMetrics": []}
+    )
+
+
+def test_export_async_posts_signed_batches(
+    oci_metrics_converter: DefaultMetricsConverter, metrics_data: MetricsData
+) -> None:
+    bodies: list[bytes] = []
+    authorizations: list[str | None] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        bodies.append(await request.read())
+        authorizations.append(request.headers.get("authorization"))
+        return ok_response()
+
+    async def main() -> MetricExportResult:
+        async with ingestion_server(handler) as client:
+            exporter = AsyncOCIMonitoringExporter(
+                client, oci_metrics_converter, batch_limits=BatchLimits(max_streams=1)
+            )
+            return await exporter.export_async(metrics_data)
+
+    assert asyncio.run(main()) == MetricExportResult.SUCCESS
+
+    streams = list(oci_metrics_converter.convert_streams(metrics_data))
+    assert sorted(bodies) == sorted(
+        encode_post_metric_data([stream], "ATOMIC") for stream in streams
+    )
+    assert authorizations == len(streams) * ["Signature test"]
+    assert all(json.loads(body)["batchAtomicity"] == "ATOMIC" for body in bodies)
+
+
+def test_export_async_bounds_concurrency(
+    oci_metrics_converter: DefaultMetricsConverter, metrics_data: MetricsData
+) -> None:
+    max_concurrency = 2
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal in_flight, max_in_flight
+        _ = await request.read()
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return ok_response()
+
+    async def main() -> MetricExportResult:
+        async with ingestion_server(handler) as client:
+            exporter = AsyncOCIMonitoringExporter(
+                client,
+                oci_metrics_converter,
+                batch_limits=BatchLimits(max_streams=1),
+                max_concurrency=max_concurrency,
+            )
+            return await exporter.export_async(metrics_data)
+
+    assert asyncio.run(main()) == MetricExportResult.SUCCESS
+    assert max_in_flight == max_concurrency
+
+
+def test_export_async_failure(
+    oci_metrics_converter: DefaultMetricsConverter, metrics_data: MetricsData
+) -> None:
+    responses = iter(
+        [
+            ok_response(),
+            web.json_response({"code": "TooManyRequests"}, status=429),
+            ok_response(failed_metrics_count=1),
+            ok_response(),
+        ]
+    )
+
+    async def handler(request: web.Request) -> web.Response:
+        _ = await request.read()
+        return next(responses)
+
+    async def main() -> MetricExportResult:
+        async with ingestion_server(handler) as client:
+            exporter = AsyncOCIMonitoringExporter(
+                client,
+                oci_metrics_converter,
+                batch_limits=BatchLimits(max_streams=1),
+                max_concurrency=1,
+            )
+            return await exporter.export_async(metrics_data)
+
+    assert asyncio.run(main()) == MetricExportResult.FAILURE
+
+
+def test_export_async_retries(
+    oci_metrics_converter: DefaultMetricsConverter, metrics_data: MetricsData
+) -> None:
+    statuses: list[int] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        _ = await request.read()
+        response = (
+            web.json_response(
+                {"code": "TooManyRequests"}, status=429, headers={"Retry-After": "0"}
+            )
+            if not statuses
+            else ok_response()
+        )
+        statuses.append(response.status)
+        return response
+
+    async def main() -> MetricExportResult:
+        async with ingestion_server(handler) as client:
+            exporter = AsyncOCIMonitoringExporter(
+                client,
+                oci_metrics_converter,
+                retry_policy=RetryPolicy(initial_backoff_millis=1, jitter=0),
+            )
+            return await exporter.export_async(metrics_data)
+
+    assert asyncio.run(main()) == MetricExportResult.SUCCESS
+    assert statuses == [429, 200]
+
+
+def test_export_async_resends_failed_metrics(
+    oci_metrics_converter: DefaultMetricsConverter, metrics_data: MetricsData
+) -> None:
+    bodies: list[dict[str, Any]] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        body = json.loads(await request.read())
+        bodies.append(body)
+        if len(bodies) > 1:
+            return ok_response()
+        return web.json_response(
+            {
+                "failedMetricsCount": 1,
+                "failedMetrics": [
+                    {"message": "throttled", "metricData": body["metricData"][1]}
+                ],
+            }
+        )
+
+    async def main() -> MetricExportResult:
+        async with ingestion_server(handler) as client:
+            exporter = AsyncOCIMonitoringExporter(
+                client,
+                oci_metrics_converter,
+                batch_atomicity="NON_ATOMIC",
+                retry_policy=RetryPolicy(initial_backoff_millis=1, jitter=0),
+            )
+            return await exporter.export_async(metrics_data)
+
+    assert asyncio.run(main()) == MetricExportResult.SUCCESS
+    first, second = bodies
+    assert second == {
+        "metricData": [first["metricData"][1]],
+        "batchAtomicity": "NON_ATOMIC",
+    }
+
+
+def test_export_submits_to_loop(
+    oci_metrics_converter: DefaultMetricsConverter, metrics_data: MetricsData
+) -> None:
+    requests_count = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal requests_count
+        _ = await request.read()
+        requests_count += 1
+        return ok_response()
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = ingestion_server(handler)
+    try:
+        client = asyncio.run_coroutine_threadsafe(server.__aenter__(), loop).result()
+        exporter = AsyncOCIMonitoringExporter(client, oci_metrics_converter, loop=loop)
+
+        assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+        assert requests_count == 1
+    finally:
+        _ = asyncio.run_coroutine_threadsafe(
+            server.__aexit__(None, None, None), loop
+        ).result()
+        _ = loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
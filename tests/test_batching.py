@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from oci.monitoring.models import Datapoint, MetricDataDetails
+
+from opentelemetry_exporter_oci_monitoring.batching import (
+    DATAPOINT_BYTES,
+    BatchLimits,
+    estimate_size,
+    iter_batches,
+)
+
+
+def make_metric_data_details(name: str, datapoints_count: int) -> MetricDataDetails:
+    timestamp = datetime(2024, 8, 26, tzinfo=timezone.utc)
+    return MetricDataDetails(
+        namespace="my-namespace",
+        resource_group="my-resource-group",
+        compartment_id="my-compartment-id",
+        name=name,
+        dimensions={"foo": "bar"},
+        metadata=None,
+        datapoints=[
+            Datapoint(timestamp=timestamp, value=float(i), count=1)
+            for i in range(datapoints_count)
+        ],
+    )
+
+
+def test_single_batch() -> None:
+    metric_data = [make_metric_data_details(f"metric-{i}", 3) for i in range(3)]
+
+    batches = list(iter_batches(metric_data, BatchLimits()))
+
+    assert batches == [metric_data]
+
+
+def test_no_batches_without_metric_data() -> None:
+    metric_data: list[MetricDataDetails] = []
+
+    assert list(iter_batches(metric_data, BatchLimits())) == []
+
+
+def test_max_streams() -> None:
+    metric_data = [make_metric_data_details(f"metric-{i}", 1) for i in range(7)]
+
+    batches = list(iter_batches(metric_data, BatchLimits(max_streams=3)))
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [details for batch in batches for details in batch] == metric_data
+
+
+def test_split_oversized_stream() -> None:
+    metric_data = [
+        make_metric_data_details("small", 2),
+        make_metric_data_details("large", 25),
+    ]
+
+    batches = list(iter_batches(metric_data, BatchLimits(max_datapoints_per_stream=10)))
+
+    assert [[(d.name, len(d.datapoints)) for d in batch] for batch in batches] == [
+        [("small", 2), ("large", 10)],
+        [("large", 10)],
+        [("large", 5)],
+    ]
+    assert [
+        datapoint.value
+        for batch in batches
+        for details in batch
+        if details.name == "large"
+        for datapoint in details.datapoints
+    ] == [float(i) for i in range(25)]
+
+
+def test_max_bytes() -> None:
+    metric_data = [make_metric_data_details(f"metric-{i}", 10) for i in range(4)]
+    max_bytes = 2 * estimate_size(metric_data[0]) + DATAPOINT_BYTES
+
+    batches = list(iter_batches(metric_data, BatchLimits(max_bytes=max_bytes)))
+
+    assert [len(batch) for batch in batches] == [2, 2]
+    for batch in batches:
+        assert sum(estimate_size(details) for details in batch) <= max_bytes
+
+
+def test_max_bytes_splits_stream() -> None:
+    datapoints_count = 100
+    metric_data = [make_metric_data_details("large", datapoints_count)]
+    max_bytes = estimate_size(make_metric_data_details("large", 30))
+
+    batches = list(iter_batches(metric_data, BatchLimits(max_bytes=max_bytes)))
+
+    assert len(batches) > 1
+    assert sum(len(batch[0].datapoints) for batch in batches) == datapoints_count
+    for batch in batches:
+        assert len(batch) == 1
+        assert estimate_size(batch[0]) <= max_bytes
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"max_streams": 0}, {"max_datapoints_per_stream": 0}, {"max_bytes": 1}]
+)
+def test_invalid_limits(kwargs: dict[str, int]) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        _ = BatchLimits(**kwargs)
@@ -0,0 +1,22 @@
+import pytest
+
+from opentelemetry_exporter_oci_monitoring.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert len(cache) == cache.maxsize
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3  # noqa: PLR2004
+
+
+def test_lru_cache_requires_positive_maxsize() -> None:
+    with pytest.raises(ValueError, match="maxsize"):
+        _ = LRUCache[str, int](0)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    Metric,
+    MetricsData,
+    NumberDataPoint,
+    Sum,
+)
+
+from opentelemetry_exporter_oci_monitoring.cardinality import (
+    OVERFLOW_DIMENSIONS,
+    CardinalityInfo,
+    CardinalityLimiter,
+    CardinalityLimits,
+)
+from opentelemetry_exporter_oci_monitoring.converter import (
+    DefaultMetricsConverter,
+    PrefixedDimensionsExtractor,
+)
+from tests import wrap_metrics
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        super().__init__()
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def requests_sum(users: int, time_unix_nano: int = 10**9) -> MetricsData:
+    data_points = [
+        NumberDataPoint(
+            attributes={"user.id": str(user)},
+            start_time_unix_nano=0,
+            time_unix_nano=time_unix_nano,
+            value=1,
+        )
+        for user in range(users)
+    ]
+    data = Sum(
+        data_points=data_points,
+        aggregation_temporality=AggregationTemporality.DELTA,
+        is_monotonic=True,
+    )
+    return wrap_metrics(Metric(name="requests", description=None, unit=None, data=data))
+
+
+def test_limiter_admits_up_to_the_limit() -> None:
+    limiter = CardinalityLimiter(CardinalityLimits(max_streams_per_metric=2))
+
+    assert limiter.admit("metric", "a")
+    assert limiter.admit("metric", "b")
+    assert not limiter.admit("metric", "c")
+    assert limiter.admit("metric", "a")
+    assert limiter.admit("other", "c")
+
+
+def test_limiter_forgets_streams_outside_the_window() -> None:
+    clock = FakeClock()
+    limits = CardinalityLimits(max_streams_per_metric=2, window=timedelta(minutes=1))
+    limiter = CardinalityLimiter(limits, clock)
+    assert limiter.admit("metric", "a")
+    assert limiter.admit("metric", "b")
+
+    clock.now = 45
+    assert limiter.admit("metric", "a")
+    clock.now = 90
+    assert limiter.admit("metric", "c")
+    assert not limiter.admit("metric", "d")
+
+
+def test_limiter_bounds_the_tracked_metrics() -> None:
+    limiter = CardinalityLimiter(CardinalityLimits(max_metrics=2))
+    for name in ("a", "b", "c"):
+        assert limiter.admit(name, "stream")
+
+    assert limiter.info() == CardinalityInfo(
+        overflowed_streams=0,
+        overflowed_datapoints=0,
+        tracked_metrics=2,
+        tracked_streams=2,
+    )
+
+
+def test_converter_folds_streams_into_the_overflow_stream() -> None:
+    converter = DefaultMetricsConverter(
+        "namespace",
+        "resource-group",
+        "compartment-id",
+        dimensions_extractor=PrefixedDimensionsExtractor(prefix_scope="scope."),
+        cardinality_limits=CardinalityLimits(max_streams_per_metric=3),
+    )
+
+    streams = list(converter.convert_streams(requests_sum(users=10)))
+
+    assert [dict(stream.dimensions) for stream in streams] == [
+        {"scope.name": "scope", "user.id": "0"},
+        {"scope.name": "scope", "user.id": "1"},
+        {"scope.name": "scope", "user.id": "2"},
+        dict(OVERFLOW_DIMENSIONS),
+    ]
+    overflow = streams[-1]
+    assert overflow.values == [7.0]  # noqa: PD011
+    assert overflow.timestamps == [10**9]
+    info = converter.cardinality_info()
+    assert info is not None
+    assert info.overflowed_streams == 7  # noqa: PLR2004
+    assert info.overflowed_datapoints == 7  # noqa: PLR2004
+
+    # streams admitted earlier keep their own dimensions
+    streams = list(converter.convert_streams(requests_sum(users=2)))
+    assert [stream.dimensions["user.id"] for stream in streams] == ["0", "1"]
+
+
+def test_converter_without_limits() -> None:
+    converter = DefaultMetricsConverter("namespace", "resource-group", "compartment-id")
+
+    assert len(list(converter.convert_streams(requests_sum(users=10)))) == 10  # noqa: PLR2004
+    assert converter.cardinality_info() is None
+
+
+@pytest.mark.parametrize(
+    ("max_streams_per_metric", "window", "max_metrics"),
+    [(0, timedelta(hours=1), 1), (1, timedelta(), 1), (1, timedelta(hours=1), 0)],
+)
+def test_validates_limits(
+    max_streams_per_metric: int, window: timedelta, max_metrics: int
+) -> None:
+    with pytest.raises(ValueError, match="must be"):
+        _ = CardinalityLimits(
+            max_streams_per_metric=max_streams_per_metric,
+            window=window,
+            max_metrics=max_metrics,
+        )
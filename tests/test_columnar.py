@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from benchmarks.workload import Workload, make_metrics_data
+from opentelemetry_exporter_oci_monitoring import columnar
+from opentelemetry_exporter_oci_monitoring.cardinality import (
+    OVERFLOW_DIMENSIONS,
+    CardinalityLimits,
+)
+from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics.export import MetricsData
+
+    from opentelemetry_exporter_oci_monitoring.converter import MetricStream
+
+
+def columns(streams: list[MetricStream]) -> list[tuple[object, ...]]:
+    return [
+        (
+            stream.name,
+            dict(stream.dimensions),
+            stream.timestamps,
+            stream.values,  # noqa: PD011
+            stream.counts,
+        )
+        for stream in streams
+    ]
+
+
+def convert(metrics_data: MetricsData, *, columnar: bool = False) -> list[MetricStream]:
+    converter = DefaultMetricsConverter(
+        "namespace", "resource-group", "compartment-id", columnar=columnar
+    )
+    return list(converter.convert_streams(metrics_data))
+
+
+@pytest.mark.parametrize("points_per_stream", [1, 20])
+@pytest.mark.parametrize("numpy", [columnar.HAS_NUMPY, False])
+def test_columnar_streams_equal_row_streams(
+    monkeypatch: pytest.MonkeyPatch,
+    points_per_stream: int,
+    numpy: bool,  # noqa: FBT001
+) -> None:
+    monkeypatch.setattr(columnar, "HAS_NUMPY", numpy)
+    metrics_data = make_metrics_data(
+        Workload(
+            resources=2,
+            metrics=6,
+            attribute_sets=5,
+            points_per_stream=points_per_stream,
+        )
+    )
+
+    assert columns(convert(metrics_data, columnar=True)) == columns(
+        convert(metrics_data)
+    )
+
+
+def test_columnar_values_are_floats(metrics_data: MetricsData) -> None:
+    streams = convert(metrics_data, columnar=True)
+
+    assert all(type(value) is float for stream in streams for value in stream.values)  # noqa: PD011
+
+
+def test_columnar_respects_cardinality_limits() -> None:
+    metrics_data = make_metrics_data(
+        Workload(resources=1, metrics=1, attribute_sets=5, points_per_stream=20)
+    )
+    converter = DefaultMetricsConverter(
+        "namespace",
+        "resource-group",
+        "compartment-id",
+        cardinality_limits=CardinalityLimits(max_streams_per_metric=2),
+        columnar=True,
+    )
+
+    streams = list(converter.convert_streams(metrics_data))
+
+    assert len(streams) == 3  # noqa: PLR2004
+    assert streams[-1].dimensions == OVERFLOW_DIMENSIONS
+    info = converter.cardinality_info()
+    assert info is not None
+    assert info.overflowed_streams == 3  # noqa: PLR2004
+    assert info.overflowed_datapoints == 3 * 20
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+import pytest
+from opentelemetry.sdk.metrics import Histogram, MeterProvider
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    Buckets,
+    ExponentialHistogramDataPoint,
+    HistogramDataPoint,
+    InMemoryMetricReader,
+    MetricsData,
+)
+from opentelemetry.sdk.metrics.view import ExponentialBucketHistogramAggregation, View
+
+from opentelemetry_exporter_oci_monitoring.histogram import (
+    expand_exponential_histogram,
+    expand_histogram,
+)
+
+if TYPE_CHECKING:
+    from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+
+
+def make_histogram_data_point(
+    bucket_counts: list[int], explicit_bounds: list[float], *, sum_: float = 0.0
+) -> HistogramDataPoint:
+    return HistogramDataPoint(
+        attributes={},
+        start_time_unix_nano=0,
+        time_unix_nano=1,
+        count=sum(bucket_counts),
+        sum=sum_,
+        bucket_counts=bucket_counts,
+        explicit_bounds=explicit_bounds,
+        min=float("inf"),
+        max=float("-inf"),
+    )
+
+
+def test_expand_histogram_skips_empty_buckets() -> None:
+    data_point = make_histogram_data_point([1, 0, 3, 2], [0.0, 10.0, 20.0])
+
+    values, counts = expand_histogram(data_point)
+
+    assert values == [0.0, 15.0, 20.0]
+    assert counts == [1, 3, 2]
+
+
+def test_expand_histogram_clamps_to_min_and_max() -> None:
+    data_point = make_histogram_data_point([1, 0, 3, 2], [0.0, 10.0, 20.0])
+    data_point = replace(data_point, min=2.0, max=17.0)
+
+    values, _ = expand_histogram(data_point)
+
+    assert values == [2.0, 15.0, 17.0]
+
+
+def test_expand_histogram_without_bounds() -> None:
+    data_point = make_histogram_data_point([4], [], sum_=10.0)
+
+    assert expand_histogram(data_point) == ([2.5], [4])
+
+
+def test_expand_empty_histogram() -> None:
+    data_point = make_histogram_data_point([0, 0], [1.0])
+
+    assert expand_histogram(data_point) == ([], [])
+
+
+def test_expand_exponential_histogram() -> None:
+    data_point = ExponentialHistogramDataPoint(
+        attributes={},
+        start_time_unix_nano=0,
+        time_unix_nano=1,
+        count=6,
+        sum=0.0,
+        scale=0,
+        zero_count=1,
+        positive=Buckets(offset=1, bucket_counts=[2, 0, 1]),
+        negative=Buckets(offset=0, bucket_counts=[1, 1]),
+        flags=0,
+        min=float("inf"),
+        max=float("-inf"),
+    )
+
+    values, counts = expand_exponential_histogram(data_point)
+
+    assert values == pytest.approx(  # pyright: ignore[reportUnknownMemberType]
+        [-(2**1.5), -(2**0.5), 0.0, 2**1.5, 2**3.5]
+    )
+    assert counts == [1, 1, 1, 2, 1]
+
+
+def collect_histogram(*views: View) -> MetricsData:
+    reader = InMemoryMetricReader(
+        preferred_temporality={Histogram: AggregationTemporality.DELTA}
+    )
+    meter_provider = MeterProvider(metric_readers=[reader], views=views)
+    histogram = meter_provider.get_meter("foo.scope").create_histogram(
+        "foo.duration", unit="ms"
+    )
+    for value in (3, 7, 7, 120, 4_000):
+        histogram.record(value, {"route": "/"})
+
+    metrics_data = reader.get_metrics_data()  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+    meter_provider.shutdown()
+    assert isinstance(metrics_data, MetricsData)
+    return metrics_data
+
+
+@pytest.mark.parametrize(
+    "views",
+    [
+        (),
+        (
+            View(
+                instrument_name="foo.duration",
+                aggregation=ExponentialBucketHistogramAggregation(),
+            ),
+        ),
+    ],
+)
+def test_convert_histogram(
+    oci_metrics_converter: DefaultMetricsConverter, views: tuple[View, ...]
+) -> None:
+    metrics_data = collect_histogram(*views)
+
+    (converted,) = oci_metrics_converter.convert(metrics_data)
+
+    assert converted.name == "foo.duration"
+    assert converted.dimensions["route"] == "/"
+    assert converted.metadata == {"unit": "ms"}
+    assert sum(datapoint.count or 0 for datapoint in converted.datapoints) == 5  # noqa: PLR2004
+    values = [datapoint.value for datapoint in converted.datapoints]
+    assert values == sorted(values)
+    assert min(values) >= 3  # noqa: PLR2004
+    assert max(values) <= 4_000  # noqa: PLR2004
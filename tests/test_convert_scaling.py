@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    Metric,
+    MetricsData,
+    NumberDataPoint,
+    Sum,
+)
+
+from tests import wrap_metrics
+
+if TYPE_CHECKING:
+    from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+
+POINTS_PER_STREAM = 10_000
+SCALE_FACTOR = 4
+# linear scaling would yield a ratio close to SCALE_FACTOR, quadratic scaling one
+# close to SCALE_FACTOR ** 2
+MAX_TIME_RATIO = 2 * SCALE_FACTOR
+
+
+def foo_sum(points_per_stream: int) -> MetricsData:
+    attributes = {"foo": "bar"}
+    data_points = [
+        NumberDataPoint(
+            attributes=attributes,
+            start_time_unix_nano=i * 1_000_000,
+            time_unix_nano=(i + 1) * 1_000_000,
+            value=i,
+        )
+        for i in range(points_per_stream)
+    ]
+    data = Sum(
+        data_points=data_points,
+        aggregation_temporality=AggregationTemporality.DELTA,
+        is_monotonic=True,
+    )
+    return wrap_metrics(
+        Metric(name="foo.metric", description=None, unit=None, data=data)
+    )
+
+
+def measure_convert(
+    converter: DefaultMetricsConverter, metrics_data: MetricsData, repeat: int = 3
+) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converted = list(converter.convert(metrics_data))
+        timings.append(time.perf_counter() - start)
+        assert len(converted) == 1
+    return min(timings)
+
+
+@pytest.mark.benchmark
+def test_convert_scales_linearly_with_points_per_stream(
+    oci_metrics_converter: DefaultMetricsConverter,
+) -> None:
+    small = foo_sum(POINTS_PER_STREAM)
+    large = foo_sum(SCALE_FACTOR * POINTS_PER_STREAM)
+
+    small_time = measure_convert(oci_metrics_converter, small)
+    large_time = measure_convert(oci_metrics_converter, large)
+
+    assert large_time / small_time < MAX_TIME_RATIO
+
+
+def test_convert_keeps_all_points_of_a_stream(
+    oci_metrics_converter: DefaultMetricsConverter,
+) -> None:
+    (converted,) = oci_metrics_converter.convert(foo_sum(POINTS_PER_STREAM))
+
+    assert [datapoint.value for datapoint in converted.datapoints] == [
+        float(i) for i in range(POINTS_PER_STREAM)
+    ]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+from unittest.mock import NonCallableMock
+
+import pytest
+from oci.monitoring import MonitoringClient
+from opentelemetry.sdk.metrics.export import MetricExportResult
+
+from benchmarks.workload import Workload, make_metrics_data
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.batching import BatchLimits
+from opentelemetry_exporter_oci_monitoring.dispatch import Dispatcher, DispatchSettings
+
+if TYPE_CHECKING:
+    from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+
+WORKERS = 2
+
+
+class ClientFactory:
+    """Creates clients that can only make progress if two post in parallel."""
+
+    def __init__(self, response: NonCallableMock) -> None:
+        super().__init__()
+        self.response = response
+        self.barrier = threading.Barrier(WORKERS, timeout=5)
+        self.threads: dict[int, set[int]] = {}
+
+    def __call__(self) -> MonitoringClient:
+        client = NonCallableMock(spec_set=MonitoringClient)
+        threads = self.threads.setdefault(id(client), set())
+
+        def post_metric_data(*_args: object) -> NonCallableMock:
+            threads.add(threading.get_ident())
+            _ = self.barrier.wait()
+            return self.response
+
+        client.configure_mock(**{"post_metric_data.side_effect": post_metric_data})
+        return client
+
+
+@pytest.fixture
+def factory(post_metrics_data_response: NonCallableMock) -> ClientFactory:
+    return ClientFactory(post_metrics_data_response)
+
+
+def make_exporter(
+    monitoring_client: NonCallableMock,
+    converter: DefaultMetricsConverter,
+    factory: ClientFactory,
+) -> OCIMonitoringExporter:
+    return OCIMonitoringExporter(
+        monitoring_client,
+        converter,
+        batch_limits=BatchLimits(max_streams=5),
+        dispatch=DispatchSettings(factory, max_workers=WORKERS),
+    )
+
+
+def test_posts_batches_in_parallel(
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    factory: ClientFactory,
+) -> None:
+    exporter = make_exporter(monitoring_client, oci_metrics_converter, factory)
+    metrics_data = make_metrics_data(
+        Workload(resources=1, metrics=2, attribute_sets=10, points_per_stream=1)
+    )
+
+    for _ in range(2):
+        assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+    exporter.shutdown()
+
+    assert not monitoring_client.post_metric_data.called
+    # every worker created one client and kept using it
+    assert len(factory.threads) == WORKERS
+    assert all(len(threads) == 1 for threads in factory.threads.values())
+
+
+def test_merges_results(
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    factory: ClientFactory,
+) -> None:
+    exporter = make_exporter(monitoring_client, oci_metrics_converter, factory)
+    factory.barrier = threading.Barrier(WORKERS + 1, timeout=0.1)
+    metrics_data = make_metrics_data(
+        Workload(resources=1, metrics=1, attribute_sets=10, points_per_stream=1)
+    )
+
+    assert exporter.export(metrics_data) == MetricExportResult.FAILURE
+    exporter.shutdown()
+
+
+def test_dispatcher_keeps_the_order_of_items() -> None:
+    dispatcher = Dispatcher(
+        DispatchSettings(lambda: NonCallableMock(spec_set=MonitoringClient))
+    )
+
+    assert dispatcher.map(lambda _, item: item * 2, range(10)) == [
+        item * 2 for item in range(10)
+    ]
+    dispatcher.shutdown()
+
+
+def test_validates_settings() -> None:
+    with pytest.raises(ValueError, match="max_workers must be at least 1"):
+        _ = DispatchSettings(lambda: NonCallableMock(), max_workers=0)
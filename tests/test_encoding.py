@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import io
+import json
+import math
+import time
+from typing import IO, TYPE_CHECKING, Callable, cast
+
+import pytest
+from oci.monitoring.models import PostMetricDataDetails
+from opentelemetry.sdk.metrics.export import MetricExportResult
+
+from opentelemetry_exporter_oci_monitoring import (
+    MetricsSerializer,
+    OCIMonitoringExporter,
+    encoding,
+)
+from opentelemetry_exporter_oci_monitoring.converter import (
+    DefaultMetricsConverter,
+    MetricStream,
+)
+from opentelemetry_exporter_oci_monitoring.encoding import (
+    encode_post_metric_data,
+    encode_post_metric_data_orjson,
+    write_metric_data,
+)
+from tests.conftest import RequestCapturedError
+
+if TYPE_CHECKING:
+    from unittest.mock import NonCallableMock
+
+    from oci.monitoring import MonitoringClient
+    from opentelemetry.sdk.metrics.export import MetricsData
+
+    from opentelemetry_exporter_oci_monitoring import BATCH_ATOMICITY
+    from opentelemetry_exporter_oci_monitoring.encoding import SerializationFormat
+
+
+def make_stream(**kwargs: object) -> MetricStream:
+    stream = MetricStream(
+        namespace="my-namespace",
+        resource_group="my-resource-group",
+        compartment_id="my-compartment-id",
+        name="my.metric",
+        dimensions={"key": 'välue "quoted"', "empty.list": ""},
+        metadata={"unit": "ms"},
+    )
+    for name, value in kwargs.items():
+        setattr(stream, name, value)
+    stream.append(1_724_678_400_000_000_000, 42.0)
+    stream.append(1_724_678_400_123_456_789, -1.5e-300, 3)
+    stream.append(1_724_678_401_999_999_000, float("nan"))
+    stream.append(1_724_678_402_000_000_000, float("inf"), 7)
+    return stream
+
+
+def sdk_body(
+    client: MonitoringClient,
+    bodies: list[str | bytes],
+    post_metric_data_details: PostMetricDataDetails,
+) -> bytes:
+    with pytest.raises(RequestCapturedError):
+        _ = client.post_metric_data(post_metric_data_details)
+    body = bodies.pop()
+    assert isinstance(body, str)
+    return body.encode()
+
+
+@pytest.mark.parametrize("batch_atomicity", ["ATOMIC", "NON_ATOMIC"])
+@pytest.mark.parametrize(
+    "stream",
+    [
+        make_stream(),
+        make_stream(resource_group=None),
+        make_stream(metadata=None, dimensions={}),
+    ],
+)
+def test_encoded_body_is_identical_to_sdk_body(
+    sdk_monitoring_client: MonitoringClient,
+    sdk_request_bodies: list[str | bytes],
+    stream: MetricStream,
+    batch_atomicity: BATCH_ATOMICITY,
+) -> None:
+    metric_data_details = stream.to_metric_data_details()
+    expected = sdk_body(
+        sdk_monitoring_client,
+        sdk_request_bodies,
+        PostMetricDataDetails(
+            metric_data=[metric_data_details, metric_data_details],
+            batch_atomicity=batch_atomicity,
+        ),
+    )
+
+    assert encode_post_metric_data([stream, stream], batch_atomicity) == expected
+    assert (
+        encode_post_metric_data(
+            [metric_data_details, metric_data_details], batch_atomicity
+        )
+        == expected
+    )
+
+
+def test_encoded_converted_metrics_are_identical_to_sdk_body(
+    sdk_monitoring_client: MonitoringClient,
+    sdk_request_bodies: list[str | bytes],
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    expected = sdk_body(
+        sdk_monitoring_client,
+        sdk_request_bodies,
+        PostMetricDataDetails(
+            metric_data=list(oci_metrics_converter.convert(metrics_data)),
+            batch_atomicity="ATOMIC",
+        ),
+    )
+
+    streams = list(oci_metrics_converter.convert_streams(metrics_data))
+    assert encode_post_metric_data(streams, "ATOMIC") == expected
+
+
+def test_orjson_body_is_equivalent() -> None:
+    stream = make_stream()
+    # orjson encodes non-finite floats as null
+    stream.values = [value if math.isfinite(value) else 0.0 for value in stream.values]  # noqa: PD011
+
+    assert json.loads(encode_post_metric_data_orjson([stream], "ATOMIC")) == json.loads(
+        encode_post_metric_data([stream], "ATOMIC")
+    )
+
+
+class RecordingWriter:
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(data)
+        return len(data)
+
+    def getvalue(self) -> bytes:
+        return b"".join(self.chunks)
+
+
+def write(metric_data: list[MetricStream], output_format: SerializationFormat) -> bytes:
+    writer = RecordingWriter()
+    written = write_metric_data(metric_data, cast("IO[bytes]", writer), output_format)
+    assert written == len(writer.getvalue())
+    return writer.getvalue()
+
+
+def test_written_metrics_equal_the_body() -> None:
+    stream = make_stream()
+    stream.values = [value if math.isfinite(value) else 0.0 for value in stream.values]  # noqa: PD011
+    expected = json.loads(encode_post_metric_data([stream, stream]))["metricData"]
+
+    written = write([stream, stream], "json")
+    assert json.loads(written) == expected
+    assert b"}, {" not in written
+
+    lines = write([stream, stream], "ndjson").splitlines()
+    assert [json.loads(line) for line in lines] == expected
+
+
+def test_writes_in_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(encoding, "WRITE_BUFFER_SIZE", 1)
+    writer = RecordingWriter()
+    streams = [make_stream(name=f"metric.{index}") for index in range(3)]
+
+    _ = write_metric_data(streams, cast("IO[bytes]", writer), "ndjson")
+
+    assert len(writer.chunks) == 4  # noqa: PLR2004
+    assert [json.loads(line)["name"] for line in writer.getvalue().splitlines()] == [
+        "metric.0",
+        "metric.1",
+        "metric.2",
+    ]
+    assert write([], "json") == b"[]\n"
+    assert write([], "ndjson") == b""
+
+
+def test_serializer_writes_converted_metrics(
+    oci_metrics_converter: DefaultMetricsConverter, metrics_data: MetricsData
+) -> None:
+    output = io.BytesIO()
+
+    _ = MetricsSerializer(oci_metrics_converter).write(metrics_data, output)
+
+    streams = list(oci_metrics_converter.convert_streams(metrics_data))
+    assert (
+        json.loads(output.getvalue())
+        == json.loads(encode_post_metric_data(streams))["metricData"]
+    )
+
+
+def test_exporter_posts_encoded_body(
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    exporter = OCIMonitoringExporter(
+        monitoring_client,
+        oci_metrics_converter,
+        payload_encoder=encode_post_metric_data,
+    )
+
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+
+    monitoring_client.post_metric_data.assert_called_once_with(
+        encode_post_metric_data(
+            list(oci_metrics_converter.convert_streams(metrics_data)),
+            exporter.batch_atomicity,
+        )
+    )
+
+
+def measure(function: Callable[[], object], repeat: int = 5) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _ = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@pytest.mark.benchmark
+def test_encoder_is_faster_than_sdk_serialization(
+    sdk_monitoring_client: MonitoringClient,
+) -> None:
+    streams: list[MetricStream] = []
+    for index in range(50):
+        stream = MetricStream(
+            namespace="my-namespace",
+            resource_group="my-resource-group",
+            compartment_id="my-compartment-id",
+            name=f"my.metric.{index}",
+            dimensions={f"dimension.{i}": f"value-{i}" for i in range(10)},
+        )
+        for point in range(20):
+            stream.append(1_724_678_400_000_000_000 + point * 10**9, point * 1.5)
+        streams.append(stream)
+    base_client = sdk_monitoring_client.base_client
+
+    def sdk_path() -> str:
+        details = PostMetricDataDetails(
+            metric_data=[stream.to_metric_data_details() for stream in streams],
+            batch_atomicity="ATOMIC",
+        )
+        return json.dumps(base_client.sanitize_for_serialization(details))  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType]
+
+    def encoder_path() -> bytes:
+        return encode_post_metric_data(streams, "ATOMIC")
+
+    assert encoder_path() == sdk_path().encode()
+    sdk_time = measure(sdk_path)
+    encoder_time = measure(encoder_path)
+    assert encoder_time * 3 < sdk_time
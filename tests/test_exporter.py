@@ -4,6 +4,8 @@ from oci.monitoring.models import PostMetricDataDetails
 from opentelemetry.sdk.metrics.export import MetricExportResult, MetricsData
 
 from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.batching import BatchLimits
+from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
 
 
 def test_post_metric_data(
@@ -20,3 +22,54 @@ def test_post_metric_data(
             batch_atomicity=oci_monitoring_exporter.batch_atomicity,
         )
     )
+
+
+def test_post_metric_data_in_batches(
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    exporter = OCIMonitoringExporter(
+        monitoring_client,
+        oci_metrics_converter,
+        batch_limits=BatchLimits(max_streams=1),
+    )
+
+    result = exporter.export(metrics_data)
+    assert result == MetricExportResult.SUCCESS
+
+    metric_data = list(oci_metrics_converter.convert(metrics_data))
+    assert monitoring_client.post_metric_data.call_count == len(metric_data)
+    for call, metric_data_details in zip(
+        monitoring_client.post_metric_data.call_args_list, metric_data
+    ):
+        assert call.args == (
+            PostMetricDataDetails(
+                metric_data=[metric_data_details],
+                batch_atomicity=exporter.batch_atomicity,
+            ),
+        )
+
+
+def test_post_metric_data_partial_failure(
+    monitoring_client: NonCallableMock,
+    post_metrics_data_response: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    exporter = OCIMonitoringExporter(
+        monitoring_client,
+        oci_metrics_converter,
+        batch_limits=BatchLimits(max_streams=1),
+    )
+    responses = [
+        post_metrics_data_response,
+        RuntimeError("connection reset"),
+        post_metrics_data_response,
+        post_metrics_data_response,
+    ]
+    monitoring_client.post_metric_data.side_effect = responses
+
+    result = exporter.export(metrics_data)
+    assert result == MetricExportResult.FAILURE
+    assert monitoring_client.post_metric_data.call_count == len(responses)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import pytest
+from opentelemetry.sdk.metrics.export import Gauge, Metric, MetricsData, NumberDataPoint
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+
+from opentelemetry_exporter_oci_monitoring.converter import (
+    DefaultMetricsConverter,
+    PrefixedDimensionsExtractor,
+)
+from opentelemetry_exporter_oci_monitoring.filters import FilterRules, NameFilter
+from tests import wrap_metrics
+
+RESOURCE = Resource({"service.name": "api", "k8s.pod.uid": "1", "k8s.node.name": "n"})
+SCOPE = InstrumentationScope("scope", version="1.0")
+
+
+def gauges(*names: str) -> MetricsData:
+    data_points = [
+        NumberDataPoint(
+            attributes={"host": "a", "request.id": i},
+            start_time_unix_nano=0,
+            time_unix_nano=i,
+            value=i,
+        )
+        for i in range(3)
+    ]
+    return wrap_metrics(
+        *(
+            Metric(name=name, description=None, unit=None, data=Gauge(data_points))
+            for name in names
+        ),
+        resources=[RESOURCE],
+        scope=SCOPE,
+    )
+
+
+def test_includes_and_excludes_names() -> None:
+    name_filter = NameFilter(
+        FilterRules(include=["http.*", "rpc.*"], exclude=["*.debug"])
+    )
+
+    assert name_filter("http.server.duration")
+    assert name_filter("rpc.client.duration")
+    assert not name_filter("http.server.debug")
+    assert not name_filter("process.cpu.time")
+    assert NameFilter(FilterRules(exclude=["process.*"]))("http.server.duration")
+
+
+def test_matches_regular_expressions() -> None:
+    name_filter = NameFilter(FilterRules(include=[r"http\.server\..+"], syntax="regex"))
+
+    assert name_filter("http.server.duration")
+    assert not name_filter("http.server")
+    assert not name_filter("xhttp.server.duration")
+
+
+def test_memoizes_decisions() -> None:
+    name_filter = NameFilter(FilterRules(include=["http.*"]))
+
+    for _ in range(3):
+        assert name_filter("http.server.duration")
+
+    assert name_filter.cache_info()[:2] == (2, 1)
+
+
+def test_keeps_mappings_without_rejected_keys() -> None:
+    name_filter = NameFilter(FilterRules(exclude=["k8s.*"]))
+    attributes = {"service.name": "api"}
+
+    assert name_filter.filter_keys(attributes) is attributes
+    assert name_filter.filter_keys({**attributes, "k8s.pod.uid": "1"}) == attributes
+
+
+def test_converter_drops_filtered_metrics() -> None:
+    converter = DefaultMetricsConverter(
+        "namespace",
+        "resource-group",
+        "compartment-id",
+        metric_filter=FilterRules(exclude=["*.debug"]),
+    )
+
+    streams = converter.convert_streams(gauges("requests", "requests.debug"))
+
+    assert {stream.name for stream in streams} == {"requests"}
+
+
+def test_extractor_drops_filtered_attributes() -> None:
+    converter = DefaultMetricsConverter(
+        "namespace",
+        "resource-group",
+        "compartment-id",
+        dimensions_extractor=PrefixedDimensionsExtractor(
+            resource_attributes_filter=FilterRules(exclude=["k8s.pod.*"]),
+            scope_attributes_filter=FilterRules(include=["name"]),
+            datapoint_attributes_filter=FilterRules(exclude=["request.id"]),
+        ),
+    )
+
+    streams = list(converter.convert_streams(gauges("requests")))
+
+    # the data points only differed by the filtered attribute
+    assert len(streams) == 1
+    assert streams[0].dimensions == {
+        "scope.name": "scope",
+        "service.name": "api",
+        "k8s.node.name": "n",
+        "host": "a",
+    }
+    assert streams[0].values == [0.0, 1.0, 2.0]  # noqa: PD011
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"syntax": "sql"}, "syntax must be one of"),
+        ({"cache_size": 0}, "cache_size must be at least 1"),
+        ({"include": ["("], "syntax": "regex"}, "invalid pattern"),
+    ],
+)
+def test_validates_rules(kwargs: dict[str, object], message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        _ = FilterRules(**kwargs)  # pyright: ignore[reportArgumentType]
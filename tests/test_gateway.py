@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from datetime import timedelta
+from http import HTTPStatus
+from http.client import HTTPConnection
+from typing import TYPE_CHECKING, Iterator, cast
+from unittest.mock import NonCallableMock
+
+import pytest
+from oci.monitoring.models import PostMetricDataDetails
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    Histogram,
+    MetricsData,
+    NumberDataPoint,
+    Sum,
+)
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter, otlp
+from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+from opentelemetry_exporter_oci_monitoring.gateway import (
+    MetricsGateway,
+    make_server,
+    merge_metrics_data,
+)
+from opentelemetry_exporter_oci_monitoring.otlp import (
+    JSON_CONTENT_TYPE,
+    PROTOBUF_CONTENT_TYPE,
+    OTLPDecodeError,
+    UnsupportedContentTypeError,
+    decode_export_request,
+)
+from opentelemetry_exporter_oci_monitoring.temporality import CumulativeToDelta
+
+if TYPE_CHECKING:
+    from socketserver import BaseServer
+
+NANOS = 1_724_678_400 * 10**9
+
+
+def export_request(
+    pid: int,
+    value: int,
+    *,
+    temporality: str = "AGGREGATION_TEMPORALITY_DELTA",
+    start: int = NANOS,
+    minute: int = 0,
+) -> dict[str, object]:
+    return {
+        "resourceMetrics": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": "api"}}
+                    ]
+                },
+                "scopeMetrics": [
+                    {
+                        "scope": {"name": "my.scope", "version": "1.0"},
+                        "metrics": [
+                            {
+                                "name": "http.requests",
+                                "unit": "1",
+                                "sum": {
+                                    "aggregationTemporality": temporality,
+                                    "isMonotonic": True,
+                                    "dataPoints": [
+                                        {
+                                            "attributes": [
+                                                {
+                                                    "key": "route",
+                                                    "value": {"stringValue": "/"},
+                                                },
+                                                {
+                                                    "key": "codes",
+                                                    "value": {
+                                                        "arrayValue": {
+                                                            "values": [
+                                                                {"intValue": "200"}
+                                                            ]
+                                                        }
+                                                    },
+                                                },
+                                            ],
+                                            "startTimeUnixNano": str(start),
+                                            "timeUnixNano": str(
+                                                NANOS + minute * 60 * 10**9 + pid
+                                            ),
+                                            "asInt": str(value),
+                                        }
+                                    ],
+                                },
+                            },
+                            {
+                                "name": "latency",
+                                "histogram": {
+                                    "aggregationTemporality": 1,
+                                    "dataPoints": [
+                                        {
+                                            "timeUnixNano": str(NANOS),
+                                            "count": "2",
+                                            "sum": 3.0,
+                                            "bucketCounts": ["1", "1"],
+                                            "explicitBounds": [1.0],
+                                        }
+                                    ],
+                                },
+                            },
+                            {"name": "unsupported", "summary": {"dataPoints": []}},
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def test_decode_json() -> None:
+    body = json.dumps(export_request(pid=1, value=5)).encode()
+
+    metrics_data = decode_export_request(body, f"{JSON_CONTENT_TYPE}; charset=utf-8")
+
+    resource_metrics = metrics_data.resource_metrics[0]
+    assert resource_metrics.resource.attributes == {"service.name": "api"}
+    scope_metrics = resource_metrics.scope_metrics[0]
+    assert scope_metrics.scope.version == "1.0"
+    assert [metric.name for metric in scope_metrics.metrics] == [
+        "http.requests",
+        "latency",
+    ]
+    counter, latency = (metric.data for metric in scope_metrics.metrics)
+    assert isinstance(counter, Sum)
+    assert counter.aggregation_temporality is AggregationTemporality.DELTA  # pyright: ignore[reportUnknownMemberType]
+    assert counter.data_points[0] == NumberDataPoint(
+        attributes={"route": "/", "codes": (200,)},
+        start_time_unix_nano=NANOS,
+        time_unix_nano=NANOS + 1,
+        value=5,
+    )
+    assert isinstance(latency, Histogram)
+    assert latency.data_points[0].bucket_counts == [1, 1]
+
+
+def test_decode_without_scope_attributes(monkeypatch: pytest.MonkeyPatch) -> None:
+    # opentelemetry-sdk < 1.27 has no scope attributes
+    monkeypatch.setattr(otlp, "_SCOPE_HAS_ATTRIBUTES", False)
+    body = json.dumps(export_request(pid=1, value=5)).encode()
+
+    metrics_data = decode_export_request(body, JSON_CONTENT_TYPE)
+
+    scope = metrics_data.resource_metrics[0].scope_metrics[0].scope
+    assert (scope.name, scope.version) == ("my.scope", "1.0")
+
+
+def test_decode_protobuf() -> None:
+    json_format = pytest.importorskip("google.protobuf.json_format")
+    metrics_service = pytest.importorskip(
+        "opentelemetry.proto.collector.metrics.v1.metrics_service_pb2"
+    )
+    message = json_format.ParseDict(
+        export_request(pid=1, value=5), metrics_service.ExportMetricsServiceRequest()
+    )
+
+    metrics_data = decode_export_request(
+        message.SerializeToString(), PROTOBUF_CONTENT_TYPE
+    )
+
+    assert metrics_data == decode_export_request(
+        json.dumps(export_request(pid=1, value=5)).encode(), JSON_CONTENT_TYPE
+    )
+
+
+def test_decode_rejects_invalid_requests() -> None:
+    with pytest.raises(UnsupportedContentTypeError):
+        _ = decode_export_request(b"", "text/plain")
+    with pytest.raises(OTLPDecodeError):
+        _ = decode_export_request(b"[]", JSON_CONTENT_TYPE)
+    with pytest.raises(OTLPDecodeError):
+        _ = decode_export_request(
+            b'{"resourceMetrics": [{"scopeMetrics": [{"metrics": [{"sum": {}}]}]}]}',
+            JSON_CONTENT_TYPE,
+        )
+
+
+def test_merge_metrics_data(metrics_data: MetricsData) -> None:
+    merged = merge_metrics_data([metrics_data, metrics_data])
+
+    assert len(merged.resource_metrics) == 1
+    (scope_metrics,) = merged.resource_metrics[0].scope_metrics
+    (metric,) = scope_metrics.metrics
+    original = metrics_data.resource_metrics[0].scope_metrics[0].metrics[0]
+    assert len(metric.data.data_points) == 8 * len(original.data.data_points)
+    assert len(original.data.data_points) == 13  # noqa: PLR2004
+
+
+def test_merged_streams_are_aggregated() -> None:
+    converter = DefaultMetricsConverter(
+        "namespace",
+        "resource-group",
+        "compartment-id",
+        aggregation_resolution=timedelta(minutes=1),
+    )
+    merged = merge_metrics_data(
+        decode_export_request(
+            json.dumps(export_request(pid=pid, value=pid)).encode(), JSON_CONTENT_TYPE
+        )
+        for pid in range(1, 33)
+    )
+
+    counter = next(
+        stream
+        for stream in (*converter.convert_streams(merged), *converter.flush_streams())
+        if stream.name == "http.requests"
+    )
+
+    assert counter.values == [sum(range(1, 33))]  # noqa: PD011
+
+
+@pytest.mark.parametrize(
+    ("start_time_unix_nano", "expected"),
+    [(0, [10, 20]), (NANOS, [20])],
+    ids=["processes-started-later", "processes-started-earlier"],
+)
+def test_cumulative_streams_are_summed_across_processes(
+    start_time_unix_nano: int, expected: list[int]
+) -> None:
+    converter = DefaultMetricsConverter(
+        "namespace",
+        "resource-group",
+        "compartment-id",
+        aggregation_resolution=timedelta(minutes=1),
+    )
+    cumulative_to_delta = CumulativeToDelta(start_time_unix_nano=start_time_unix_nano)
+    # every process counts pid requests in the first minute and 2 * pid in the second
+    merged = merge_metrics_data(
+        cumulative_to_delta.convert(
+            decode_export_request(
+                json.dumps(
+                    export_request(
+                        pid=pid,
+                        value=pid * (1 + 2 * minute),
+                        temporality="AGGREGATION_TEMPORALITY_CUMULATIVE",
+                        start=NANOS - pid,
+                        minute=minute,
+                    )
+                ).encode(),
+                JSON_CONTENT_TYPE,
+            )
+        )
+        for minute in range(2)
+        for pid in range(1, 5)
+    )
+
+    # the closed minute is converted, the open one is flushed
+    values = [
+        value
+        for stream in (*converter.convert_streams(merged), *converter.flush_streams())
+        if stream.name == "http.requests"
+        for value in stream.values  # noqa: PD011
+    ]
+
+    assert values == expected
+
+
+def test_gateway_interns_resources_and_scopes() -> None:
+    exporter = NonCallableMock(spec_set=OCIMonitoringExporter)
+    gateway = MetricsGateway(exporter)
+    exported: list[MetricsData] = []
+    for minute in range(2):
+        body = json.dumps(export_request(pid=1, value=1, minute=minute)).encode()
+        assert gateway.receive(decode_export_request(body, JSON_CONTENT_TYPE))
+        _ = gateway.export_pending()
+        exported.append(exporter.export.call_args.args[0])
+
+    first, second = (metrics_data.resource_metrics[0] for metrics_data in exported)
+    assert second.resource is first.resource
+    assert second.scope_metrics[0].scope is first.scope_metrics[0].scope
+
+
+@pytest.fixture
+def gateway(
+    monitoring_client: NonCallableMock, oci_metrics_converter: DefaultMetricsConverter
+) -> MetricsGateway:
+    return MetricsGateway(
+        OCIMonitoringExporter(monitoring_client, oci_metrics_converter),
+        max_pending_data_points=3,
+    )
+
+
+@pytest.fixture
+def server(gateway: MetricsGateway) -> Iterator[BaseServer]:
+    server = make_server(gateway, address=("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def post(server: BaseServer, body: bytes, headers: dict[str, str]) -> tuple[int, bytes]:
+    host, port = cast("tuple[str, int]", server.server_address)
+    connection = HTTPConnection(host, port)
+    try:
+        connection.request("POST", "/v1/metrics", body, headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def test_gateway_exports_received_metrics(
+    server: BaseServer, gateway: MetricsGateway, monitoring_client: NonCallableMock
+) -> None:
+    body = gzip.compress(json.dumps(export_request(pid=1, value=5)).encode())
+    headers = {"Content-Type": JSON_CONTENT_TYPE, "Content-Encoding": "gzip"}
+
+    assert post(server, body, headers) == (HTTPStatus.OK, b"{}")
+    # the buffer holds at most three data points
+    assert post(server, body, headers)[0] == HTTPStatus.SERVICE_UNAVAILABLE
+    assert gateway.rejected_data_points == 2  # noqa: PLR2004
+
+    gateway.shutdown()
+
+    details = monitoring_client.post_metric_data.call_args.args[0]
+    assert isinstance(details, PostMetricDataDetails)
+    assert {metric.name for metric in details.metric_data} == {
+        "http.requests",
+        "latency",
+    }
+
+
+def test_gateway_rejects_invalid_requests(server: BaseServer) -> None:
+    assert post(server, b"{", {"Content-Type": JSON_CONTENT_TYPE})[0] == (
+        HTTPStatus.BAD_REQUEST
+    )
+    assert post(server, b"", {"Content-Type": "text/plain"})[0] == (
+        HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+    )
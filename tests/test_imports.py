@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from benchmarks.imports import (
+    ImportMeasurement,
+    find_import_regressions,
+    measure_import,
+    parse_importtime,
+)
+
+
+def test_parse_importtime() -> None:
+    output = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   json.decoder
+import time:       380 |        500 | json
+"""
+
+    assert parse_importtime(output) == {"json.decoder": 120, "json": 500}
+
+
+def test_find_import_regressions() -> None:
+    measurement = ImportMeasurement("package", 1_000, frozenset({"package", "oci"}))
+
+    assert find_import_regressions(
+        measurement, {"package": {"microseconds": 500}}, 0.1
+    ) == ["package: imports oci eagerly", "package: 1,000 µs, baseline 500 µs"]
+
+
+def test_import_is_lazy() -> None:
+    assert measure_import(repeat=1).lazy_modules == []
+
+
+ENCODER_EXPORT = """
+import sys
+from types import SimpleNamespace
+
+from benchmarks.workload import SCENARIOS, make_metrics_data
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+from opentelemetry_exporter_oci_monitoring.encoding import encode_post_metric_data
+
+class Client:
+    def post_metric_data(self, body):
+        data = SimpleNamespace(failed_metrics_count=0, failed_metrics=[])
+        return SimpleNamespace(status=200, data=data)
+
+exporter = OCIMonitoringExporter(
+    Client(),
+    DefaultMetricsConverter("namespace", "resource-group", "compartment-id"),
+    payload_encoder=encode_post_metric_data,
+)
+exporter.export(make_metrics_data(SCENARIOS["small"]))
+sys.exit(any(name.split(".")[0] == "oci" for name in sys.modules))
+"""
+
+
+def test_encoder_path_does_not_import_oci() -> None:
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", ENCODER_EXPORT], capture_output=True, check=False
+    )
+
+    assert process.returncode == 0, process.stderr
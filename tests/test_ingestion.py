@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+from http import HTTPStatus
+
+import pytest
+from opentelemetry.sdk.metrics.export import MetricExportResult
+
+from benchmarks.ingestion import (
+    FakeIngestionServer,
+    FakeIngestionService,
+    FaultInjection,
+    IngestionLimits,
+    make_monitoring_client,
+)
+from benchmarks.load import LoadSettings, percentiles, run_load
+from benchmarks.workload import SCENARIOS, make_metrics_data
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+from opentelemetry_exporter_oci_monitoring.encoding import encode_post_metric_data
+
+WORKLOAD = SCENARIOS["small"]
+NOW = 1_700_000_000.0
+
+
+def make_body(*names: str, atomicity: str = "NON_ATOMIC") -> bytes:
+    metric_data = [
+        {
+            "namespace": "namespace",
+            "compartmentId": "compartment-id",
+            "name": name,
+            "dimensions": {"host": "a"},
+            "datapoints": [{"timestamp": "2023-11-14T22:13:20Z", "value": 1.0}],
+        }
+        for name in names
+    ]
+    return json.dumps({"metricData": metric_data, "batchAtomicity": atomicity}).encode()
+
+
+def test_ingestion_reports_failed_metrics() -> None:
+    service = FakeIngestionService(clock=lambda: NOW)
+
+    response = service.post_metric_data(make_body("valid", "in valid"))
+
+    assert response.status == HTTPStatus.OK
+    assert response.body["failedMetricsCount"] == 1
+    assert response.body["failedMetrics"][0]["metricData"]["name"] == "in valid"
+    assert service.stats().accepted_datapoints == 1
+
+
+def test_ingestion_rejects_names_without_leading_letter() -> None:
+    service = FakeIngestionService(clock=lambda: NOW)
+
+    response = service.post_metric_data(make_body("2xx.count"))
+
+    assert response.body["failedMetricsCount"] == 1
+
+
+def test_ingestion_atomic_batch_accepts_nothing_on_failure() -> None:
+    service = FakeIngestionService(clock=lambda: NOW)
+
+    response = service.post_metric_data(
+        make_body("valid", "in valid", atomicity="ATOMIC")
+    )
+
+    assert response.body["failedMetricsCount"] == 1
+    assert service.stats().accepted_streams == 0
+
+
+def test_ingestion_rejects_too_many_streams() -> None:
+    service = FakeIngestionService(IngestionLimits(max_streams=1), clock=lambda: NOW)
+
+    assert (
+        service.post_metric_data(make_body("a", "b")).status == HTTPStatus.BAD_REQUEST
+    )
+    assert service.stats().rejected_requests == 1
+
+
+def test_exporter_fails_when_throttled() -> None:
+    service = FakeIngestionService(faults=FaultInjection(throttle_ratio=1))
+    server = FakeIngestionServer(service)
+    server.start()
+    try:
+        exporter = OCIMonitoringExporter(
+            make_monitoring_client(server.endpoint),
+            DefaultMetricsConverter("namespace", "resource-group", "compartment-id"),
+            payload_encoder=encode_post_metric_data,
+        )
+        result = exporter.export(make_metrics_data(WORKLOAD))
+    finally:
+        server.stop()
+
+    assert result == MetricExportResult.FAILURE
+    assert service.stats().throttled_requests >= 1
+
+
+def test_percentiles() -> None:
+    assert percentiles([]) == (0, 0, 0, 0)
+    assert percentiles(range(1, 101)) == (50, 90, 99, 100)
+
+
+@pytest.mark.benchmark
+def test_run_load() -> None:
+    report = run_load(
+        LoadSettings(duration_seconds=0.3, export_interval_millis=100, threads=1)
+    )
+
+    assert report.measurements > 0
+    assert report.exports >= 1
+    assert report.failed_exports == 0
+    assert report.accepted_datapoints > 0
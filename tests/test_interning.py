@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Mapping
+
+import pytest
+from opentelemetry.sdk.metrics.export import Gauge, MetricsData, NumberDataPoint
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+
+from opentelemetry_exporter_oci_monitoring.converter import (
+    AttributeSetInterner,
+    DefaultMetricsConverter,
+    PrefixedDimensionsExtractor,
+)
+from tests import wrap_metrics
+
+if TYPE_CHECKING:
+    from opentelemetry_exporter_oci_monitoring.converter import DataPoint
+
+
+def test_interner_reuses_normalized_dimensions() -> None:
+    interner = AttributeSetInterner(maxsize=8)
+
+    first = interner.intern({"b": 1, "a": "x"})
+    second = interner.intern({"b": 1, "a": "x"})
+
+    assert second is first
+    assert first.dimensions == {"a": "x", "b": "1"}
+    assert interner.cache_info().hits == 1
+    assert interner.cache_info().misses == 1
+
+
+def test_interned_dimensions_are_immutable() -> None:
+    interned = AttributeSetInterner().intern({"a": "x"})
+
+    with pytest.raises(TypeError):
+        interned.dimensions["a"] = "y"  # pyright: ignore[reportIndexIssue]
+
+
+def test_stream_key_does_not_depend_on_attribute_order() -> None:
+    interner = AttributeSetInterner()
+
+    first = interner.intern({"a": "x", "b": True})
+    second = interner.intern({"b": True, "a": "x"})
+
+    assert first.key == second.key
+    assert first.dimensions == second.dimensions
+
+
+def test_interner_accepts_list_values() -> None:
+    interner = AttributeSetInterner()
+
+    first = interner.intern({"a": [1, 2]})
+    second = interner.intern({"a": [1, 2]})
+
+    assert second is first
+    assert first.dimensions == {"a": "1,2"}
+
+
+def test_interner_distinguishes_equal_values_of_different_types() -> None:
+    interner = AttributeSetInterner()
+
+    dimensions = [
+        interner.intern({"code": value}).dimensions
+        for value in (1, True, 1.0, [1], [True])
+    ]
+
+    assert dimensions == [
+        {"code": "1"},
+        {"code": "true"},
+        {"code": "1.0"},
+        {"code": "1"},
+        {"code": "true"},
+    ]
+
+
+def test_converter_keeps_streams_of_equal_values_of_different_types() -> None:
+    data_points = [
+        NumberDataPoint(
+            attributes={"code": code},
+            start_time_unix_nano=0,
+            time_unix_nano=index * 1_000_000_000,
+            value=index,
+        )
+        for index, code in enumerate((1, True, 1.0), start=1)
+    ]
+    metrics_data = wrap_metrics(Gauge(data_points))
+    converter = DefaultMetricsConverter(
+        "my-namespace", "my-resource-group", "my-compartment-id"
+    )
+
+    streams = {
+        stream.dimensions["code"]: [point.value for point in stream.datapoints]
+        for stream in converter.convert(metrics_data)
+    }
+
+    assert streams == {"1": [1.0], "true": [2.0], "1.0": [3.0]}
+
+
+def test_interner_evicts_least_recently_used() -> None:
+    interner = AttributeSetInterner(maxsize=2)
+
+    for value in ("x", "y", "z"):
+        _ = interner.intern({"a": value})
+    _ = interner.intern({"a": "x"})
+
+    cache_info = interner.cache_info()
+    assert cache_info.evictions == 2  # noqa: PLR2004
+    assert cache_info.misses == 4  # noqa: PLR2004
+    assert cache_info.currsize == cache_info.maxsize
+
+
+def test_interner_merges_base_dimensions() -> None:
+    interner = AttributeSetInterner()
+
+    interned = interner.intern({"a": "x"}, 1, {"scope.name": "foo", "a": "y"})
+    other = interner.intern({"a": "x"}, 2, {"scope.name": "bar"})
+
+    assert interned.dimensions == {"scope.name": "foo", "a": "x"}
+    assert other.dimensions == {"scope.name": "bar", "a": "x"}
+
+
+def test_extractor_exposes_cache_info(number_data_point: NumberDataPoint) -> None:
+    extractor = PrefixedDimensionsExtractor()
+    resource = Resource({})
+    scope = InstrumentationScope(name="foo")
+
+    for _ in range(3):
+        _ = extractor.extract(resource, scope, number_data_point)
+
+    assert extractor.cache_info().hits == 2  # noqa: PLR2004
+
+
+class PlainDimensionsExtractor:
+    def extract(
+        self,
+        resource: Resource,  # noqa: ARG002
+        scope: InstrumentationScope,  # noqa: ARG002
+        data_point: DataPoint,
+    ) -> Mapping[str, str]:
+        return {key: str(value) for key, value in (data_point.attributes or {}).items()}
+
+
+def test_converter_supports_plain_extractors(metrics_data: MetricsData) -> None:
+    converter = DefaultMetricsConverter(
+        "my-namespace",
+        "my-resource-group",
+        "my-compartment-id",
+        dimensions_extractor=PlainDimensionsExtractor(),
+    )
+    default_converter = DefaultMetricsConverter(
+        "my-namespace", "my-resource-group", "my-compartment-id"
+    )
+
+    converted = list(converter.convert(metrics_data))
+    assert len(converted) == len(list(default_converter.convert(metrics_data)))
+    assert converted[0].dimensions["a.string"] == "bar"
@@ -45,3 +45,38 @@ def test_prefixed_dimensions(
         "a.list.of.integers": "-3,5,42",
         "a.list.of.floats": "3.3,-3.3,0.0",
     }
+
+
+def test_static_dimensions_are_cached(number_data_point: NumberDataPoint) -> None:
+    resource = Resource(attributes={"service.name": "foo"})
+    scope = InstrumentationScope(name="my-name")
+    extractor = PrefixedDimensionsExtractor(prefix_resource="resource.")
+
+    static_dimensions = extractor.extract_static(resource, scope)
+    assert static_dimensions == {
+        "scope.name": "my-name",
+        "resource.service.name": "foo",
+    }
+    assert extractor.extract_static(resource, scope) is static_dimensions
+
+    dimensions = extractor.extract(resource, scope, number_data_point)
+    assert dimensions.items() >= static_dimensions.items()
+
+    other_resource = Resource(attributes={"service.name": "bar"})
+    other_static_dimensions = extractor.extract_static(other_resource, scope)
+    assert other_static_dimensions["resource.service.name"] == "bar"
+
+
+def test_static_dimensions_cache_is_bounded() -> None:
+    scope = InstrumentationScope(name="my-name")
+    extractor = PrefixedDimensionsExtractor(cache_size=2)
+
+    resources = [Resource(attributes={"index": index}) for index in range(3)]
+    static_dimensions = [
+        extractor.extract_static(resource, scope) for resource in resources
+    ]
+
+    assert extractor.extract_static(resources[2], scope) is static_dimensions[2]
+    recomputed = extractor.extract_static(resources[0], scope)
+    assert recomputed is not static_dimensions[0]
+    assert recomputed == static_dimensions[0]
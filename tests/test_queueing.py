@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+from unittest.mock import DEFAULT
+
+import pytest
+from opentelemetry.sdk.metrics.export import MetricExportResult
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.batching import BatchLimits
+from opentelemetry_exporter_oci_monitoring.queueing import (
+    ExportQueue,
+    OverflowPolicy,
+    QueueSettings,
+)
+from opentelemetry_exporter_oci_monitoring.spool import DiskSpool, SpoolSettings
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from unittest.mock import NonCallableMock
+
+    from opentelemetry.sdk.metrics.export import MetricsData
+
+    from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+
+
+class BlockingProcessor:
+    """Records items, but only once released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.items: list[int] = []
+        self.started = threading.Event()
+        self.released = threading.Event()
+
+    def __call__(self, item: int) -> None:
+        self.started.set()
+        _ = self.released.wait(5)
+        self.items.append(item)
+
+
+def fill(queue: ExportQueue[int], processor: BlockingProcessor, count: int) -> None:
+    # the first item is taken by the worker and blocks it
+    assert queue.put(0)
+    assert processor.started.wait(5)
+    for item in range(1, count + 1):
+        _ = queue.put(item)
+
+
+@pytest.mark.parametrize(
+    ("overflow_policy", "expected_items"),
+    [
+        (OverflowPolicy.DROP_OLDEST, [0, 3, 4]),
+        (OverflowPolicy.DROP_NEWEST, [0, 1, 2]),
+        (OverflowPolicy.BLOCK, [0, 1, 2]),
+    ],
+)
+def test_overflow_policy(
+    overflow_policy: OverflowPolicy, expected_items: list[int]
+) -> None:
+    processor = BlockingProcessor()
+    queue = ExportQueue(
+        processor,
+        QueueSettings(
+            max_size=2, overflow_policy=overflow_policy, block_timeout_millis=10
+        ),
+    )
+
+    fill(queue, processor, 4)
+    assert len(queue) == 2  # noqa: PLR2004
+    assert queue.dropped == 2  # noqa: PLR2004
+
+    processor.released.set()
+    assert queue.flush(5_000)
+    assert processor.items == expected_items
+
+
+def test_block_waits_for_space() -> None:
+    processor = BlockingProcessor()
+    queue = ExportQueue(
+        processor,
+        QueueSettings(
+            max_size=1, overflow_policy=OverflowPolicy.BLOCK, block_timeout_millis=5_000
+        ),
+    )
+    fill(queue, processor, 1)
+
+    timer = threading.Timer(0.05, processor.released.set)
+    timer.start()
+    assert queue.put(2)
+    timer.join()
+
+    assert queue.shutdown(5_000)
+    assert processor.items == [0, 1, 2]
+    assert queue.dropped == 0
+
+
+def test_flush_times_out() -> None:
+    processor = BlockingProcessor()
+    queue = ExportQueue(processor, QueueSettings())
+    fill(queue, processor, 1)
+
+    assert not queue.flush(10)
+
+    processor.released.set()
+    assert queue.flush(5_000)
+
+
+def test_shutdown_drains_and_rejects() -> None:
+    processor = BlockingProcessor()
+    queue = ExportQueue(processor, QueueSettings())
+    fill(queue, processor, 3)
+
+    assert not queue.shutdown(10)
+    assert not queue.put(4)
+
+    processor.released.set()
+    assert queue.shutdown(5_000)
+    assert processor.items == [0, 1, 2, 3]
+
+
+def test_processing_errors_do_not_stop_the_worker() -> None:
+    items: list[int] = []
+
+    def process(item: int) -> None:
+        if item == 0:
+            raise RuntimeError
+        items.append(item)
+
+    queue = ExportQueue(process, QueueSettings())
+    assert queue.put(0)
+    assert queue.put(1)
+
+    assert queue.shutdown(5_000)
+    assert items == [1]
+
+
+def test_exporter_posts_in_background(
+    monitoring_client: NonCallableMock,
+    post_metrics_data_response: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    released = threading.Event()
+
+    def post_metric_data(*args: object) -> NonCallableMock:  # noqa: ARG001
+        _ = released.wait(5)
+        return post_metrics_data_response
+
+    monitoring_client.post_metric_data.side_effect = post_metric_data
+    exporter = OCIMonitoringExporter(
+        monitoring_client,
+        oci_metrics_converter,
+        batch_limits=BatchLimits(max_streams=1),
+        export_queue=QueueSettings(),
+    )
+
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+    assert not exporter.force_flush(10)
+
+    released.set()
+    assert exporter.force_flush(5_000)
+    metric_data_count = len(list(oci_metrics_converter.convert(metrics_data)))
+    assert monitoring_client.post_metric_data.call_count == metric_data_count
+
+    exporter.shutdown(5_000)
+    assert exporter.export(metrics_data) == MetricExportResult.FAILURE
+
+
+def test_exporter_keeps_the_spool_open_for_a_running_worker(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    closed: list[DiskSpool] = []
+
+    def close(spool: DiskSpool) -> None:
+        closed.append(spool)
+
+    monkeypatch.setattr(DiskSpool, "close", close)
+    released = threading.Event()
+
+    def post_metric_data(*args: object) -> object:  # noqa: ARG001
+        _ = released.wait(5)
+        return DEFAULT
+
+    monitoring_client.post_metric_data.side_effect = post_metric_data
+    exporter = OCIMonitoringExporter(
+        monitoring_client,
+        oci_metrics_converter,
+        export_queue=QueueSettings(),
+        spool=SpoolSettings(tmp_path),
+    )
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+
+    exporter.shutdown(10)
+    assert closed == []
+
+    released.set()
+    exporter.shutdown(5_000)
+    assert len(closed) == 1
+
+
+@pytest.mark.parametrize(("max_size", "block_timeout_millis"), [(0, 1_000), (1, -1)])
+def test_invalid_settings(max_size: int, block_timeout_millis: float) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        _ = QueueSettings(max_size=max_size, block_timeout_millis=block_timeout_millis)
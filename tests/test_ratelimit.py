@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import pytest
+from oci.exceptions import ServiceError
+from opentelemetry.sdk.metrics.export import MetricExportResult
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter, ratelimit
+from opentelemetry_exporter_oci_monitoring.ratelimit import (
+    RateLimiter,
+    RateLimitInfo,
+    RateLimitSettings,
+    shared_rate_limiter,
+)
+
+if TYPE_CHECKING:
+    from unittest.mock import NonCallableMock
+
+    from opentelemetry.sdk.metrics.export import MetricsData
+
+    from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        super().__init__()
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _no_shared_limiters(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ratelimit, "_shared_limiters", {})
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_admits_bursts_then_the_rate(clock: FakeClock) -> None:
+    limiter = RateLimiter(RateLimitSettings(rate=2, burst=2, jitter=0), clock=clock)
+
+    assert [limiter.reserve() for _ in range(4)] == [0, 0, 0.5, 1.0]
+    clock.now += 2
+    assert limiter.reserve() == 0
+    assert limiter.info().delayed_requests == 2  # noqa: PLR2004
+
+
+def test_gives_up_at_the_deadline(clock: FakeClock) -> None:
+    limiter = RateLimiter(RateLimitSettings(rate=1, burst=1, jitter=0), clock=clock)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve(deadline=clock.now + 0.5) is None
+    assert limiter.reserve(deadline=clock.now + 1) == 1
+
+
+def test_jitters_waits(clock: FakeClock) -> None:
+    settings = RateLimitSettings(rate=1, burst=1, jitter=0.5, random=lambda: 1.0)
+    limiter = RateLimiter(settings, clock=clock)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 1.5  # noqa: PLR2004
+
+
+def test_adapts_the_rate(clock: FakeClock) -> None:
+    settings = RateLimitSettings(rate=8, burst=8, min_rate=1, increase=1)
+    limiter = RateLimiter(settings, clock=clock)
+
+    limiter.record(HTTPStatus.TOO_MANY_REQUESTS)
+    limiter.record(HTTPStatus.TOO_MANY_REQUESTS)  # same burst
+    assert limiter.info() == RateLimitInfo(4, 2, 0)
+
+    for _ in range(3):
+        clock.now += 1
+        limiter.record(HTTPStatus.TOO_MANY_REQUESTS)
+    assert limiter.info().rate == 1
+
+    for _ in range(10):
+        limiter.record(HTTPStatus.OK)
+    limiter.record(HTTPStatus.BAD_REQUEST)
+    assert limiter.info().rate == 8  # noqa: PLR2004
+
+
+def test_shares_one_limiter_per_key() -> None:
+    settings = RateLimitSettings(rate=5)
+
+    assert shared_rate_limiter(settings) is shared_rate_limiter(RateLimitSettings(5))
+    assert shared_rate_limiter(settings) is not shared_rate_limiter(
+        RateLimitSettings(rate=6, key="other-tenancy")
+    )
+
+
+def test_rejects_conflicting_settings_of_a_key(
+    monitoring_client: NonCallableMock, oci_metrics_converter: DefaultMetricsConverter
+) -> None:
+    _ = OCIMonitoringExporter(
+        monitoring_client, oci_metrics_converter, rate_limit=RateLimitSettings(5)
+    )
+
+    with pytest.raises(ValueError, match="'default' is shared with other settings"):
+        _ = OCIMonitoringExporter(
+            monitoring_client,
+            oci_metrics_converter,
+            rate_limit=RateLimitSettings(5, jitter=0.5),
+        )
+
+
+def test_exporter_records_throttling(
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    monitoring_client.post_metric_data.side_effect = ServiceError(
+        HTTPStatus.TOO_MANY_REQUESTS, "TooManyRequests", {}, "throttled"
+    )
+    settings = RateLimitSettings(rate=10)
+    exporters = [
+        OCIMonitoringExporter(
+            monitoring_client, oci_metrics_converter, rate_limit=settings
+        )
+        for _ in range(2)
+    ]
+
+    for exporter in exporters:
+        assert exporter.export(metrics_data) == MetricExportResult.FAILURE
+
+    info = shared_rate_limiter(settings).info()
+    assert info.throttled_responses == 2  # noqa: PLR2004
+    assert info.rate == 5  # noqa: PLR2004
+
+
+def test_exporter_fails_without_token_before_the_deadline(
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    exporter = OCIMonitoringExporter(
+        monitoring_client,
+        oci_metrics_converter,
+        rate_limit=RateLimitSettings(rate=0.01, burst=1, min_rate=0.01),
+    )
+
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+    assert exporter.export(metrics_data, 10) == MetricExportResult.FAILURE
+    assert monitoring_client.post_metric_data.call_count == 1
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"burst": 0}, "burst must be at least 1"),
+        ({"min_rate": 0}, "min_rate must be positive"),
+        ({"rate": 1, "min_rate": 2}, "min_rate must be positive and at most rate"),
+        ({"increase": -1}, "increase must not be negative"),
+        ({"decrease_factor": 1}, "decrease_factor must be between 0 and 1"),
+        ({"jitter": 2}, "jitter must be between 0 and 1"),
+    ],
+)
+def test_validates_settings(kwargs: dict[str, object], message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        _ = RateLimitSettings(**kwargs)  # pyright: ignore[reportArgumentType]
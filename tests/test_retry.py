@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import TYPE_CHECKING
+from unittest.mock import NonCallableMock
+
+import pytest
+from oci.exceptions import ServiceError
+from oci.monitoring.models import (
+    FailedMetricRecord,
+    PostMetricDataDetails,
+    PostMetricDataResponseDetails,
+)
+from oci.response import Response
+from opentelemetry.sdk.metrics.export import MetricExportResult
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.retry import RetryPolicy, parse_retry_after
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics.export import MetricsData
+
+    from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+
+FAST_RETRIES = RetryPolicy(initial_backoff_millis=1, max_backoff_millis=1, jitter=0)
+
+
+def service_error(status: int, headers: dict[str, str] | None = None) -> ServiceError:
+    return ServiceError(status, "Error", headers or {}, "error message")
+
+
+def test_backoff() -> None:
+    policy = RetryPolicy(
+        max_attempts=5,
+        initial_backoff_millis=100,
+        max_backoff_millis=300,
+        multiplier=2,
+        jitter=0,
+    )
+
+    assert [policy.delay_millis(attempt) for attempt in range(1, 6)] == [
+        100,
+        200,
+        300,
+        300,
+        None,
+    ]
+
+
+def test_jitter() -> None:
+    policy = RetryPolicy(initial_backoff_millis=100, jitter=0.5, random=lambda: 1.0)
+
+    assert policy.delay_millis(1) == 50  # noqa: PLR2004
+
+
+def test_retry_after_extends_backoff() -> None:
+    policy = RetryPolicy(initial_backoff_millis=100, jitter=0)
+
+    assert policy.delay_millis(1, retry_after_millis=2_000) == 2_000  # noqa: PLR2004
+    assert policy.delay_millis(1, retry_after_millis=10) == 100  # noqa: PLR2004
+
+
+def test_no_retry_past_deadline() -> None:
+    policy = RetryPolicy(initial_backoff_millis=100, jitter=0)
+
+    assert policy.delay_millis(1, time.monotonic() + 0.05) is None
+    assert policy.delay_millis(1, time.monotonic() + 1) == 100  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    ("error", "retryable"),
+    [
+        (service_error(429), True),
+        (service_error(503), True),
+        (service_error(400), False),
+        (ConnectionResetError(), True),
+        (ValueError(), False),
+    ],
+)
+def test_is_retryable(error: Exception, retryable: bool) -> None:  # noqa: FBT001
+    assert RetryPolicy().is_retryable(error) is retryable
+
+
+def test_parse_retry_after() -> None:
+    in_ten_seconds = datetime.now(timezone.utc) + timedelta(seconds=10)
+
+    assert parse_retry_after({"Retry-After": "3"}) == 3_000  # noqa: PLR2004
+    retry_after = parse_retry_after(
+        {"retry-after": format_datetime(in_ten_seconds, usegmt=True)}
+    )
+    assert retry_after is not None
+    assert 8_000 < retry_after <= 10_000  # noqa: PLR2004
+    assert parse_retry_after({"retry-after": "soon"}) is None
+    assert parse_retry_after({}) is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"max_attempts": 0},
+        {"initial_backoff_millis": 2, "max_backoff_millis": 1},
+        {"multiplier": 0.5},
+        {"jitter": 2},
+    ],
+)
+def test_invalid_policy(kwargs: dict[str, float]) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        _ = RetryPolicy(**kwargs)  # pyright: ignore[reportArgumentType]
+
+
+def test_export_retries_transient_errors(
+    monitoring_client: NonCallableMock,
+    post_metrics_data_response: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    monitoring_client.post_metric_data.side_effect = [
+        service_error(429, {"retry-after": "0"}),
+        ConnectionResetError(),
+        post_metrics_data_response,
+    ]
+    exporter = OCIMonitoringExporter(
+        monitoring_client, oci_metrics_converter, retry_policy=FAST_RETRIES
+    )
+
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+    assert monitoring_client.post_metric_data.call_count == 3  # noqa: PLR2004
+
+
+def test_export_does_not_retry_client_errors(
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    monitoring_client.post_metric_data.side_effect = service_error(400)
+    exporter = OCIMonitoringExporter(
+        monitoring_client, oci_metrics_converter, retry_policy=FAST_RETRIES
+    )
+
+    assert exporter.export(metrics_data) == MetricExportResult.FAILURE
+    assert monitoring_client.post_metric_data.call_count == 1
+
+
+def test_export_stops_retrying_at_deadline(
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    monitoring_client.post_metric_data.side_effect = service_error(
+        503, {"Retry-After": "60"}
+    )
+    exporter = OCIMonitoringExporter(
+        monitoring_client, oci_metrics_converter, retry_policy=FAST_RETRIES
+    )
+
+    assert (
+        exporter.export(metrics_data, timeout_millis=1_000)
+        == MetricExportResult.FAILURE
+    )
+    assert monitoring_client.post_metric_data.call_count == 1
+
+
+def test_export_resends_failed_metrics(
+    monitoring_client: NonCallableMock,
+    post_metrics_data_response: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    metric_data = list(oci_metrics_converter.convert(metrics_data))
+    partial_failure = NonCallableMock(spec=Response)
+    partial_failure.configure_mock(
+        status=200,
+        data=PostMetricDataResponseDetails(
+            failed_metrics_count=1,
+            failed_metrics=[
+                FailedMetricRecord(message="throttled", metric_data=metric_data[1])
+            ],
+        ),
+    )
+    monitoring_client.post_metric_data.side_effect = [
+        partial_failure,
+        post_metrics_data_response,
+    ]
+    exporter = OCIMonitoringExporter(
+        monitoring_client,
+        oci_metrics_converter,
+        batch_atomicity="NON_ATOMIC",
+        retry_policy=FAST_RETRIES,
+    )
+
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+    first_call, second_call = monitoring_client.post_metric_data.call_args_list
+    assert first_call.args == (
+        PostMetricDataDetails(metric_data=metric_data, batch_atomicity="NON_ATOMIC"),
+    )
+    assert second_call.args == (
+        PostMetricDataDetails(
+            metric_data=[metric_data[1]], batch_atomicity="NON_ATOMIC"
+        ),
+    )
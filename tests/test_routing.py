@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import inspect
+from typing import TYPE_CHECKING, Callable
+
+import pytest
+from opentelemetry.sdk.metrics.export import (
+    Gauge,
+    MetricExportResult,
+    MetricsData,
+    NumberDataPoint,
+)
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter, routing
+from opentelemetry_exporter_oci_monitoring.cardinality import CardinalityLimits
+from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+from opentelemetry_exporter_oci_monitoring.routing import (
+    Route,
+    Router,
+    RoutingRule,
+    RoutingSettings,
+)
+from tests import wrap_metrics
+
+if TYPE_CHECKING:
+    from unittest.mock import NonCallableMock
+
+    from oci.monitoring.models import PostMetricDataDetails
+
+DEFAULT = Route("namespace", "resource-group", "compartment")
+TENANT_A = Route("namespace", "tenant-a", "compartment-a")
+TENANT_B = Route("namespace-b", "tenant-b", "compartment-b")
+TENANT_ROUTES = {"a": TENANT_A, "b": TENANT_B}
+
+
+def tenant_gauges(
+    tenants: list[str | None], hosts: tuple[str, ...] = ("x",), scope_tenant: str = ""
+) -> MetricsData:
+    data_points = [
+        NumberDataPoint(
+            attributes={"host": host}, start_time_unix_nano=0, time_unix_nano=1, value=1
+        )
+        for host in hosts
+    ]
+    return wrap_metrics(
+        Gauge(data_points=data_points),
+        resources=[
+            Resource({} if tenant is None else {"tenant": tenant}) for tenant in tenants
+        ],
+        scope=InstrumentationScope("scope", attributes={"tenant": scope_tenant})
+        if scope_tenant
+        else InstrumentationScope("scope"),
+    )
+
+
+def make_converter(*rules: RoutingRule, **kwargs: object) -> DefaultMetricsConverter:
+    return DefaultMetricsConverter(
+        *DEFAULT,
+        routing=RoutingSettings(rules),
+        **kwargs,  # pyright: ignore[reportArgumentType]
+    )
+
+
+def routes(
+    converter: DefaultMetricsConverter, metrics_data: MetricsData
+) -> list[Route]:
+    return [
+        Route(stream.namespace, stream.resource_group, stream.compartment_id)
+        for stream in converter.convert_streams(metrics_data)
+    ]
+
+
+def test_routes_by_resource_attribute() -> None:
+    converter = make_converter(RoutingRule("tenant", TENANT_ROUTES))
+
+    assert routes(converter, tenant_gauges(["a", "b", "c", None])) == [
+        TENANT_A,
+        TENANT_B,
+        DEFAULT,
+        DEFAULT,
+    ]
+
+
+def test_first_matching_rule_wins() -> None:
+    converter = make_converter(
+        RoutingRule("host", {"y": TENANT_A}, source="datapoint"),
+        RoutingRule("tenant", {"a": TENANT_A}),
+        RoutingRule("tenant", {"b": TENANT_B}),
+    )
+
+    metrics_data = tenant_gauges(["b"], hosts=("x", "y"))
+    assert routes(converter, metrics_data) == [TENANT_B, TENANT_A]
+
+
+@pytest.mark.skipif(
+    "attributes" not in inspect.signature(InstrumentationScope).parameters,
+    reason="scope attributes require opentelemetry-sdk 1.27",
+)
+def test_routes_by_scope_attribute() -> None:
+    converter = make_converter(
+        RoutingRule("host", {"y": TENANT_B}, source="datapoint"),
+        RoutingRule("tenant", {"a": TENANT_A}, source="scope"),
+        RoutingRule("tenant", {"b": TENANT_B}),
+    )
+
+    metrics_data = tenant_gauges(["b"], hosts=("x", "y"), scope_tenant="a")
+    assert routes(converter, metrics_data) == [TENANT_A, TENANT_B]
+
+
+def test_caches_decisions() -> None:
+    router = Router(RoutingSettings([RoutingRule("tenant", TENANT_ROUTES)]), DEFAULT)
+    resource = Resource({"tenant": "a"})
+    scope = InstrumentationScope("scope")
+
+    route_datapoint = router.resolve(resource, scope)
+
+    assert router.resolve(resource, scope) is route_datapoint
+    assert route_datapoint(None) == TENANT_A
+
+
+def test_routes_overflow_streams() -> None:
+    converter = make_converter(
+        RoutingRule("host", {"y": TENANT_B}, source="datapoint"),
+        cardinality_limits=CardinalityLimits(max_streams_per_metric=1),
+    )
+
+    streams = list(
+        converter.convert_streams(tenant_gauges(["a"], hosts=("x", "y", "z")))
+    )
+
+    assert [(stream.compartment_id, dict(stream.dimensions)) for stream in streams] == [
+        (DEFAULT.compartment_id, {"scope.name": "scope", "tenant": "a", "host": "x"}),
+        (TENANT_B.compartment_id, {"otel.metric.overflow": "true"}),
+        (DEFAULT.compartment_id, {"otel.metric.overflow": "true"}),
+    ]
+
+
+def test_exporter_posts_every_route_separately(
+    monitoring_client: NonCallableMock,
+) -> None:
+    converter = make_converter(RoutingRule("tenant", TENANT_ROUTES))
+    exporter = OCIMonitoringExporter(monitoring_client, converter)
+
+    metrics_data = tenant_gauges(["a", "b", "a", "c"])
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+
+    posted: list[PostMetricDataDetails] = [
+        call.args[0] for call in monitoring_client.post_metric_data.call_args_list
+    ]
+    assert [
+        [metric_data.compartment_id for metric_data in details.metric_data]
+        for details in posted
+    ] == [["compartment-a", "compartment-a"], ["compartment-b"], ["compartment"]]
+
+
+@pytest.mark.parametrize(
+    ("make", "message"),
+    [
+        (lambda: RoutingRule("", TENANT_ROUTES), "key must not be empty"),
+        (lambda: RoutingRule("tenant", {}), "routes must not be empty"),
+        (
+            lambda: RoutingRule("tenant", TENANT_ROUTES, source="metric"),  # pyright: ignore[reportArgumentType]
+            "source must be one of",
+        ),
+        (lambda: RoutingSettings([]), "rules must not be empty"),
+        (
+            lambda: RoutingSettings([RoutingRule("tenant", TENANT_ROUTES)], 0),
+            "cache_size must be at least 1",
+        ),
+    ],
+)
+def test_validates_settings(make: Callable[[], object], message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        _ = make()
+
+
+def test_rejects_scope_rules_without_scope_attributes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(routing, "_SCOPE_HAS_ATTRIBUTES", False)
+
+    with pytest.raises(ValueError, match="scope rules require"):
+        _ = RoutingRule("tenant", TENANT_ROUTES, source="scope")
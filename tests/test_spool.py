@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, cast
+from unittest.mock import NonCallableMock
+
+from oci.exceptions import ServiceError
+from oci.monitoring.models import FailedMetricRecord, PostMetricDataResponseDetails
+from oci.response import Response
+from opentelemetry.sdk.metrics.export import MetricExportResult
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.encoding import encode_post_metric_data
+from opentelemetry_exporter_oci_monitoring.retry import RetryPolicy
+from opentelemetry_exporter_oci_monitoring.spool import (
+    RECORD_HEADER,
+    DiskSpool,
+    SpoolSettings,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+    from opentelemetry.sdk.metrics.export import MetricsData
+
+    from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+
+
+def drain(spool: DiskSpool) -> list[bytes]:
+    payloads: list[bytes] = []
+    while (spooled := spool.peek()) is not None:
+        payloads.append(spooled.payload)
+        spool.pop()
+    return payloads
+
+
+def test_replays_in_order_across_segments(tmp_path: Path) -> None:
+    settings = SpoolSettings(tmp_path, segment_bytes=64)
+    spool = DiskSpool(settings)
+    payloads = [f"payload-{i:02d}".encode() * 2 for i in range(10)]
+    for payload in payloads:
+        spool.append(payload)
+
+    assert len(list(tmp_path.iterdir())) > 1
+    assert drain(spool) == payloads
+    assert not spool
+    assert spool.size == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_peek_without_pop(tmp_path: Path) -> None:
+    spool = DiskSpool(SpoolSettings(tmp_path))
+    spool.append(b"first")
+    spool.append(b"second")
+
+    first = spool.peek()
+    assert first is not None
+    assert first.payload == b"first"
+    assert spool.peek() == first
+
+    spool.pop()
+    second = spool.peek()
+    assert second is not None
+    assert second.payload == b"second"
+
+
+def test_appends_while_replaying(tmp_path: Path) -> None:
+    spool = DiskSpool(SpoolSettings(tmp_path))
+    spool.append(b"first")
+    assert spool.peek() is not None
+    spool.append(b"second")
+    spool.pop()
+
+    assert drain(spool) == [b"second"]
+
+
+def test_recovers_after_restart(tmp_path: Path) -> None:
+    spool = DiskSpool(SpoolSettings(tmp_path, segment_bytes=64))
+    for i in range(5):
+        spool.append(f"payload-{i}".encode())
+    size = spool.size
+    spool.close()
+
+    recovered = DiskSpool(SpoolSettings(tmp_path, segment_bytes=64))
+    assert recovered.size == size
+    recovered.append(b"payload-5")
+    assert drain(recovered) == [f"payload-{i}".encode() for i in range(6)]
+
+
+def test_skips_torn_record(tmp_path: Path) -> None:
+    spool = DiskSpool(SpoolSettings(tmp_path))
+    spool.append(b"complete")
+    spool.append(b"torn")
+    spool.close()
+    (segment,) = tmp_path.iterdir()
+    with segment.open("r+b") as file:
+        _ = file.truncate(segment.stat().st_size - 1)
+
+    assert drain(DiskSpool(SpoolSettings(tmp_path))) == [b"complete"]
+
+
+def test_max_bytes_discards_oldest_segments(tmp_path: Path) -> None:
+    payload = b"x" * 100
+    record_size = RECORD_HEADER.size + len(payload)
+    settings = SpoolSettings(
+        tmp_path, segment_bytes=record_size, max_bytes=3 * record_size
+    )
+    spool = DiskSpool(settings)
+    for i in range(10):
+        spool.append(payload, time_unix_nano=time.time_ns() + i)
+
+    assert spool.size <= settings.max_bytes
+    assert len(drain(spool)) == 3  # noqa: PLR2004
+
+
+def test_max_age_discards_expired_payloads(tmp_path: Path) -> None:
+    settings = SpoolSettings(tmp_path, segment_bytes=64, max_age=timedelta(hours=1))
+    spool = DiskSpool(settings)
+    two_hours_ago = time.time_ns() - 2 * 3600 * 10**9
+    spool.append(b"expired", time_unix_nano=two_hours_ago)
+    spool.append(b"expired, too", time_unix_nano=two_hours_ago + 1)
+    (expired_segment, *_) = sorted(tmp_path.iterdir())
+    os.utime(expired_segment, (two_hours_ago / 1e9, two_hours_ago / 1e9))
+    spool.append(b"fresh")
+
+    assert drain(spool) == [b"fresh"]
+
+
+def test_recovery_does_not_read_the_backlog(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = SpoolSettings(tmp_path, segment_bytes=1024)
+    spool = DiskSpool(settings)
+    for _ in range(16):
+        spool.append(os.urandom(512))
+    spool.close()
+    opened: list[Path] = []
+    path_open = pathlib.Path.open
+
+    def record_open(path: Path, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        opened.append(path)
+        return cast("Any", path_open(path, *args, **kwargs))
+
+    monkeypatch.setattr(pathlib.Path, "open", record_open)
+    recovered = DiskSpool(settings)
+
+    assert recovered.size == spool.size
+    assert opened == []
+    assert drain(recovered)
+    assert opened
+
+
+def test_exporter_spools_failed_batches_and_replays_them(
+    tmp_path: Path,
+    monitoring_client: NonCallableMock,
+    post_metrics_data_response: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    exporter = OCIMonitoringExporter(
+        monitoring_client,
+        oci_metrics_converter,
+        payload_encoder=encode_post_metric_data,
+        spool=SpoolSettings(tmp_path, replay_limit=1),
+    )
+    monitoring_client.post_metric_data.side_effect = [
+        ServiceError(503, "ServiceUnavailable", {}, "unavailable"),
+        ServiceError(400, "InvalidParameter", {}, "invalid"),
+        ConnectionResetError(),
+    ]
+    for _ in range(3):
+        assert exporter.export(metrics_data) == MetricExportResult.FAILURE
+
+    # the rejected payload is not spooled
+    monitoring_client.post_metric_data.side_effect = None
+    monitoring_client.post_metric_data.return_value = post_metrics_data_response
+    monitoring_client.post_metric_data.reset_mock()
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+    assert monitoring_client.post_metric_data.call_count == 2  # noqa: PLR2004
+
+    monitoring_client.post_metric_data.reset_mock()
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+    assert monitoring_client.post_metric_data.call_count == 2  # noqa: PLR2004
+
+    monitoring_client.post_metric_data.reset_mock()
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+    assert monitoring_client.post_metric_data.call_count == 1
+    exporter.shutdown()
+
+
+def test_exporter_spools_only_the_failed_metrics_of_a_partial_failure(
+    tmp_path: Path,
+    monitoring_client: NonCallableMock,
+    post_metrics_data_response: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    metric_data = list(oci_metrics_converter.convert(metrics_data))
+    partial_failure = NonCallableMock(spec=Response)
+    partial_failure.configure_mock(
+        status=200,
+        data=PostMetricDataResponseDetails(
+            failed_metrics_count=1,
+            failed_metrics=[
+                FailedMetricRecord(message="throttled", metric_data=metric_data[1])
+            ],
+        ),
+    )
+    exporter = OCIMonitoringExporter(
+        monitoring_client,
+        oci_metrics_converter,
+        batch_atomicity="NON_ATOMIC",
+        retry_policy=RetryPolicy(
+            max_attempts=2, initial_backoff_millis=1, max_backoff_millis=1, jitter=0
+        ),
+        spool=SpoolSettings(tmp_path),
+    )
+    # the resend of the failed metric fails too
+    monitoring_client.post_metric_data.side_effect = [
+        partial_failure,
+        ServiceError(503, "ServiceUnavailable", {}, "unavailable"),
+    ]
+    assert exporter.export(metrics_data) == MetricExportResult.FAILURE
+
+    monitoring_client.post_metric_data.side_effect = None
+    monitoring_client.post_metric_data.return_value = post_metrics_data_response
+    monitoring_client.post_metric_data.reset_mock()
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+
+    # the accepted metrics are not replayed
+    _, replayed = monitoring_client.post_metric_data.call_args_list
+    assert replayed.args == (encode_post_metric_data([metric_data[1]], "NON_ATOMIC"),)
+    exporter.shutdown()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.suite import find_regressions, make_baseline, make_cases, run
+from benchmarks.workload import SCENARIOS, make_metrics_data
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+WORKLOAD = SCENARIOS["small"]
+
+
+def test_workload_shape() -> None:
+    metrics_data = make_metrics_data(WORKLOAD)
+
+    data_points = [
+        point
+        for resource_metrics in metrics_data.resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+        for point in metric.data.data_points
+    ]
+    assert len(metrics_data.resource_metrics) == WORKLOAD.resources
+    assert len(data_points) == WORKLOAD.data_points
+    assert (
+        len({frozenset((point.attributes or {}).items()) for point in data_points})
+        == WORKLOAD.attribute_sets
+    )
+    assert make_metrics_data(WORKLOAD) == metrics_data
+
+
+def test_run_measures_all_cases() -> None:
+    measurements = run(make_metrics_data(WORKLOAD), WORKLOAD, repeat=1)
+
+    assert [measurement.case for measurement in measurements] == list(make_cases())
+    for measurement in measurements:
+        assert measurement.points_per_second > 0
+        assert measurement.peak_bytes > 0
+        assert measurement.allocations > 0
+
+
+def test_find_regressions() -> None:
+    (measurement,) = run(
+        make_metrics_data(WORKLOAD), WORKLOAD, cases=["convert"], repeat=1
+    )
+    baseline = make_baseline(WORKLOAD, [measurement])
+
+    assert find_regressions([measurement], baseline, WORKLOAD, 0.1) == []
+    del baseline["results"]["convert"]["allocations"]
+    assert find_regressions([measurement], baseline, WORKLOAD, 0.1) == []
+
+    slower = replace(measurement, seconds=measurement.seconds * 2)
+    bigger = replace(measurement, peak_bytes=measurement.peak_bytes * 2)
+    assert len(find_regressions([slower, bigger], baseline, WORKLOAD, 0.1)) == 2  # noqa: PLR2004
+
+    with pytest.raises(ValueError, match="different workload"):
+        _ = find_regressions(
+            [measurement], baseline, replace(WORKLOAD, resources=2), 0.1
+        )
+
+
+def test_cli_fails_on_regression(tmp_path: Path) -> None:
+    baseline_path = tmp_path / "baseline.json"
+    args = ["--scenario", "small", "--case", "convert", "--repeat", "1"]
+
+    assert main([*args, "--save", str(baseline_path)]) == 0
+    assert main([*args, "--compare", str(baseline_path), "--tolerance", "10"]) == 0
+
+    baseline = json.loads(baseline_path.read_text())
+    baseline["results"]["convert"]["points_per_second"] *= 1_000
+    _ = baseline_path.write_text(json.dumps(baseline))
+    assert main([*args, "--compare", str(baseline_path)]) == 1
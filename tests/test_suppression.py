@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING, Callable
+
+import pytest
+from oci.exceptions import ServiceError
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    Gauge,
+    MetricExportResult,
+    MetricsData,
+    NumberDataPoint,
+    Sum,
+)
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.aggregation import AggregationKind
+from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+from opentelemetry_exporter_oci_monitoring.suppression import (
+    StreamSuppressor,
+    SuppressionInfo,
+    SuppressionSettings,
+)
+from tests import wrap_metrics
+
+if TYPE_CHECKING:
+    from unittest.mock import NonCallableMock
+
+MINUTE = 60 * 10**9
+
+
+def number_points(minute: int, value: float) -> list[NumberDataPoint]:
+    return [
+        NumberDataPoint(
+            attributes={"host": host},
+            start_time_unix_nano=0,
+            time_unix_nano=minute * MINUTE,
+            value=value,
+        )
+        for host in ("a", "b")
+    ]
+
+
+def delta_sum(minute: int, value: float) -> MetricsData:
+    return wrap_metrics(
+        Sum(
+            data_points=number_points(minute, value),
+            aggregation_temporality=AggregationTemporality.DELTA,
+            is_monotonic=True,
+        )
+    )
+
+
+def gauge(minute: int, value: float) -> MetricsData:
+    return wrap_metrics(Gauge(data_points=number_points(minute, value)))
+
+
+def exported_values(
+    converter: DefaultMetricsConverter, metrics_data: MetricsData
+) -> list[list[float]]:
+    return [stream.values for stream in converter.convert_streams(metrics_data)]  # noqa: PD011
+
+
+@pytest.fixture
+def converter() -> DefaultMetricsConverter:
+    return DefaultMetricsConverter(
+        "namespace",
+        "resource-group",
+        "compartment-id",
+        suppression=SuppressionSettings(heartbeat=timedelta(minutes=5)),
+    )
+
+
+def test_suppresses_zero_deltas(converter: DefaultMetricsConverter) -> None:
+    assert exported_values(converter, delta_sum(0, 0)) == [[0.0], [0.0]]
+    assert exported_values(converter, delta_sum(1, 0)) == []
+    assert exported_values(converter, delta_sum(2, 3)) == [[3.0], [3.0]]
+    assert exported_values(converter, delta_sum(3, 0)) == []
+    assert converter.suppression_info() == SuppressionInfo(4, 4, 2)
+
+
+def test_suppresses_unchanged_gauges(converter: DefaultMetricsConverter) -> None:
+    assert exported_values(converter, gauge(0, 1)) == [[1.0], [1.0]]
+    assert exported_values(converter, gauge(1, 1)) == []
+    assert exported_values(converter, gauge(2, 2)) == [[2.0], [2.0]]
+
+
+@pytest.mark.parametrize("make", [delta_sum, gauge])
+def test_sends_heartbeats(
+    converter: DefaultMetricsConverter, make: Callable[[int, float], MetricsData]
+) -> None:
+    for minute in range(5):
+        _ = exported_values(converter, make(minute, 0))
+
+    assert exported_values(converter, make(5, 0)) == [[0.0], [0.0]]
+
+
+def test_selects_datapoints_within_a_stream() -> None:
+    suppressor = StreamSuppressor(SuppressionSettings(heartbeat=timedelta(minutes=2)))
+
+    selectors = suppressor.select(
+        "key", [0, MINUTE, 2 * MINUTE, 3 * MINUTE], [0, 0, 0, 0], AggregationKind.SUM
+    )
+
+    assert selectors == [True, False, True, False]
+    assert suppressor.select("key", [0], [0], AggregationKind.DISTRIBUTION) is None
+
+
+def test_forgets_least_recently_seen_streams() -> None:
+    suppressor = StreamSuppressor(SuppressionSettings(max_streams=1))
+
+    assert suppressor.select("a", [0], [1], AggregationKind.LAST_VALUE) is None
+    assert suppressor.select("b", [0], [1], AggregationKind.LAST_VALUE) is None
+    assert suppressor.select("a", [MINUTE], [1], AggregationKind.LAST_VALUE) is None
+    assert suppressor.info().tracked_streams == 1
+
+
+def test_rolls_back_to_the_checkpoint() -> None:
+    suppressor = StreamSuppressor(SuppressionSettings())
+    _ = suppressor.select("a", [0], [1], AggregationKind.LAST_VALUE)
+    suppressor.checkpoint()
+    _ = suppressor.select("a", [MINUTE], [2], AggregationKind.LAST_VALUE)
+    _ = suppressor.select("b", [MINUTE], [2], AggregationKind.LAST_VALUE)
+
+    suppressor.rollback()
+
+    assert suppressor.info().tracked_streams == 1
+    assert suppressor.select("a", [2 * MINUTE], [1], AggregationKind.LAST_VALUE) == [
+        False
+    ]
+
+
+def test_failed_exports_do_not_suppress_the_next_one(
+    converter: DefaultMetricsConverter, monitoring_client: NonCallableMock
+) -> None:
+    exporter = OCIMonitoringExporter(monitoring_client, converter)
+    response = monitoring_client.post_metric_data.return_value
+    monitoring_client.post_metric_data.side_effect = [
+        response,
+        ServiceError(400, "InvalidParameter", {}, "rejected"),
+        response,
+    ]
+
+    assert exporter.export(gauge(0, 1)) == MetricExportResult.SUCCESS
+    assert exporter.export(gauge(1, 2)) == MetricExportResult.FAILURE
+    assert exporter.export(gauge(2, 2)) == MetricExportResult.SUCCESS
+
+    assert monitoring_client.post_metric_data.call_count == 3  # noqa: PLR2004
+    details = monitoring_client.post_metric_data.call_args.args[0]
+    assert [metric.datapoints[0].value for metric in details.metric_data] == [2, 2]
+
+
+@pytest.mark.parametrize("kwargs", [{"heartbeat": timedelta()}, {"max_streams": 0}])
+def test_validates_settings(kwargs: dict[str, object]) -> None:
+    with pytest.raises(ValueError, match="must be"):
+        _ = SuppressionSettings(**kwargs)  # pyright: ignore[reportArgumentType]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import pytest
+from oci.exceptions import ServiceError
+from oci.monitoring.models import PostMetricDataResponseDetails
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import (
+    DataPointT,
+    HistogramDataPoint,
+    InMemoryMetricReader,
+    MetricExportResult,
+    MetricsData,
+    NumberDataPoint,
+)
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.encoding import encode_post_metric_data
+from opentelemetry_exporter_oci_monitoring.telemetry import (
+    ERROR_TYPE_ATTRIBUTE,
+    STATUS_CODE_ATTRIBUTE,
+    ExporterTelemetry,
+)
+
+if TYPE_CHECKING:
+    from unittest.mock import NonCallableMock
+
+    from oci.monitoring import MonitoringClient
+
+    from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+
+
+@pytest.fixture
+def reader() -> InMemoryMetricReader:
+    return InMemoryMetricReader()
+
+
+@pytest.fixture
+def meter_provider(reader: InMemoryMetricReader) -> MeterProvider:
+    return MeterProvider(metric_readers=[reader])
+
+
+def collect(reader: InMemoryMetricReader) -> dict[str, list[DataPointT]]:
+    metrics_data = cast("MetricsData | None", reader.get_metrics_data())  # pyright: ignore[reportUnknownMemberType]
+    assert metrics_data is not None
+    return {
+        metric.name: list(metric.data.data_points)
+        for resource_metrics in metrics_data.resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+    }
+
+
+def test_records_exports(
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+    meter_provider: MeterProvider,
+    reader: InMemoryMetricReader,
+) -> None:
+    exporter = OCIMonitoringExporter(
+        monitoring_client,
+        oci_metrics_converter,
+        payload_encoder=encode_post_metric_data,
+        meter_provider=meter_provider,
+    )
+    monitoring_client.post_metric_data.return_value.data = (
+        PostMetricDataResponseDetails(failed_metrics_count=2, failed_metrics=[])
+    )
+
+    assert exporter.export(metrics_data) == MetricExportResult.SUCCESS
+
+    points = collect(reader)
+    (convert_duration,) = points["oci_monitoring.exporter.convert.duration"]
+    assert isinstance(convert_duration, HistogramDataPoint)
+    assert convert_duration.count == 1
+    (streams,) = points["oci_monitoring.exporter.export.streams"]
+    assert isinstance(streams, HistogramDataPoint)
+    assert streams.sum == 4  # noqa: PLR2004
+    (datapoints,) = points["oci_monitoring.exporter.export.datapoints"]
+    assert isinstance(datapoints, HistogramDataPoint)
+    assert datapoints.sum == 4 * 13
+    (body_size,) = points["oci_monitoring.exporter.request.body.size"]
+    assert isinstance(body_size, HistogramDataPoint)
+    body = monitoring_client.post_metric_data.call_args.args[0]
+    assert body_size.sum == len(body)
+    (requests,) = points["oci_monitoring.exporter.requests"]
+    assert isinstance(requests, NumberDataPoint)
+    assert requests.attributes == {STATUS_CODE_ATTRIBUTE: 200}
+    assert requests.value == 1
+    (failed_metrics,) = points["oci_monitoring.exporter.failed_metrics"]
+    assert isinstance(failed_metrics, NumberDataPoint)
+    assert failed_metrics.value == 2  # noqa: PLR2004
+
+
+def test_records_size_of_sdk_serialized_bodies(
+    sdk_monitoring_client: MonitoringClient,
+    sdk_request_bodies: list[str | bytes],
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+    reader: InMemoryMetricReader,
+) -> None:
+    exporter = OCIMonitoringExporter(
+        sdk_monitoring_client,
+        oci_metrics_converter,
+        meter_provider=MeterProvider(metric_readers=[reader]),
+    )
+
+    assert exporter.export(metrics_data) == MetricExportResult.FAILURE
+
+    (body_size,) = collect(reader)["oci_monitoring.exporter.request.body.size"]
+    assert isinstance(body_size, HistogramDataPoint)
+    assert sdk_request_bodies
+    assert body_size.count == len(sdk_request_bodies)
+    assert body_size.sum == sum(
+        len(body.encode() if isinstance(body, str) else body)
+        for body in sdk_request_bodies
+    )
+
+
+def test_records_failed_requests(
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+    meter_provider: MeterProvider,
+    reader: InMemoryMetricReader,
+) -> None:
+    exporter = OCIMonitoringExporter(
+        monitoring_client, oci_metrics_converter, meter_provider=meter_provider
+    )
+    monitoring_client.post_metric_data.side_effect = [
+        ServiceError(429, "TooManyRequests", {}, "slow down"),
+        ConnectionResetError(),
+    ]
+
+    assert exporter.export(metrics_data) == MetricExportResult.FAILURE
+    assert exporter.export(metrics_data) == MetricExportResult.FAILURE
+
+    requests = collect(reader)["oci_monitoring.exporter.requests"]
+    assert sorted(str(point.attributes) for point in requests) == sorted(
+        str(attributes)
+        for attributes in (
+            {STATUS_CODE_ATTRIBUTE: 429},
+            {ERROR_TYPE_ATTRIBUTE: "ConnectionResetError"},
+        )
+    )
+
+
+def test_reuses_attribute_sets(meter_provider: MeterProvider) -> None:
+    telemetry = ExporterTelemetry(meter_provider)
+
+    assert telemetry.status_attributes(200) is telemetry.status_attributes(200)
+    assert telemetry.status_attributes(599) is telemetry.status_attributes(599)
+    assert telemetry.error_attributes(OSError()) is telemetry.error_attributes(
+        OSError()
+    )
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    Buckets,
+    DataT,
+    ExponentialHistogram,
+    ExponentialHistogramDataPoint,
+    Gauge,
+    Histogram,
+    HistogramDataPoint,
+    NumberDataPoint,
+    Sum,
+)
+
+from opentelemetry_exporter_oci_monitoring.temporality import CumulativeToDelta
+from tests import wrap_metrics
+
+CUMULATIVE = AggregationTemporality.CUMULATIVE
+
+
+def convert(cumulative_to_delta: CumulativeToDelta, data: DataT) -> DataT:
+    converted = cumulative_to_delta.convert(wrap_metrics(data))
+    return converted.resource_metrics[0].scope_metrics[0].metrics[0].data
+
+
+def sum_points(data: DataT) -> list[tuple[int, float]]:
+    return [
+        (point.start_time_unix_nano, point.value)
+        for point in data.data_points
+        if isinstance(point, NumberDataPoint)
+    ]
+
+
+def number_point(time: int, value: float, start: int = 0) -> NumberDataPoint:
+    return NumberDataPoint(
+        attributes={"a": "b"},
+        start_time_unix_nano=start,
+        time_unix_nano=time,
+        value=value,
+    )
+
+
+def test_cumulative_sums_become_deltas() -> None:
+    cumulative_to_delta = CumulativeToDelta(start_time_unix_nano=0)
+
+    deltas = [
+        convert(cumulative_to_delta, Sum([point], CUMULATIVE, is_monotonic=True))
+        for point in (
+            number_point(1, 5),
+            number_point(2, 8),
+            number_point(2, 8),  # a duplicate
+            number_point(4, 2, start=3),  # a restart
+            number_point(5, 1, start=3),  # an up down counter would be negative
+        )
+    ]
+
+    assert {
+        data.aggregation_temporality  # pyright: ignore[reportUnknownMemberType]
+        for data in deltas
+        if isinstance(data, Sum)
+    } == {AggregationTemporality.DELTA}
+    assert [sum_points(data) for data in deltas] == [
+        [(0, 5)],
+        [(1, 3)],
+        [],
+        [(3, 2)],
+        [(3, 1)],
+    ]
+
+
+def test_non_monotonic_sums_may_decrease() -> None:
+    cumulative_to_delta = CumulativeToDelta(start_time_unix_nano=0)
+
+    _, data = (
+        convert(cumulative_to_delta, Sum([point], CUMULATIVE, is_monotonic=False))
+        for point in (number_point(1, 5), number_point(2, 3))
+    )
+
+    assert sum_points(data) == [(1, -2)]
+
+
+def test_streams_started_before_the_converter_set_the_baseline() -> None:
+    cumulative_to_delta = CumulativeToDelta(start_time_unix_nano=1)
+
+    first, second = (
+        convert(cumulative_to_delta, Sum([point], CUMULATIVE, is_monotonic=True))
+        for point in (number_point(1, 5), number_point(2, 8))
+    )
+
+    assert sum_points(first) == []
+    assert sum_points(second) == [(1, 3)]
+
+
+def test_delta_and_gauge_metrics_are_unchanged() -> None:
+    delta = Sum([number_point(1, 5)], AggregationTemporality.DELTA, is_monotonic=True)
+    gauge = Gauge([number_point(1, 5)])
+
+    assert convert(CumulativeToDelta(), delta) is delta
+    assert convert(CumulativeToDelta(), gauge) is gauge
+
+
+def histogram_point(
+    time: int, bucket_counts: list[int], explicit_bounds: list[float]
+) -> HistogramDataPoint:
+    return HistogramDataPoint(
+        attributes={},
+        start_time_unix_nano=0,
+        time_unix_nano=time,
+        count=sum(bucket_counts),
+        sum=float(sum(bucket_counts)),
+        bucket_counts=bucket_counts,
+        explicit_bounds=explicit_bounds,
+        min=0.0,
+        max=2.0,
+    )
+
+
+def test_cumulative_histograms_become_deltas() -> None:
+    cumulative_to_delta = CumulativeToDelta(start_time_unix_nano=0)
+
+    deltas = [
+        convert(cumulative_to_delta, Histogram([point], CUMULATIVE)).data_points
+        for point in (
+            histogram_point(1, [1, 2], [1.0]),
+            histogram_point(2, [3, 2], [1.0]),
+            histogram_point(3, [3, 2, 1], [1.0, 2.0]),  # changed buckets
+            histogram_point(4, [3, 4, 1], [1.0, 2.0]),
+        )
+    ]
+
+    assert [
+        [
+            (point.start_time_unix_nano, point.count, point.bucket_counts)
+            for point in data
+            if isinstance(point, HistogramDataPoint)
+        ]
+        for data in deltas
+    ] == [[(0, 3, [1, 2])], [(1, 2, [2, 0])], [], [(3, 2, [0, 2, 0])]]
+
+
+def exponential_point(
+    time: int, scale: int, offset: int, bucket_counts: list[int]
+) -> ExponentialHistogramDataPoint:
+    return ExponentialHistogramDataPoint(
+        attributes={},
+        start_time_unix_nano=0,
+        time_unix_nano=time,
+        count=sum(bucket_counts),
+        sum=float(sum(bucket_counts)),
+        scale=scale,
+        zero_count=0,
+        positive=Buckets(offset=offset, bucket_counts=bucket_counts),
+        negative=Buckets(offset=0, bucket_counts=[]),
+        flags=0,
+        min=1.0,
+        max=8.0,
+    )
+
+
+def test_exponential_histograms_are_compared_at_the_lower_scale() -> None:
+    cumulative_to_delta = CumulativeToDelta(start_time_unix_nano=1)
+
+    # buckets 2 and 3 at scale 1 are bucket 1 at scale 0
+    _, (delta,) = (
+        convert(
+            cumulative_to_delta, ExponentialHistogram([point], CUMULATIVE)
+        ).data_points
+        for point in (
+            exponential_point(1, scale=1, offset=2, bucket_counts=[1, 1]),
+            exponential_point(2, scale=0, offset=1, bucket_counts=[3, 1]),
+        )
+    )
+
+    assert isinstance(delta, ExponentialHistogramDataPoint)
+    assert delta.scale == 0
+    assert delta.count == 2  # noqa: PLR2004
+    assert delta.positive == Buckets(offset=1, bucket_counts=[1, 1])
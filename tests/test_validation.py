@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from oci.monitoring.models import Datapoint, MetricDataDetails, PostMetricDataDetails
+
+from opentelemetry_exporter_oci_monitoring import OCIMonitoringExporter
+from opentelemetry_exporter_oci_monitoring.converter import UTC, MetricStream
+from opentelemetry_exporter_oci_monitoring.validation import (
+    MetricValidator,
+    ValidationInfo,
+    ValidationPolicy,
+    ValidationRules,
+)
+
+if TYPE_CHECKING:
+    from unittest.mock import NonCallableMock
+
+    from opentelemetry.sdk.metrics.export import MetricsData
+
+    from opentelemetry_exporter_oci_monitoring.converter import DefaultMetricsConverter
+
+NOW = 1_724_678_400.0
+NOW_NANOS = int(NOW * 1e9)
+
+
+def make_stream(name: str = "my.metric", **dimensions: str) -> MetricStream:
+    stream = MetricStream(
+        namespace="namespace",
+        resource_group="resource-group",
+        compartment_id="compartment-id",
+        name=name,
+        dimensions=dimensions or {"host": "a"},
+    )
+    stream.append(NOW_NANOS, 1.0)
+    return stream
+
+
+def make_validator(**kwargs: ValidationPolicy | int) -> MetricValidator:
+    return MetricValidator(ValidationRules(**kwargs), clock=lambda: NOW)  # pyright: ignore[reportArgumentType]
+
+
+def test_passes_valid_streams_unchanged() -> None:
+    validator = make_validator()
+    stream = make_stream()
+
+    assert validator.validate(stream) is stream
+    assert validator.validate(make_stream()) is not None
+    assert validator.info() == ValidationInfo(0, 0, 0)
+
+
+def test_sanitize() -> None:
+    validator = make_validator(max_dimensions=2, max_dimension_value_length=4)
+    stream = make_stream(
+        "my metric/total", **{"key with spaces": "value", "empty": "", "c": "d"}
+    )
+
+    valid = validator.validate(stream)
+
+    assert valid is not None
+    assert valid.name == "my_metric_total"
+    assert valid.dimensions == {"key_with_spaces": "valu", "c": "d"}
+    assert stream.name == "my metric/total"
+    assert validator.info().modified_streams == 1
+
+
+def test_sanitize_prefixes_names_without_leading_letter() -> None:
+    validator = make_validator(max_name_length=12)
+
+    valid = validator.validate(make_stream("2xx.count"))
+
+    assert valid is not None
+    assert valid.name == "metric_2xx.c"
+
+
+@pytest.mark.parametrize("policy", [ValidationPolicy.TRUNCATE, ValidationPolicy.DROP])
+def test_drops_names_without_leading_letter(policy: ValidationPolicy) -> None:
+    validator = make_validator(policy=policy)
+
+    assert validator.validate(make_stream("2xx.count")) is None
+    assert validator.validate(make_stream("_total")) is None
+
+
+def test_metadata_values() -> None:
+    stream = make_stream()
+    stream.metadata = {"unit": "bytes", "description": "d" * 5}
+
+    valid = make_validator(max_metadata_value_length=4).validate(stream)
+    dropping = make_validator(policy=ValidationPolicy.DROP, max_metadata_value_length=4)
+
+    assert valid is not None
+    assert valid.metadata == {"unit": "byte", "description": "dddd"}
+    assert stream.metadata == {"unit": "bytes", "description": "ddddd"}
+    assert dropping.validate(stream) is None
+    assert make_validator().validate(stream) is stream
+
+
+def test_sanitize_drops_streams_without_name() -> None:
+    validator = make_validator()
+
+    assert validator.validate(make_stream("")) is None
+    assert validator.info().dropped_streams == 1
+
+
+def test_truncate() -> None:
+    validator = make_validator(policy=ValidationPolicy.TRUNCATE, max_name_length=4)
+
+    valid = validator.validate(make_stream("metric"))
+    assert valid is not None
+    assert valid.name == "metr"
+    assert validator.validate(make_stream("my metric")) is None
+    assert validator.validate(make_stream(host="")) is None
+
+
+def test_drop() -> None:
+    validator = make_validator(
+        policy=ValidationPolicy.DROP, max_dimension_value_length=4
+    )
+
+    assert validator.validate(make_stream(host="four")) is not None
+    assert validator.validate(make_stream(host="five!")) is None
+    assert validator.info().dropped_streams == 1
+
+
+def test_drops_datapoints_outside_the_time_window() -> None:
+    validator = make_validator()
+    stream = make_stream()
+    stream.append(NOW_NANOS - 3 * 3600 * 10**9, 2.0)
+    stream.append(NOW_NANOS + 3600 * 10**9, 3.0)
+
+    valid = validator.validate(stream)
+
+    assert valid is not None
+    assert valid.timestamps == [NOW_NANOS]
+    assert validator.info().dropped_datapoints == 2  # noqa: PLR2004
+
+
+def test_validates_metric_data_details() -> None:
+    validator = make_validator()
+    now = datetime.fromtimestamp(NOW, tz=UTC)
+    details = MetricDataDetails(
+        namespace="namespace",
+        compartment_id="compartment-id",
+        name="my metric",
+        dimensions={"host": "a"},
+        datapoints=[
+            Datapoint(timestamp=now, value=1.0),
+            Datapoint(timestamp=now - timedelta(days=1), value=2.0),
+        ],
+    )
+
+    valid = validator.validate(details)
+
+    assert valid is not None
+    assert valid.name == "my_metric"
+    assert [datapoint.value for datapoint in valid.datapoints] == [1.0]
+    assert validator.validate(details, now=NOW + 3 * 86_400) is None
+
+
+def test_exporter_validates_before_batching(
+    monitoring_client: NonCallableMock,
+    oci_metrics_converter: DefaultMetricsConverter,
+    metrics_data: MetricsData,
+) -> None:
+    exporter = OCIMonitoringExporter(
+        monitoring_client,
+        oci_metrics_converter,
+        validation=ValidationRules(max_dimensions=2, max_past=timedelta(days=36_500)),
+    )
+
+    _ = exporter.export(metrics_data)
+
+    body = monitoring_client.post_metric_data.call_args.args[0]
+    assert isinstance(body, PostMetricDataDetails)
+    assert all(len(metric.dimensions) == 2 for metric in body.metric_data)  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("name", ["max_dimensions", "cache_size"])
+def test_validates_rules(name: str) -> None:
+    with pytest.raises(ValueError, match="must be at least 1"):
+        _ = ValidationRules(**{name: 0})  # pyright: ignore[reportArgumentType]
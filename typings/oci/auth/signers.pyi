@@ -0,0 +1,13 @@
+from typing import TypeVar
+
+_R = TypeVar("_R")
+
+class SecurityTokenSigner:
+    def __init__(self, token: str, private_key: object) -> None: ...
+    def __call__(self, request: _R, enforce_content_headers: bool = True) -> _R: ...  # noqa: FBT001, FBT002
+
+class InstancePrincipalsSecurityTokenSigner:
+    region: str
+
+    def __init__(self, **kwargs: object) -> None: ...
+    def __call__(self, request: _R, enforce_content_headers: bool = True) -> _R: ...  # noqa: FBT001, FBT002
@@ -0,0 +1,12 @@
+from typing import Any, Callable
+
+class BaseClient:
+    endpoint: str
+    signer: Callable[..., object]
+    timeout: float | tuple[float, float]
+    def deserialize_response_data(
+        self,
+        response_data: bytes,
+        response_type: str,
+        allow_control_chars: bool | None = None,
+    ) -> Any: ...  # noqa: ANN401
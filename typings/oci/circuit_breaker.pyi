@@ -0,0 +1,2 @@
+class NoCircuitBreakerStrategy:
+    def __init__(self) -> None: ...
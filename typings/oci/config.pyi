@@ -0,0 +1,6 @@
+DEFAULT_LOCATION: str
+DEFAULT_PROFILE: str
+
+def from_file(
+    file_location: str = ..., profile_name: str = ...
+) -> dict[str, object]: ...
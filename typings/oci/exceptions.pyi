@@ -0,0 +1,16 @@
+from typing import Mapping
+
+class ServiceError(Exception):
+    status: int
+    code: str
+    headers: Mapping[str, str]
+    message: str
+
+    def __init__(
+        self,
+        status: int,
+        code: str,
+        headers: Mapping[str, str],
+        message: str,
+        **kwargs: object,
+    ) -> None: ...
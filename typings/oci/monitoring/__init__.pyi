@@ -1,10 +1,11 @@
 from typing import Mapping
 
+from oci.base_client import BaseClient
 from oci.monitoring.models import PostMetricDataDetails, PostMetricDataResponseDetails
 from oci.response import Response
 
 class MonitoringClient:
-    base_client: object
+    base_client: BaseClient
     retry_strategy: object
     circuit_breaker_callback: object
 
@@ -52,7 +53,7 @@ class MonitoringClient:
     ) -> object: ...
     def post_metric_data(
         self,
-        post_metric_data_details: PostMetricDataDetails,
+        post_metric_data_details: PostMetricDataDetails | str | bytes,
         *,
         opc_request_id: str | None = None,
         content_encoding: str | None = None,
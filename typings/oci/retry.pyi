@@ -0,0 +1,2 @@
+class NoneRetryStrategy:
+    def __init__(self) -> None: ...